@@ -0,0 +1,122 @@
+"""Benchmark: str based encoding / parsing vs. the bytes codec
+
+Encodes the requests and decodes the responses of one extended poll (module data, anti freeze temperature and
+holiday data per module) for a large fleet, once the way the client did it with f-strings, str.encode,
+str.replace / str.split and the data objects, and once through the protocol intents the client runs now, which
+encode and decode with codec.py straight from bytes. Every step is reported
+on its own, the best of several runs is used to keep the noise of a busy machine out. The last line compares
+decoding the module data with and without the ModuleDataMemo for unchanged modules whose clock ticked.
+
+Usage: python -m benchmarks.codec [modules] [repeat]
+"""
+import sys
+from timeit import repeat as timeit_repeat
+
+from thermotecaeroflowflexismart import protocol
+from thermotecaeroflowflexismart.codec import strip_status, decode_module_data, ModuleDataMemo
+from thermotecaeroflowflexismart.data_object import ModuleData, HolidayData
+
+MODULE_DATA_RESPONSE = b"OK,18,8,19,2,50,59,3,0,0,0,0,1,1,129,0,4,8,9,10,v201106\x00"
+ANTI_FREEZE_RESPONSE = b"OK,7\x00"
+HOLIDAY_RESPONSE = b"OK,RH,20,5,151,13,5,0,0,0,3,18,30,149\x00"
+ZONES = [8] * 16
+
+
+def fleet(modules: int) -> list[tuple[int, int]]:
+    return [(zone, module) for zone in range(1, 17) for module in range(1, 9)][:modules]
+
+
+def encode_str(modules: list[tuple[int, int]]) -> None:
+    for zone, module in modules:
+        str.encode(f"R#{zone}#{module}#0#0*?F/")
+        str.encode(f"R#{zone}#{module}#0#0*?E#1#20/")
+        str.encode(f"R#{zone}#{module}#0#0*?RH/")
+
+
+# Building and resolving the intents is the same for both ways, only the encoding is measured
+def create_intents(modules: list[tuple[int, int]]) -> list[protocol.Intent]:
+    intents = []
+    for zone, module in modules:
+        for intent in (protocol.get_module_data(zone, module), protocol.get_anti_freeze_temperature(zone, module),
+                       protocol.get_holiday_mode(zone, module)):
+            intent.resolve(ZONES)
+            intents.append(intent)
+    return intents
+
+
+def encode_bytes(intents: list[protocol.Intent]) -> None:
+    for intent in intents:
+        protocol.encode_datagram(intent)
+
+
+def decode_str(modules: list[tuple[int, int]]) -> None:
+    for _ in modules:
+        response = MODULE_DATA_RESPONSE.rstrip(b"\x00").decode()
+        ModuleData(response.replace("OK,", "").split(","))
+
+        response = ANTI_FREEZE_RESPONSE.rstrip(b"\x00").decode()
+        float(int(response.replace("OK,", "")))
+
+        response = HOLIDAY_RESPONSE.rstrip(b"\x00").decode()
+        HolidayData(response.replace("OK,", "").split(","))
+
+
+def decode_bytes(modules: list[tuple[int, int]]) -> None:
+    # The memo is left out here, it has its own line below
+    module_data = protocol.ZoneQuery(1, 1, b"?F", decode_module_data)
+    anti_freeze_temperature = protocol.get_anti_freeze_temperature(1, 1)
+    holiday_data = protocol.get_holiday_mode(1, 1)
+    for _ in modules:
+        protocol.decode_datagram(module_data, MODULE_DATA_RESPONSE)
+        protocol.decode_datagram(anti_freeze_temperature, ANTI_FREEZE_RESPONSE)
+        protocol.decode_datagram(holiday_data, HOLIDAY_RESPONSE)
+
+
+# Payloads of unchanged modules, every poll with another clock
+def module_data_polls(modules: list[tuple[int, int]], polls: int) -> list[list[bytes]]:
+    payload = strip_status(MODULE_DATA_RESPONSE.rstrip(b"\x00"))
+    return [[payload.replace(b",4,8,9,10,", f",4,{zone},{module},10,".encode()).replace(b"2,50,59", f"2,50,{poll}".encode())
+             for zone, module in modules] for poll in range(polls)]
+
+
+def decode_module_data_plain(polls: list[list[bytes]]) -> None:
+    for payloads in polls:
+        for payload in payloads:
+            decode_module_data(payload)
+
+
+def decode_module_data_memo(polls: list[list[bytes]], memo: ModuleDataMemo) -> None:
+    for payloads in polls:
+        for payload in payloads:
+            memo.decode(payload)
+
+
+def measure(function, argument: list, repeat: int) -> float:
+    return min(timeit_repeat(lambda: function(argument), number=repeat, repeat=15)) / repeat
+
+
+def report(name: str, str_time: float, bytes_time: float, modules: int) -> None:
+    print(f"{name:8} str: {str_time * 1e6:8.1f} µs  bytes: {bytes_time * 1e6:8.1f} µs  "
+          f"saved: {(str_time - bytes_time) * 1e6:8.1f} µs per poll ({(1 - bytes_time / str_time) * 100:4.0f}%), "
+          f"{(str_time - bytes_time) * 1e6 / modules:5.2f} µs per module")
+
+
+if __name__ == "__main__":
+    module_count = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    modules = fleet(module_count)
+
+    print(f"{len(modules)} modules, extended poll ({len(modules) * 3} requests)")
+    encode_times = measure(encode_str, modules, repeat), measure(encode_bytes, create_intents(modules), repeat)
+    decode_times = measure(decode_str, modules, repeat), measure(decode_bytes, modules, repeat)
+    report("encode", *encode_times, len(modules))
+    report("decode", *decode_times, len(modules))
+    report("total", encode_times[0] + decode_times[0], encode_times[1] + decode_times[1], len(modules))
+
+    polls = module_data_polls(modules, 60)
+    memo = ModuleDataMemo()
+    plain_time = min(timeit_repeat(lambda: decode_module_data_plain(polls), number=1, repeat=15)) / len(polls)
+    memo_time = min(timeit_repeat(lambda: decode_module_data_memo(polls, memo), number=1, repeat=15)) / len(polls)
+    print(f"module data memo  plain: {plain_time * 1e6:8.1f} µs  memo: {memo_time * 1e6:8.1f} µs per poll "
+          f"({(1 - memo_time / plain_time) * 100:4.0f}% saved), hits: {memo.get_statistics().get_hits()}, "
+          f"misses: {memo.get_statistics().get_misses()}")
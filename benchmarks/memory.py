@@ -0,0 +1,95 @@
+"""Benchmark: memory footprint of the data objects of a large fleet
+
+Decodes the responses of an extended poll (module data, anti freeze temperature and holiday data) for every module
+of a fleet, keeps the HomeAssistantModuleData of all of them in memory like a consumer of get_all_data does and
+reports what tracemalloc counts per module. Every module gets its own device identifier, all of them run one of a
+few firmware versions.
+
+The baseline holds the same values in data objects like before __slots__ and interning: plain classes whose
+attributes live in a __dict__ and whose strings are copies of their own, as the parsers created them for every
+response.
+
+Usage: python -m benchmarks.memory [modules]
+"""
+import sys
+import tracemalloc
+
+from thermotecaeroflowflexismart.codec import (
+    strip_status,
+    decode_module_data,
+    decode_anti_freeze_temperature,
+    decode_holiday_data,
+)
+from thermotecaeroflowflexismart.data_object import GatewayDateTime, HolidayData, HomeAssistantModuleData, ModuleData
+
+FIRMWARE_VERSIONS = ["v201106", "v210412", "v220930"]
+ANTI_FREEZE_RESPONSE = b"OK,7\x00"
+HOLIDAY_RESPONSE = b"OK,RH,20,5,151,13,5,0,0,0,3,18,30,149\x00"
+DATE_TIME = GatewayDateTime("13,5,0,3,12,6,24,1,192.168.1.10,SIM00001".split(","))
+
+
+def module_data_response(index: int) -> bytes:
+    identifier = f"{index // 65536 % 256},{index // 256 % 256},{index % 256},1"
+    return (f"OK,18,8,19,2,50,{index % 60},3,0,0,0,0,1,1,129,0,{identifier},"
+            f"{FIRMWARE_VERSIONS[index % len(FIRMWARE_VERSIONS)]}\x00").encode()
+
+
+class DictDataObject:
+    """Copy of a data object with its attributes in a __dict__, see the baseline above"""
+
+    def __init__(self, data_object):
+        for name in data_object.__slots__:
+            value = getattr(data_object, name)
+            # encode / decode creates a new string, like a split of the response did
+            setattr(self, name, value.encode().decode() if isinstance(value, str) else value)
+
+
+# One class per data object, so the instances share their dict keys like the original classes did
+DICT_CLASSES = {data_class: type(f"Dict{data_class.__name__}", (DictDataObject,), {})
+                for data_class in (HomeAssistantModuleData, ModuleData, HolidayData)}
+
+
+def to_dict_data_object(data_object):
+    return DICT_CLASSES[type(data_object)](data_object)
+
+
+def build_fleet(modules: int, baseline: bool = False) -> list:
+    fleet = []
+    for index in range(modules):
+        # The responses arrive as fresh datagrams, they are not shared between the modules
+        module_data = decode_module_data(strip_status(module_data_response(index).rstrip(b"\x00")))
+        anti_freeze_temperature = decode_anti_freeze_temperature(strip_status(bytes(ANTI_FREEZE_RESPONSE).rstrip(b"\x00")))
+        holiday_data = decode_holiday_data(strip_status(bytes(HOLIDAY_RESPONSE).rstrip(b"\x00")))
+        if baseline:
+            module_data = to_dict_data_object(module_data)
+            holiday_data = to_dict_data_object(holiday_data)
+
+        home_assistant_module = HomeAssistantModuleData(index // 8 + 1, index % 8 + 1, module_data,
+                                                        anti_freeze_temperature, holiday_data, DATE_TIME)
+        fleet.append(to_dict_data_object(home_assistant_module) if baseline else home_assistant_module)
+    return fleet
+
+
+# Bytes held by the fleet and the peak while building it
+def measure(modules: int, baseline: bool) -> tuple[int, int]:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    fleet = build_fleet(modules, baseline)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del fleet
+    return after - before, peak - before
+
+
+if __name__ == "__main__":
+    module_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    footprints = {}
+    for name, baseline in (("baseline", True), ("slots", False)):
+        footprint, peak = measure(module_count, baseline)
+        footprints[name] = footprint
+        print(f"{name:8} {module_count} modules held: {footprint / 1024:8.1f} KiB, "
+              f"{footprint / module_count:6.1f} bytes per module (peak {peak / 1024:8.1f} KiB)")
+
+    print(f"saved: {(footprints['baseline'] - footprints['slots']) / module_count:6.1f} bytes per module "
+          f"({(1 - footprints['slots'] / footprints['baseline']) * 100:4.0f}%)")
@@ -0,0 +1,177 @@
+"""Benchmark: poll-cycle latency vs. fleet size
+
+Runs the client against a local GatewaySimulator for different numbers of modules and zones and reports, per
+scenario, the wall time, round trips, time spent sleeping (pacing), waiting in the request queue and on the wire,
+and p50/p95/p99 latencies per command family. The result is written as JSON, so runs of different releases can be
+compared.
+
+Usage: python -m benchmarks.poll_latency [--modules 1 10 30 60 120] [--zones 1 4 16] [--loopback] [--output result.json]
+"""
+import argparse
+import json
+import platform
+import sys
+from asyncio import run
+from time import perf_counter
+
+import thermotecaeroflowflexismart
+from thermotecaeroflowflexismart.client import Client
+from thermotecaeroflowflexismart.metrics import get_command_family
+from thermotecaeroflowflexismart.pacing import AdaptivePacing, FixedPacing
+from thermotecaeroflowflexismart.simulator import GatewaySimulator
+from thermotecaeroflowflexismart.transport import LoopbackTransport
+
+SCENARIOS = [
+    "get_all_data_extended",
+    "get_all_data",
+    "get_module_all_data",
+    "get_module_temperature",
+    "set_module_temperature",
+]
+
+
+def distribute(module_count: int, zone_count: int) -> list[int]:
+    modules_per_zone = [module_count // zone_count] * zone_count
+    for zone in range(module_count % zone_count):
+        modules_per_zone[zone] += 1
+    return modules_per_zone
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+class Recorder:
+    """Wraps FlexiSmartGateway.send_request_get_response and records the latency of every command"""
+
+    def __init__(self, client: Client):
+        self.latencies: dict[str, list[float]] = {}
+        gateway = client._gateway
+        send_request_get_response = gateway.send_request_get_response
+
+        async def recorded_send_request_get_response(request: bytes, *args, **kwargs):
+            start = perf_counter()
+            try:
+                return await send_request_get_response(request, *args, **kwargs)
+            finally:
+                self.latencies.setdefault(get_command_family(request), []).append(perf_counter() - start)
+
+        gateway.send_request_get_response = recorded_send_request_get_response
+
+    def get_total_latency(self) -> float:
+        return sum(sum(latencies) for latencies in self.latencies.values())
+
+
+async def run_scenario(scenario: str, client: Client, modules_per_zone: list[int]) -> None:
+    zone = next(zone for zone, modules in enumerate(modules_per_zone, start=1) if modules > 0)
+    match scenario:
+        case "get_all_data_extended":
+            await client.get_all_data(extended=True)
+        case "get_all_data":
+            await client.get_all_data(extended=False)
+        case "get_module_all_data":
+            await client.get_module_all_data(zone, 1)
+        case "get_module_temperature":
+            await client.get_module_temperature(zone, 1)
+        case "set_module_temperature":
+            await client.set_module_temperature(zone, 1, 21.5)
+
+
+async def measure(scenario: str, simulator: GatewaySimulator, modules_per_zone: list[int], arguments) -> dict:
+    host, port = simulator.get_address()
+    pacing = FixedPacing(arguments.fixed_pacing) if arguments.fixed_pacing is not None else AdaptivePacing()
+
+    wall_times = []
+    round_trips = 0
+    transport = LoopbackTransport(simulator) if arguments.loopback else None
+    async with Client(host, port, pacing=pacing, transport=transport) as client:
+        recorder = Recorder(client)
+        scheduler_statistics = client._gateway.get_scheduler_statistics()
+        for _ in range(arguments.repeat):
+            request_count = simulator.get_request_count()
+            start = perf_counter()
+            await run_scenario(scenario, client, modules_per_zone)
+            wall_times.append(perf_counter() - start)
+            round_trips += simulator.get_request_count() - request_count
+
+        sleeping = pacing.get_total_delay()
+        queue_wait = scheduler_statistics.get_total_wait_time()
+        on_the_wire = recorder.get_total_latency() - sleeping - queue_wait
+
+    return {
+        "scenario": scenario,
+        "wall_time": {
+            "mean": sum(wall_times) / len(wall_times),
+            "min": min(wall_times),
+            "max": max(wall_times),
+        },
+        "round_trips": round_trips / arguments.repeat,
+        "sleeping": sleeping / arguments.repeat,
+        "queue_wait": queue_wait / arguments.repeat,
+        "on_the_wire": on_the_wire / arguments.repeat,
+        "commands": {
+            family: {
+                "count": len(latencies),
+                "p50": percentile(latencies, 0.50),
+                "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99),
+            }
+            for family, latencies in sorted(recorder.latencies.items())
+        },
+    }
+
+
+async def main(arguments) -> dict:
+    results = []
+    for module_count in arguments.modules:
+        for zone_count in arguments.zones:
+            if zone_count > module_count:
+                continue
+
+            modules_per_zone = distribute(module_count, zone_count)
+            simulator = GatewaySimulator.create(modules_per_zone, latency=arguments.rf_latency, seed=0)
+            async with simulator:
+                for scenario in arguments.scenarios:
+                    result = await measure(scenario, simulator, modules_per_zone, arguments)
+                    result.update({"modules": module_count, "zones": zone_count})
+                    results.append(result)
+                    print(f"{module_count:4} modules {zone_count:3} zones  {scenario:24} "
+                          f"{result['wall_time']['mean'] * 1000:9.1f} ms  {result['round_trips']:6.1f} round trips",
+                          file=sys.stderr)
+
+    return {
+        "version": thermotecaeroflowflexismart.__version__,
+        "python": platform.python_version(),
+        "rf_latency": arguments.rf_latency,
+        "fixed_pacing": arguments.fixed_pacing,
+        "repeat": arguments.repeat,
+        "loopback": arguments.loopback,
+        "results": results,
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, nargs="+", default=[1, 10, 30, 60, 120])
+    parser.add_argument("--zones", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--rf-latency", type=float, default=0.005, help="simulated latency per request in seconds")
+    parser.add_argument("--fixed-pacing", type=float, default=None,
+                        help="use FixedPacing with this delay instead of AdaptivePacing")
+    parser.add_argument("--loopback", action="store_true",
+                        help="talk to the simulator without sockets (CPU cost of the client only)")
+    parser.add_argument("--output", default=None, help="write the JSON result to this file instead of stdout")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    report = run(main(arguments))
+    if arguments.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,65 @@
+"""Benchmark: connect-per-request vs. a persistent UDP endpoint
+
+Runs a local UDP responder and measures the round trip of a single command, once with a new socket per request
+(the previous behaviour of FlexiSmartGateway) and once over a single long-lived socket.
+
+Usage: python -m benchmarks.udp_endpoint [requests]
+"""
+import sys
+from asyncio import run, create_task
+from time import perf_counter
+
+from asyncio_dgram import bind, connect
+
+MESSAGE = b"R#1#1#0#0*?F/"
+RESPONSE = b"OK,18,8,19,2,50,59,3,0,0,0,0,1,1,129,0,4,8,9,10,v201106\x00"
+
+
+async def serve(server) -> None:
+    while True:
+        data, remote_addr = await server.recv()
+        await server.send(RESPONSE, remote_addr)
+
+
+async def connect_per_request(address, requests: int) -> float:
+    start = perf_counter()
+    for _ in range(requests):
+        client = await connect(address)
+        await client.send(MESSAGE)
+        await client.recv()
+        client.close()
+    return perf_counter() - start
+
+
+async def persistent_endpoint(address, requests: int) -> float:
+    start = perf_counter()
+    client = await connect(address)
+    for _ in range(requests):
+        await client.send(MESSAGE)
+        await client.recv()
+    client.close()
+    return perf_counter() - start
+
+
+async def main(requests: int) -> None:
+    server = await bind(("127.0.0.1", 0))
+    server_task = create_task(serve(server))
+    address = server.sockname
+
+    # warm up
+    await persistent_endpoint(address, 100)
+
+    per_request = await connect_per_request(address, requests)
+    persistent = await persistent_endpoint(address, requests)
+
+    server_task.cancel()
+    server.close()
+
+    print(f"requests:             {requests}")
+    print(f"connect per request:  {per_request * 1e6 / requests:8.1f} µs / request")
+    print(f"persistent endpoint:  {persistent * 1e6 / requests:8.1f} µs / request")
+    print(f"setup cost removed:   {(per_request - persistent) * 1e6 / requests:8.1f} µs / request")
+
+
+if __name__ == "__main__":
+    run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
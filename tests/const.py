@@ -1 +1,47 @@
-CLIENT_IP = "192.168.1.100"
\ No newline at end of file
+from asyncio import create_task
+
+from asyncio_dgram import bind
+
+from thermotecaeroflowflexismart.client import Client
+from thermotecaeroflowflexismart.pacing import FixedPacing
+from thermotecaeroflowflexismart.simulator import GatewaySimulator
+from thermotecaeroflowflexismart.transport import LoopbackTransport, Transport
+
+CLIENT_IP = "192.168.1.100"
+
+
+class UdpResponder:
+    """Answers every datagram with "OK,<message>" and remembers the sender addresses"""
+
+    def __init__(self, silent: bool = False):
+        self.silent = silent
+        self.remote_addresses = []
+        self._server = None
+        self._task = None
+
+    async def __aenter__(self):
+        self._server = await bind(("127.0.0.1", 0))
+        self._task = create_task(self._serve())
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._task.cancel()
+        self._server.close()
+
+    def get_port(self) -> int:
+        return self._server.sockname[1]
+
+    async def _serve(self):
+        while True:
+            data, remote_addr = await self._server.recv()
+            self.remote_addresses.append(remote_addr)
+            if not self.silent:
+                await self._server.send(b"OK," + data + b"\x00", remote_addr)
+
+
+# Client without sockets and pacing. transport replaces the LoopbackTransport, e.g. to record or replay the datagrams
+def create_loopback_client(simulator: GatewaySimulator | None = None, transport: Transport | None = None,
+                           **kwargs) -> Client:
+    if transport is None:
+        transport = LoopbackTransport(simulator)
+    return Client("loopback", pacing=FixedPacing(0.0), transport=transport, **kwargs)
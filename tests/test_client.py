@@ -3,7 +3,9 @@
 These tests use mocking to avoid actual network calls to the gateway.
 """
 
+from asyncio import sleep
 from datetime import datetime, timedelta
+from itertools import chain, repeat
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -20,7 +22,7 @@ from thermotecaeroflowflexismart.exception import InvalidResponse, RequestTimeou
 
 @pytest.fixture(autouse=True)
 def mock_sleep():
-    with patch("thermotecaeroflowflexismart.client.sleep", new_callable=AsyncMock) as mock_sleep:
+    with patch("thermotecaeroflowflexismart.communication.sleep", new_callable=AsyncMock) as mock_sleep:
         yield mock_sleep
 
 class TestClientInitialization:
@@ -57,6 +59,7 @@ class TestHomeAssistantIntegration:
          "v201106"])
     anti_freeze_temperature = 5.0
     holiday_data = HolidayData(["RH", "12", "9", "6", "16", "30", "45", "0", "0", "7", "20", "00", "10"])
+    status = {"serverSyncId": "123", "idA": "16", "idB": "197"}
 
     @pytest.mark.asyncio
     async def test_get_module_all_data(self):
@@ -123,6 +126,7 @@ class TestHomeAssistantIntegration:
     async def test_get_all_data_success(self):
         """Test get_all_data"""
         client = Client(CLIENT_IP)
+        client.get_status = AsyncMock(return_value=self.status)
         client.get_zones_with_module_count = AsyncMock(return_value=self.zones)
         client.get_date_time = AsyncMock(return_value=self.gateway_date_time)
         client.get_module_data = AsyncMock(side_effect=[
@@ -154,6 +158,7 @@ class TestHomeAssistantIntegration:
     async def test_get_all_data_with_zones(self):
         """Test get_all_data with zones"""
         client = Client(CLIENT_IP)
+        client.get_status = AsyncMock(return_value=self.status)
         client.get_zones_with_module_count = AsyncMock()
         client.get_date_time = AsyncMock(return_value=self.gateway_date_time)
         client.get_module_data = AsyncMock(side_effect=[
@@ -171,6 +176,7 @@ class TestHomeAssistantIntegration:
     async def test_get_all_data_short(self):
         """Test get_all_data with extended false"""
         client = Client(CLIENT_IP)
+        client.get_status = AsyncMock(return_value=self.status)
         client.get_zones_with_module_count = AsyncMock(return_value=self.zones)
         client.get_module_data = AsyncMock(side_effect=[
             self.module_data,
@@ -207,6 +213,7 @@ class TestHomeAssistantIntegration:
     async def test_get_all_data_empty_zone(self):
         """Test get_all_data with empty zone"""
         client = Client(CLIENT_IP)
+        client.get_status = AsyncMock(return_value=self.status)
         client.get_zones_with_module_count = AsyncMock(return_value=[1, 2, 0])
         client.get_date_time = AsyncMock(return_value=self.gateway_date_time)
         client.get_module_data = AsyncMock(side_effect=[
@@ -229,6 +236,7 @@ class TestHomeAssistantIntegration:
     async def test_get_all_data_invalid_device(self):
         """Test get_all_data with invalid device"""
         client = Client(CLIENT_IP)
+        client.get_status = AsyncMock(return_value=self.status)
         client.get_zones_with_module_count = AsyncMock(return_value=[1, 2, 0])
         client.get_date_time = AsyncMock(return_value=self.gateway_date_time)
 
@@ -257,6 +265,7 @@ class TestHomeAssistantIntegration:
     async def test_get_all_data_request_timeout(self):
         """Test get_all_data with invalid device"""
         client = Client(CLIENT_IP)
+        client.get_status = AsyncMock(return_value=self.status)
         client.get_zones_with_module_count = AsyncMock(return_value=[1, 2, 0])
         client.get_date_time = AsyncMock(return_value=self.gateway_date_time)
 
@@ -274,6 +283,26 @@ class TestHomeAssistantIntegration:
         assert isinstance(result, dict)
         assert len(result) == 2
 
+    @pytest.mark.asyncio
+    async def test_iter_all_data_yields_progressively(self):
+        """Test that iter_all_data yields each module before the next one is requested"""
+        client = Client(CLIENT_IP)
+        client.get_status = AsyncMock(return_value=self.status)
+        client.get_zones_with_module_count = AsyncMock(return_value=[2])
+        second_module = ModuleData(
+            ["18", "8", "19", "2", "50", "59", "3", "0", "0", "0", "0", "1", "1", "129", "0", "2", "1", "1", "1",
+             "v201106"])
+        client.get_module_data = AsyncMock(side_effect=[self.module_data, second_module])
+
+        modules = []
+        async for home_assistant_module in client.iter_all_data(extended=False):
+            modules.append(home_assistant_module)
+            assert client.get_module_data.await_count == len(modules)
+
+        assert [module.get_module_id() for module in modules] == [1, 2]
+        assert modules[1].get_module_data() == second_module
+        assert client.get_poll_statistics().get_polls() == 1
+
     @pytest.mark.asyncio
     async def test_get_all_data_utils_test(self):
         """Test get_all_data test utils"""
@@ -301,17 +330,17 @@ class TestClientPing:
     async def test_ping_success(self):
         """Test successful ping"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(return_value="OP")
+        client._gateway.send_request_get_response = AsyncMock(return_value=b"OP")
 
         result = await client.ping()
         assert result is True
-        client._gateway.send_message_get_response.assert_awaited_with("PING")
+        client._gateway.send_request_get_response.assert_awaited_with(b"PING")
 
     @pytest.mark.asyncio
     async def test_ping_failure_invalid_response(self):
         """Test ping with invalid response"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(return_value="INVALID")
+        client._gateway.send_request_get_response = AsyncMock(return_value=b"INVALID")
 
         result = await client.ping()
         assert result is False
@@ -320,7 +349,7 @@ class TestClientPing:
     async def test_ping_failure_timeout(self):
         """Test ping with timeout"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(side_effect=RequestTimeout())
+        client._gateway.send_request_get_response = AsyncMock(side_effect=RequestTimeout())
 
         result = await client.ping()
         assert result is False
@@ -333,8 +362,8 @@ class TestClientDateTime:
     async def test_get_date_time_success(self):
         """Test successful get_date_time"""
         client = Client(CLIENT_IP)
-        response = "OPOK,14,30,45,3,25,12,23,1,192.168.1.100,GATEWAY001"
-        client._gateway.send_message_get_response = AsyncMock(return_value=response)
+        response = b"OPOK,14,30,45,3,25,12,23,1,192.168.1.100,GATEWAY001"
+        client._gateway.send_request_get_response = AsyncMock(return_value=response)
 
         result = await client.get_date_time()
         assert isinstance(result, GatewayDateTime)
@@ -343,13 +372,13 @@ class TestClientDateTime:
         assert result.get_date() == "25.12.2023"
         assert result.get_ip() == "192.168.1.100"
         assert result.get_id() == "GATEWAY001"
-        client._gateway.send_message_get_response.assert_awaited_with("OPH/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"OPH/")
 
     @pytest.mark.asyncio
     async def test_get_date_time_invalid_response(self):
         """Test get_date_time with invalid response"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(return_value="INVALID")
+        client._gateway.send_request_get_response = AsyncMock(return_value=b"INVALID")
 
         with pytest.raises(InvalidResponse):
             await client.get_date_time()
@@ -358,17 +387,17 @@ class TestClientDateTime:
     async def test_set_date_time_success(self):
         """Test successful set_date_time"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(return_value="OPOK")
+        client._gateway.send_request_get_response = AsyncMock(return_value=b"OPOK")
 
         target_time = datetime(2023, 12, 25, 14, 30, 45)
         await client.set_date_time(target_time)
-        client._gateway.send_message_get_response.assert_awaited_with("OPF1430450/25,12,23/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"OPF1430450/25,12,23/")
 
     @pytest.mark.asyncio
     async def test_set_date_time_invalid_response(self):
         """Test set_date_time with invalid response"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(return_value="INVALID")
+        client._gateway.send_request_get_response = AsyncMock(return_value=b"INVALID")
 
         target_time = datetime(2023, 12, 25, 14, 30, 45)
         with pytest.raises(InvalidResponse):
@@ -378,7 +407,7 @@ class TestClientDateTime:
     async def test_update_date_time(self):
         """Test update_date_time calls set_date_time"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(return_value="OPOK")
+        client._gateway.send_request_get_response = AsyncMock(return_value=b"OPOK")
 
         fake_now = datetime(2024, 6, 10, 12, 10, 22)
         with patch("thermotecaeroflowflexismart.client.datetime") as mock_datetime:
@@ -386,7 +415,7 @@ class TestClientDateTime:
             mock_datetime.side_effect = lambda *args, **kwargs: datetime(*args, **kwargs)
             await client.update_date_time()
 
-        client._gateway.send_message_get_response.assert_awaited_with("OPF1210220/10,06,24/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"OPF1210220/10,06,24/")
 
 
 class TestClientGatewayData:
@@ -396,21 +425,21 @@ class TestClientGatewayData:
     async def test_get_gateway_data_success(self):
         """Test successful get_gateway_data"""
         client = Client(CLIENT_IP)
-        response = "OPOK,1.2.3,12345,IDU123"
-        client._gateway.send_message_get_response = AsyncMock(return_value=response)
+        response = b"OPOK,1.2.3,12345,IDU123"
+        client._gateway.send_request_get_response = AsyncMock(return_value=response)
 
         result = await client.get_gateway_data()
         assert isinstance(result, GatewayData)
         assert result.get_firmware() == "1.2.3"
         assert result.get_installation_id() == "12345"
         assert result.get_idu() == "IDU123"
-        client._gateway.send_message_get_response.assert_awaited_with("OPF/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"OPF/")
 
     @pytest.mark.asyncio
     async def test_get_gateway_data_invalid_response(self):
         """Test get_gateway_data with invalid response"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(return_value="INVALID")
+        client._gateway.send_request_get_response = AsyncMock(return_value=b"INVALID")
 
         with pytest.raises(InvalidResponse):
             await client.get_gateway_data()
@@ -423,26 +452,410 @@ class TestClientStatus:
     async def test_get_status_success(self):
         """Test successful get_status"""
         client = Client(CLIENT_IP)
-        response = "OPOK,OPS1,123,122,0,0,0,16,197,215,34,0"
-        client._gateway.send_message_get_response = AsyncMock(return_value=response)
+        response = b"OPOK,OPS1,123,122,0,0,0,16,197,215,34,0"
+        client._gateway.send_request_get_response = AsyncMock(return_value=response)
 
         result = await client.get_status()
         assert isinstance(result, dict)
         assert result["serverSyncId"] == "123"
         assert result["idA"] == "16"
         assert result["idB"] == "197"
-        client._gateway.send_message_get_response.assert_awaited_with("OPS1/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"OPS1/")
 
     @pytest.mark.asyncio
     async def test_get_status_invalid_response(self):
         """Test get_status with invalid response"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(return_value="INVALID")
+        client._gateway.send_request_get_response = AsyncMock(return_value=b"INVALID")
 
         with pytest.raises(InvalidResponse):
             await client.get_status()
 
 
+class TestClientGatewayLiveness:
+    """Tests for aborting a poll when the gateway goes dark"""
+
+    status = {"serverSyncId": "123", "idA": "16", "idB": "197"}
+
+    @staticmethod
+    def create_module_data(module: int) -> ModuleData:
+        return ModuleData(
+            ["18", "8", "19", "2", "50", "59", "3", "0", "0", "0", "0", "1", "1", "129", "0", "1", "1", "1",
+             str(module), "v201106"])
+
+    def create_client(self) -> Client:
+        client = Client(CLIENT_IP)
+        client.get_status = AsyncMock(return_value=self.status)
+        client.get_zones_with_module_count = AsyncMock(return_value=[5])
+        client.ping = AsyncMock(return_value=False)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_poll_is_aborted_when_gateway_goes_dark(self):
+        """Test that the poll stops after 3 timeouts and a failing PING and returns stale data"""
+        client = self.create_client()
+        client.get_module_data = AsyncMock(side_effect=[self.create_module_data(module) for module in range(1, 6)])
+        first = await client.get_all_data(extended=False)
+        assert len(first) == 5
+
+        client.get_module_data = AsyncMock(side_effect=[
+            self.create_module_data(1), RequestTimeout(), RequestTimeout(), RequestTimeout()
+        ])
+        result = await client.get_all_data(extended=False)
+
+        assert client.get_module_data.await_count == 4
+        client.ping.assert_awaited_once()
+        assert len(result) == 5
+        assert result["1.1.1.1"].is_stale() is False
+        assert all(result[f"1.1.1.{module}"].is_stale() for module in range(2, 6))
+        assert client.is_gateway_available() is False
+        assert client.get_poll_statistics().get_aborted_polls() == 1
+
+    @pytest.mark.asyncio
+    async def test_dark_gateway_is_only_pinged(self):
+        """Test that no module is requested until a PING succeeds again"""
+        client = self.create_client()
+        client.get_module_data = AsyncMock(side_effect=RequestTimeout())
+
+        result = await client.get_all_data(extended=False)
+        assert result == {}
+        assert client.get_module_data.await_count == 3
+        assert client.is_gateway_available() is False
+
+        result = await client.get_all_data(extended=False)
+        assert result == {}
+        assert client.get_module_data.await_count == 3
+        assert client.ping.await_count == 2
+
+        client.ping = AsyncMock(return_value=True)
+        client.get_module_data = AsyncMock(side_effect=[self.create_module_data(module) for module in range(1, 6)])
+        result = await client.get_all_data(extended=False)
+        assert len(result) == 5
+        assert client.is_gateway_available() is True
+
+    @pytest.mark.asyncio
+    async def test_sync_id_timeout_aborts_the_poll(self):
+        """Test that a timeout of the sync id probe aborts the poll before any module is requested"""
+        client = self.create_client()
+        client.get_module_data = AsyncMock(side_effect=[self.create_module_data(module) for module in range(1, 6)])
+        await client.get_all_data(extended=False)
+
+        client.get_status = AsyncMock(side_effect=RequestTimeout())
+        client.get_module_data = AsyncMock()
+        result = await client.get_all_data(extended=False)
+
+        client.get_status.assert_awaited_once()
+        client.get_module_data.assert_not_awaited()
+        client.ping.assert_not_awaited()
+        assert len(result) == 5
+        assert all(module.is_stale() for module in result.values())
+        assert client.is_gateway_available() is False
+
+    @pytest.mark.asyncio
+    async def test_modules_which_are_gone_are_not_stale(self):
+        """Test that modules which were not read in a complete poll do not come back as stale data"""
+        client = self.create_client()
+        client.get_module_data = AsyncMock(side_effect=[self.create_module_data(module) for module in range(1, 6)])
+        await client.get_all_data(extended=False)
+
+        client.get_module_data = AsyncMock(side_effect=[self.create_module_data(module) for module in range(1, 4)])
+        assert len(await client.get_all_data(zones=[3], extended=False)) == 3
+
+        client.get_module_data = AsyncMock(side_effect=RequestTimeout())
+        result = await client.get_all_data(zones=[3], extended=False)
+        assert sorted(result) == ["1.1.1.1", "1.1.1.2", "1.1.1.3"]
+        assert all(module.is_stale() for module in result.values())
+
+    @pytest.mark.asyncio
+    async def test_poll_continues_if_gateway_responds(self):
+        """Test that timeouts of dead modules do not abort the poll if the gateway answers the PING"""
+        client = self.create_client()
+        client.ping = AsyncMock(return_value=True)
+        client.get_module_data = AsyncMock(side_effect=[
+            RequestTimeout(), RequestTimeout(), RequestTimeout(), self.create_module_data(4), self.create_module_data(5)
+        ])
+
+        result = await client.get_all_data(extended=False)
+        assert len(result) == 2
+        client.ping.assert_awaited_once()
+        assert client.is_gateway_available() is True
+        assert client.get_poll_statistics().get_aborted_polls() == 0
+
+
+class TestClientTopologyCache:
+    """Tests for the cached zone topology"""
+
+    @pytest.mark.asyncio
+    async def test_topology_is_cached(self):
+        """Test that the zones are only requested once"""
+        client = Client(CLIENT_IP)
+        client._gateway.send_request_get_response = AsyncMock(
+            side_effect=[
+                b"OPOK,OPS3,1,2,3",
+                b"OK,18,08,20",
+                b"OK,15",
+            ]
+        )
+
+        await client.get_zone_temperature(1)
+        await client.get_module_boost(2, 2)
+        assert client._gateway.send_request_get_response.await_count == 3
+        client._gateway.send_request_get_response.assert_awaited_with(b"R#2#2#0#0*?E#1#22/")
+
+    @pytest.mark.asyncio
+    async def test_topology_expires(self):
+        """Test that the zones are requested again after the ttl"""
+        client = Client(CLIENT_IP, topology_ttl=0)
+        client._gateway.send_request_get_response = AsyncMock(
+            side_effect=[
+                b"OPOK,OPS3,1,2,3",
+                b"OK,18,08,20",
+                b"OPOK,OPS3,1,2,3",
+                b"OK,18,08,20",
+            ]
+        )
+
+        with patch("thermotecaeroflowflexismart.cache.monotonic", side_effect=chain([0], repeat(1))):
+            await client.get_zone_temperature(1)
+            await client.get_zone_temperature(1)
+        assert client._gateway.send_request_get_response.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_topology_invalidated_by_sync_id(self):
+        """Test that a changed server sync id drops the cached zones"""
+        client = Client(CLIENT_IP)
+        client._gateway.send_request_get_response = AsyncMock(
+            side_effect=[
+                b"OPOK,OPS1,123,122,0,0,0,16,197,215,34,0",
+                b"OPOK,OPS3,1,2,3",
+                b"OPOK,OPS1,123,122,0,0,0,16,197,215,34,0",
+                b"OPOK,OPS1,124,122,0,0,0,16,197,215,34,0",
+                b"OPOK,OPS3,1,2",
+            ]
+        )
+
+        await client.get_status()
+        await client.get_zones_with_module_count()
+        await client.get_status()
+        assert client._topology.get_zones() == [1, 2, 3]
+
+        await client.get_status()
+        assert client._topology.get_zones() is None
+        assert await client._Client__resolve_zones(None) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_topology_invalidated_by_zone_changes(self):
+        """Test that create_zone, delete_zone and register_module_in_zone drop the cached zones"""
+        client = Client(CLIENT_IP)
+        client._gateway.send_request_get_response = AsyncMock(
+            side_effect=[
+                b"OPOK,OPS3,1,2,3",
+                b"OPOK",
+                b"OPOK,OPS3,1,2,3,0",
+                b"OPOK",
+                b"OPOK,OPS3,1,2,3",
+                b"OPOK",
+            ]
+        )
+
+        await client.create_zone()
+        assert client._topology.get_zones() is None
+        await client.delete_zone(4)
+        assert client._topology.get_zones() is None
+        await client.register_module_in_zone(1)
+        assert client._topology.get_zones() is None
+        client._gateway.send_request_get_response.assert_awaited_with(b"OPZI199,1,1/", 30)
+
+
+class TestClientChangeDetection:
+    """Tests for the server sync id based change detection of get_all_data"""
+
+    status_response = b"OPOK,OPS1,123,122,0,0,0,16,197,215,34,0"
+    changed_status_response = b"OPOK,OPS1,124,122,0,0,0,16,197,215,34,0"
+    date_time_response = b"OPOK,14,30,45,3,25,12,23,1,192.168.1.10,GATEWAY001"
+    module_response = b"OK,18,8,19,2,50,59,3,0,0,0,0,1,1,129,0,4,8,9,10,v201106"
+    holiday_response = b"OK,RH,20,7,16,14,30,45,0,0,7,22,00,20"
+
+    @pytest.mark.asyncio
+    async def test_has_changed(self):
+        """Test has_changed for unknown, unchanged and changed sync ids"""
+        client = Client(CLIENT_IP)
+        client._gateway.send_request_get_response = AsyncMock(
+            side_effect=[self.status_response, self.status_response, self.changed_status_response, b"INVALID"]
+        )
+
+        assert await client.has_changed() is True
+        assert await client.has_changed() is False
+        assert await client.has_changed() is True
+        assert await client.has_changed() is True
+
+    @pytest.mark.asyncio
+    async def test_changed_sync_id_resets_quarantine_and_last_modules(self):
+        """Test that a changed sync id releases quarantined modules and forgets the last known modules"""
+        client = Client(CLIENT_IP)
+        client._gateway.send_request_get_response = AsyncMock(
+            side_effect=[
+                self.status_response, b"OPOK,OPS3,1", self.module_response,
+                self.status_response,
+                self.changed_status_response,
+            ]
+        )
+        client.get_date_time = AsyncMock(return_value=None)
+
+        await client.get_all_data(extended=False)
+        client._quarantine.record_failure(1, 1, "timeout")
+        client._quarantine.record_failure(1, 1, "timeout")
+        assert len(client._last_modules) == 1
+
+        assert await client.has_changed() is False
+        assert client.get_quarantined_modules() != []
+
+        assert await client.has_changed() is True
+        assert client.get_quarantined_modules() == []
+        assert client._last_modules == {}
+
+    @pytest.mark.asyncio
+    async def test_unchanged_poll_skips_topology_and_settings(self):
+        """Test that an unchanged sync id skips OPS3, anti-freeze and holiday reads"""
+        client = Client(CLIENT_IP)
+        client._gateway.send_request_get_response = AsyncMock(
+            side_effect=[
+                self.status_response, b"OPOK,OPS3,1", self.date_time_response, self.module_response, b"OK,5",
+                self.holiday_response,
+                self.status_response, self.date_time_response, self.module_response,
+                self.changed_status_response, b"OPOK,OPS3,1", self.date_time_response, self.module_response, b"OK,5",
+                self.holiday_response,
+            ]
+        )
+
+        first = await client.get_all_data()
+        second = await client.get_all_data()
+        statistics = client.get_poll_statistics()
+        assert statistics.get_last_round_trips() == 3
+        assert statistics.get_last_saved_round_trips() == 3
+        assert second["4.8.9.10"].get_anti_freeze_temperature() == 5.0
+        assert second["4.8.9.10"].get_holiday_data() is first["4.8.9.10"].get_holiday_data()
+
+        await client.get_all_data()
+        assert statistics.get_polls() == 3
+        assert statistics.get_unchanged_polls() == 1
+        assert statistics.get_last_round_trips() == 6
+        assert statistics.get_last_saved_round_trips() == 0
+        assert statistics.get_total_saved_round_trips() == 3
+
+    @pytest.mark.asyncio
+    async def test_own_writes_update_cached_settings(self):
+        """Test that the next poll uses the anti-freeze temperature the client has written"""
+        client = Client(CLIENT_IP)
+        client._gateway.send_request_get_response = AsyncMock(
+            side_effect=[
+                self.status_response, b"OPOK,OPS3,1", self.module_response, b"OK,5", self.holiday_response,
+                b"OK",
+                self.status_response, self.module_response,
+            ]
+        )
+
+        client.get_date_time = AsyncMock(return_value=None)
+
+        await client.get_all_data()
+        await client.set_zone_anti_freeze_temperature(1, 7)
+        result = await client.get_all_data()
+        assert result["4.8.9.10"].get_anti_freeze_temperature() == 7.0
+        assert client.get_poll_statistics().get_last_saved_round_trips() == 3
+
+    @pytest.mark.asyncio
+    async def test_change_detection_disabled(self):
+        """Test that no sync id probe is sent if change detection is disabled"""
+        client = Client(CLIENT_IP, change_detection=False)
+        client._gateway.send_request_get_response = AsyncMock(
+            side_effect=[b"OPOK,OPS3,1", self.module_response]
+        )
+
+        await client.get_all_data(extended=False)
+        client._gateway.send_request_get_response.assert_awaited_with(b"R#1#1#0#0*?F/")
+        assert client.get_poll_statistics().get_last_round_trips() == 2
+
+
+class TestClientModuleStateCache:
+    """Tests for max_age reads from the module state cache"""
+
+    @pytest.mark.asyncio
+    async def test_max_age(self):
+        """Test that a fresh enough value is served from the cache and an older one is read again"""
+        client = Client(CLIENT_IP)
+        client._gateway.send_request_get_response = AsyncMock(side_effect=[b"OK,18,8,20", b"OK,19,0,20"])
+
+        with patch("thermotecaeroflowflexismart.cache.monotonic", side_effect=chain([0], repeat(10))):
+            first = await client.get_module_temperature(1, 2, [2], max_age=60)
+            assert await client.get_module_temperature(1, 2, [2], max_age=60) is first
+            assert client._gateway.send_request_get_response.await_count == 1
+
+            second = await client.get_module_temperature(1, 2, [2], max_age=5)
+        assert second.get_current_temperature() == 19.0
+        assert client._gateway.send_request_get_response.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_zone_write_updates_cached_modules(self):
+        """Test that a zone write updates the cached values of all modules of the zone"""
+        client = Client(CLIENT_IP)
+        client._gateway.send_request_get_response = AsyncMock(
+            side_effect=[b"OK,1", b"OK,18,8,19,2,50,59,3,0,0,0,0,1,1,129,0,4,8,9,10,v201106", b"OK", b"OK"]
+        )
+
+        assert await client.is_module_smart_start_enabled(1, 2, [2], max_age=60) is True
+        module_data = await client.get_module_data(1, 1, [2])
+        await client.disable_zone_smart_start(1, [2])
+        assert await client.is_module_smart_start_enabled(1, 2, [2], max_age=60) is False
+        assert await client.is_module_smart_start_enabled(1, 1, [2], max_age=60) is False
+        assert (await client.get_module_data(1, 1, [2], max_age=60)).is_smart_start_enabled() is False
+        assert module_data.is_smart_start_enabled() is True
+        client._gateway.send_request_get_response.assert_awaited_with(b"D#1#2#0#0*SEP#0#7#0/")
+
+        await client.set_module_temperature(1, 1, 22.0, [2])
+        cached = await client.get_module_data(1, 1, [2], max_age=60)
+        assert cached.get_target_temperature() == 22.0
+        assert cached.get_current_temperature() == module_data.get_current_temperature()
+        assert client._gateway.send_request_get_response.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_write_drops_cached_value(self):
+        """Test that an ER response leaves the setting unknown"""
+        client = Client(CLIENT_IP)
+        client._gateway.send_request_get_response = AsyncMock(side_effect=[b"OK,20", b"ER,1", b"OK,20"])
+
+        assert await client.get_module_anti_freeze_temperature(1, 1, [1], max_age=60) == 20.0
+        with pytest.raises(InvalidResponse):
+            await client.set_module_anti_freeze_temperature(1, 1, 8, [1])
+        assert await client.get_module_anti_freeze_temperature(1, 1, [1], max_age=60) == 20.0
+        assert client._gateway.send_request_get_response.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_deferred_write_verification(self):
+        """Test that verify_writes reads the written setting again in the background"""
+        client = Client(CLIENT_IP, verify_writes=0)
+        client._gateway.send_request_get_response = AsyncMock(side_effect=[b"OK", b"OK,10"])
+
+        await client.set_module_boost(1, 1, 15, [1])
+        assert await client.get_module_boost(1, 1, [1], max_age=60) == 15
+        await sleep(0.01)
+        client._gateway.send_request_get_response.assert_awaited_with(b"R#1#1#0#0*?E#1#22/")
+        assert await client.get_module_boost(1, 1, [1], max_age=60) == 50
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        """Test that an outdated value is returned at once and refreshed in the background"""
+        client = Client(CLIENT_IP)
+        client._gateway.send_request_get_response = AsyncMock(side_effect=[b"OK,20", b"OK,22"])
+
+        with patch("thermotecaeroflowflexismart.cache.monotonic", side_effect=chain([0], repeat(10))):
+            assert await client.get_module_anti_freeze_temperature(1, 1, [1]) == 20.0
+            assert await client.get_module_anti_freeze_temperature(1, 1, [1], max_age=5,
+                                                                   stale_while_revalidate=True) == 20.0
+            await sleep(0.01)
+            assert client._gateway.send_request_get_response.await_count == 2
+            assert await client.get_module_anti_freeze_temperature(1, 1, [1], max_age=60) == 22.0
+
+
 class TestClientZones:
     """Tests for Client zone methods"""
 
@@ -450,24 +863,24 @@ class TestClientZones:
     async def test_create_zone_success(self):
         """Test successful create_zone"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(
+        client._gateway.send_request_get_response = AsyncMock(
             side_effect=[
-                "OPOK,OPS3,1,2,3",
-                "OPOK"
+                b"OPOK,OPS3,1,2,3",
+                b"OPOK"
             ]
         )
 
         await client.create_zone()
-        client._gateway.send_message_get_response.assert_awaited_with("OPMW12,4/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"OPMW12,4/")
 
     @pytest.mark.asyncio
     async def test_create_zone_invalid_response(self):
         """Test create_zone with invalid response"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(
+        client._gateway.send_request_get_response = AsyncMock(
             side_effect=[
-                "OPOK,OPS3,1,2,3",
-                "INVALID"
+                b"OPOK,OPS3,1,2,3",
+                b"INVALID"
             ]
         )
 
@@ -478,24 +891,24 @@ class TestClientZones:
     async def test_delete_zone_success(self):
         """Test successful delete_zone"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(
+        client._gateway.send_request_get_response = AsyncMock(
             side_effect=[
-                "OPOK,OPS3,1,2,3",
-                "OPOK"
+                b"OPOK,OPS3,1,2,3",
+                b"OPOK"
             ]
         )
 
         await client.delete_zone(1)
-        client._gateway.send_message_get_response.assert_awaited_with("OPMW129,0/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"OPMW129,0/")
 
     @pytest.mark.asyncio
     async def test_delete_zone_invalid_response(self):
         """Test delete_zone with invalid response"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(
+        client._gateway.send_request_get_response = AsyncMock(
             side_effect=[
-                "OPOK,OPS3,1,2,3",
-                "INVALID"
+                b"OPOK,OPS3,1,2,3",
+                b"INVALID"
             ]
         )
 
@@ -506,19 +919,19 @@ class TestClientZones:
     async def test_get_zones_success(self):
         """Test successful get_zones"""
         client = Client(CLIENT_IP)
-        response = "OPOK,OPS2,1,2,3,4"
-        client._gateway.send_message_get_response = AsyncMock(return_value=response)
+        response = b"OPOK,OPS2,1,2,3,4"
+        client._gateway.send_request_get_response = AsyncMock(return_value=response)
 
         result = await client.get_zones()
         assert isinstance(result, list)
         assert result == [1, 2, 3, 4]
-        client._gateway.send_message_get_response.assert_awaited_with("OPS2/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"OPS2/")
 
     @pytest.mark.asyncio
     async def test_get_zones_invalid_response(self):
         """Test get_zones with invalid response"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(return_value="INVALID")
+        client._gateway.send_request_get_response = AsyncMock(return_value=b"INVALID")
 
         with pytest.raises(InvalidResponse):
             await client.get_zones()
@@ -527,19 +940,19 @@ class TestClientZones:
     async def test_get_zones_with_module_count_success(self):
         """Test successful get_zones_with_module_count"""
         client = Client(CLIENT_IP)
-        response = "OPOK,OPS3,1,1,0,3"
-        client._gateway.send_message_get_response = AsyncMock(return_value=response)
+        response = b"OPOK,OPS3,1,1,0,3"
+        client._gateway.send_request_get_response = AsyncMock(return_value=response)
 
         result = await client.get_zones_with_module_count()
         assert isinstance(result, list)
         assert result == [1, 1, 0, 3]
-        client._gateway.send_message_get_response.assert_awaited_with("OPS3/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"OPS3/")
 
     @pytest.mark.asyncio
     async def test_get_zones_with_module_count_invalid_response(self):
         """Test get_zones_with_module_count with invalid response"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(return_value="INVALID")
+        client._gateway.send_request_get_response = AsyncMock(return_value=b"INVALID")
 
         with pytest.raises(InvalidResponse):
             await client.get_zones_with_module_count()
@@ -576,10 +989,10 @@ class TestClientModuleData:
     async def test_get_module_data_success(self):
         """Test successful get_module_data"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(
+        client._gateway.send_request_get_response = AsyncMock(
             side_effect=[
-                "OPOK,OPS3,1,2,3",
-                "OK,18,8,19,2,50,59,3,0,0,0,0,1,1,129,0,4,8,9,10,v201106"
+                b"OPOK,OPS3,1,2,3",
+                b"OK,18,8,19,2,50,59,3,0,0,0,0,1,1,129,0,4,8,9,10,v201106"
             ]
         )
 
@@ -598,16 +1011,16 @@ class TestClientModuleData:
         assert result.get_language() == "English"
         assert result.get_device_identifier() == "4.8.9.10"
         assert result.get_firmware_version() == "v201106"
-        client._gateway.send_message_get_response.assert_awaited_with("R#1#1#0#0*?F/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"R#1#1#0#0*?F/")
 
     @pytest.mark.asyncio
     async def test_get_module_data_german(self):
         """Test successful get_module_data with language german"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(
+        client._gateway.send_request_get_response = AsyncMock(
             side_effect=[
-                "OPOK,OPS3,1,2,3",
-                "OK,18,8,19,2,50,59,3,0,0,0,0,1,1,128,0,4,8,9,10,v201106"
+                b"OPOK,OPS3,1,2,3",
+                b"OK,18,8,19,2,50,59,3,0,0,0,0,1,1,128,0,4,8,9,10,v201106"
             ]
         )
 
@@ -626,16 +1039,16 @@ class TestClientModuleData:
         assert result.get_language() == "Deutsch"
         assert result.get_device_identifier() == "4.8.9.10"
         assert result.get_firmware_version() == "v201106"
-        client._gateway.send_message_get_response.assert_awaited_with("R#1#1#0#0*?F/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"R#1#1#0#0*?F/")
 
     @pytest.mark.asyncio
     async def test_get_module_data_boost_time(self):
         """Test successful get_module_data with boost time"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(
+        client._gateway.send_request_get_response = AsyncMock(
             side_effect=[
-                "OPOK,OPS3,1,2,3",
-                "OK,18,8,19,2,50,59,3,0,0,20,0,1,1,128,0,4,8,9,10,v201106"
+                b"OPOK,OPS3,1,2,3",
+                b"OK,18,8,19,2,50,59,3,0,0,20,0,1,1,128,0,4,8,9,10,v201106"
             ]
         )
 
@@ -654,16 +1067,16 @@ class TestClientModuleData:
         assert result.get_language() == "Deutsch"
         assert result.get_device_identifier() == "4.8.9.10"
         assert result.get_firmware_version() == "v201106"
-        client._gateway.send_message_get_response.assert_awaited_with("R#1#1#0#0*?F/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"R#1#1#0#0*?F/")
 
     @pytest.mark.asyncio
     async def test_get_module_data_invalid_response(self):
         """Test get_module_data with invalid response"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(
+        client._gateway.send_request_get_response = AsyncMock(
             side_effect=[
-                "OPOK,OPS3,1,2,3",
-                "INVALID"
+                b"OPOK,OPS3,1,2,3",
+                b"INVALID"
             ]
         )
 
@@ -678,8 +1091,8 @@ class TestClientNetworkConfiguration:
     async def test_get_network_configuration_success(self):
         """Test successful get_network_configuration"""
         client = Client(CLIENT_IP)
-        response = "OPOK,OPS38,10,255,255,20,10,0,0,1,255,0,0,0,48,48,48,52,97,51,48,48,49,53,49,53,66,53,1,1,51,254,215,41,66,51"
-        client._gateway.send_message_get_response = AsyncMock(return_value=response)
+        response = b"OPOK,OPS38,10,255,255,20,10,0,0,1,255,0,0,0,48,48,48,52,97,51,48,48,49,53,49,53,66,53,1,1,51,254,215,41,66,51"
+        client._gateway.send_request_get_response = AsyncMock(return_value=response)
 
         result = await client.get_network_configuration()
         assert isinstance(result, GatewayNetworkConfiguration)
@@ -691,13 +1104,13 @@ class TestClientNetworkConfiguration:
         assert result.get_registration_server_ip() == "51.254.215.41"
         assert result.get_registration_server_port() == 6651
         assert result.get_registration_server_ip_with_port() == "51.254.215.41:6651"
-        client._gateway.send_message_get_response.assert_awaited_with("OPS38/")
+        client._gateway.send_request_get_response.assert_awaited_with(b"OPS38/")
 
     @pytest.mark.asyncio
     async def test_get_network_configuration_invalid_response(self):
         """Test get_network_configuration with invalid response"""
         client = Client(CLIENT_IP)
-        client._gateway.send_message_get_response = AsyncMock(return_value="INVALID")
+        client._gateway.send_request_get_response = AsyncMock(return_value=b"INVALID")
 
         with pytest.raises(InvalidResponse):
             await client.get_network_configuration()
@@ -723,8 +1136,8 @@ class TestClientTemperatureMethods:
     async def test_get_zone_temperature_success(self):
         """Test successful get_zone_temperature"""
         client = Client(CLIENT_IP)
-        response = "OPOK,OPT0,,20,5,22"
-        client._gateway.send_message_get_response = AsyncMock(return_value=response)
+        response = b"OPOK,OPT0,,20,5,22"
+        client._gateway.send_request_get_response = AsyncMock(return_value=response)
         client._get_temperature = AsyncMock(return_value=Temperature(["20", "5", "22"]))
 
         result = await client.get_zone_temperature(1)
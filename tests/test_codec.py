@@ -0,0 +1,155 @@
+"""Unit Tests for codec.py - Thermotec AeroFlow® Library"""
+
+import pytest
+
+from tests.const import UdpResponder
+from thermotecaeroflowflexismart.codec import (
+    GET_MODULE_DATA,
+    GET_TEMPERATURE,
+    GET_HOLIDAY_DATA,
+    SET_TEMPERATURE,
+    encode_zone_command,
+    encode_operation,
+    strip_status,
+    decode_module_data,
+    decode_temperature,
+    decode_holiday_data,
+    decode_anti_freeze_temperature,
+    ModuleDataMemo,
+)
+from thermotecaeroflowflexismart.communication import FlexiSmartGateway
+from thermotecaeroflowflexismart.data_object import ModuleData, Temperature, HolidayData
+from thermotecaeroflowflexismart.exception import InvalidResponse
+from thermotecaeroflowflexismart.utils import (
+    TEMPERATURE_FROM_INT,
+    TEMPERATURE_OFFSET_FROM_INT,
+    calculate_temperature_from_int,
+    calculate_temperature_offset_from_int,
+)
+
+MODULE_DATA = "18,8,19,2,50,9,3,0,0,0,246,1,1,129,0,4,8,9,10,v201106"
+HOLIDAY_DATA = "RH,20,5,151,13,5,0,0,0,3,18,30,149"
+
+
+def fields(data_object) -> dict:
+    return {name: getattr(data_object, name) for name in data_object.__slots__}
+
+
+class TestCodec:
+    """Tests for the bytes codec"""
+
+    def test_lookup_tables(self):
+        """Test that the lookup tables match the conversion functions"""
+        for value in range(256):
+            assert TEMPERATURE_FROM_INT[value] == calculate_temperature_from_int(value)
+            assert TEMPERATURE_OFFSET_FROM_INT[value] == calculate_temperature_offset_from_int(value)
+
+    def test_encode(self):
+        """Test the request templates"""
+        assert encode_zone_command(1, 2, GET_MODULE_DATA, 2) == b"R#1#2#0#0*?F/"
+        assert encode_zone_command(3, 4, GET_TEMPERATURE) == b"D#3#4#0#0*?T/"
+        assert encode_zone_command(3, 2, GET_TEMPERATURE, 2) == b"R#3#2#0#0*?T/"
+        assert encode_zone_command(1, 2, SET_TEMPERATURE % 149) == b"D#1#2#0#0*T149/"
+        assert encode_zone_command(1, 1, GET_HOLIDAY_DATA, 1) == b"R#1#1#0#0*?RH/"
+        assert encode_operation(b"OPS1") == b"OPS1/"
+
+    @pytest.mark.parametrize("payload", [MODULE_DATA, MODULE_DATA.encode(), memoryview(MODULE_DATA.encode())])
+    def test_decode_module_data(self, payload):
+        """Test that the decoded module data matches the data object built from the str fields"""
+        expected = ModuleData(MODULE_DATA.split(","))
+        module_data = decode_module_data(payload)
+
+        assert fields(module_data) == fields(expected)
+        assert module_data.get_current_temperature() == 18.8
+        assert module_data.get_target_temperature() == 19.0
+        assert module_data.get_time() == "02:50:09"
+        assert module_data.get_temperature_offset() == -1.0
+        assert module_data.get_device_identifier() == "4.8.9.10"
+        assert module_data.get_firmware_version() == "v201106"
+
+    @pytest.mark.parametrize("payload", [HOLIDAY_DATA, HOLIDAY_DATA.encode()])
+    def test_decode_holiday_data(self, payload):
+        """Test that the decoded holiday data matches the data object built from the str fields"""
+        assert fields(decode_holiday_data(payload)) == fields(HolidayData(HOLIDAY_DATA.split(",")))
+
+    def test_decode_temperature_and_anti_freeze_temperature(self):
+        """Test the small decoders"""
+        assert fields(decode_temperature(b"20,5,149")) == fields(Temperature(["20", "5", "149"]))
+        assert decode_anti_freeze_temperature(b"7") == 7.0
+        assert decode_anti_freeze_temperature("255") == 5.0
+
+    def test_decode_fields_outside_of_the_lookup_table(self):
+        """Test that fields with leading zeros are parsed and values outside of a byte are rejected"""
+        assert decode_temperature(b"020,05,149").get_current_temperature() == 20.5
+
+        with pytest.raises(InvalidResponse):
+            decode_temperature(b"20,5,300")
+        with pytest.raises(InvalidResponse):
+            decode_temperature(b"20,x,149")
+
+    def test_decode_invalid_response(self):
+        """Test that incomplete or unexpected responses raise an invalid response"""
+        with pytest.raises(InvalidResponse):
+            decode_module_data(b"18,8,19")
+        with pytest.raises(InvalidResponse):
+            strip_status(b"ER,1")
+
+        assert bytes(strip_status(b"OK,20,5,149")) == b"20,5,149"
+
+    def test_compact_data_objects(self):
+        """Test that the data objects have no instance dict and share repeated strings"""
+        first = decode_module_data(MODULE_DATA.encode())
+        second = ModuleData(MODULE_DATA.split(","))
+
+        assert not hasattr(first, "__dict__")
+        assert not hasattr(second, "__dict__")
+        assert first.get_firmware_version() is second.get_firmware_version()
+        assert first._id3 is second._id3
+
+    def test_module_data_memo(self):
+        """Test that identical payloads share the decoded data and payloads which differ in the clock only the time"""
+        memo = ModuleDataMemo()
+        payload = MODULE_DATA.encode()
+        first = memo.decode(payload)
+
+        assert memo.decode(memoryview(payload)) is first
+        later = memo.decode(payload.replace(b"2,50,9", b"2,51,13"))
+        assert later.get_time() == "02:51:13"
+        assert fields(later) == fields(decode_module_data(payload.replace(b"2,50,9", b"2,51,13")))
+        assert first.get_time() == "02:50:09"
+        changed = memo.decode(payload.replace(b"18,8,19", b"18,9,19"))
+        assert changed.get_current_temperature() == 18.9
+
+        statistics = memo.get_statistics()
+        assert (statistics.get_hits(), statistics.get_misses()) == (2, 2)
+        assert memo.get_size() == 2
+
+        with pytest.raises(InvalidResponse):
+            memo.decode(payload.replace(b"2,50,9", b"2,50,300"))
+        with pytest.raises(InvalidResponse):
+            memo.decode(b"18,8,19")
+
+    def test_module_data_memo_is_bounded(self):
+        """Test that the least recently used payload is dropped"""
+        memo = ModuleDataMemo(maxsize=2)
+        payloads = [MODULE_DATA.replace("18,8", f"18,{value}") for value in range(3)]
+        first = memo.decode(payloads[0])
+        memo.decode(payloads[1])
+        memo.decode(payloads[0])
+        memo.decode(payloads[2])
+
+        assert memo.get_size() == 2
+        assert memo.decode(payloads[0]) is first
+        assert memo.get_statistics().get_misses() == 3
+        memo.decode(payloads[1])
+        assert memo.get_statistics().get_misses() == 4
+
+    @pytest.mark.asyncio
+    async def test_gateway_bytes_path(self):
+        """Test that requests can be sent and received as bytes"""
+        async with UdpResponder() as responder:
+            gateway = FlexiSmartGateway("127.0.0.1", responder.get_port())
+            response = await gateway.send_request_get_response(encode_zone_command(1, 2, GET_MODULE_DATA, 2))
+            await gateway.close()
+
+        assert response == b"OK,R#1#2#0#0*?F/"
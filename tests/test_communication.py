@@ -0,0 +1,77 @@
+"""Unit Tests for communication.py - Thermotec AeroFlow® Library
+
+These tests run the gateway against a local UDP responder.
+"""
+
+from asyncio import gather
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from tests.const import UdpResponder
+from thermotecaeroflowflexismart.client import Client
+from thermotecaeroflowflexismart.communication import FlexiSmartGateway
+from thermotecaeroflowflexismart.exception import RequestTimeout
+
+
+@pytest.fixture(autouse=True)
+def mock_sleep():
+    with patch("thermotecaeroflowflexismart.communication.sleep", new_callable=AsyncMock) as mock_sleep:
+        yield mock_sleep
+
+
+class TestFlexiSmartGatewayEndpoint:
+    """Tests for the long-lived datagram endpoint"""
+
+    @pytest.mark.asyncio
+    async def test_endpoint_is_reused(self):
+        """Test that consecutive requests share one socket"""
+        async with UdpResponder() as responder:
+            gateway = FlexiSmartGateway("127.0.0.1", responder.get_port())
+            assert gateway.is_open() is False
+
+            assert await gateway.send_message_get_response("PING") == "OK,PING"
+            assert await gateway.send_message_get_response("OPH/") == "OK,OPH/"
+            assert gateway.is_open() is True
+            assert len(set(responder.remote_addresses)) == 1
+
+            await gateway.close()
+            assert gateway.is_open() is False
+
+    @pytest.mark.asyncio
+    async def test_endpoint_reconnects_after_timeout(self):
+        """Test that a timeout drops the socket and the next request reconnects"""
+        async with UdpResponder(silent=True) as responder:
+            gateway = FlexiSmartGateway("127.0.0.1", responder.get_port())
+
+            with pytest.raises(RequestTimeout):
+                await gateway.send_message_get_response("PING", 0.1)
+            assert gateway.is_open() is False
+
+            responder.silent = False
+            assert await gateway.send_message_get_response("PING") == "OK,PING"
+            assert gateway.is_open() is True
+            await gateway.close()
+
+    @pytest.mark.asyncio
+    async def test_client_context_manager(self):
+        """Test that the client opens and closes the gateway endpoint"""
+        async with UdpResponder() as responder:
+            async with Client("127.0.0.1", responder.get_port()) as client:
+                assert client._gateway.is_open() is True
+                assert await client.ping() is False  # responder does not answer with "OP"
+            assert client._gateway.is_open() is False
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_serialized(self):
+        """Test that concurrent requests each get their own response"""
+        async with UdpResponder() as responder:
+            gateway = FlexiSmartGateway("127.0.0.1", responder.get_port())
+
+            messages = [f"R#1#{module}#0#0*?F/" for module in range(1, 11)]
+            responses = await gather(*(gateway.send_message_get_response(message) for message in messages))
+
+            assert responses == [f"OK,{message}" for message in messages]
+            assert gateway.get_scheduler_statistics().get_requests() == 10
+            assert gateway.get_scheduler_statistics().get_max_queue_depth() == 9
+            await gateway.close()
@@ -0,0 +1,106 @@
+"""Unit Tests for coordinator.py - Thermotec AeroFlow® Library"""
+
+from asyncio import sleep
+
+import pytest
+
+from tests.const import create_loopback_client
+from thermotecaeroflowflexismart.client import Client
+from thermotecaeroflowflexismart.coordinator import PollingCoordinator
+from thermotecaeroflowflexismart.simulator import GatewaySimulator
+from thermotecaeroflowflexismart.transport import LoopbackTransport, RecordingTransport
+
+
+def create_client(simulator: GatewaySimulator) -> tuple[Client, RecordingTransport]:
+    transport = RecordingTransport(LoopbackTransport(simulator))
+    return create_loopback_client(transport=transport), transport
+
+
+def count_requests(transport: RecordingTransport, command: bytes) -> int:
+    return sum(1 for request, _ in transport.get_records() if command in request)
+
+
+class TestPollingCoordinator:
+    """Tests for the background polling with tiered refresh rates"""
+
+    @pytest.mark.asyncio
+    async def test_tiers(self):
+        """Test that only the module data is read again while the slower tiers are fresh"""
+        simulator = GatewaySimulator.create([2, 1])
+        client, transport = create_client(simulator)
+        coordinator = PollingCoordinator(client, module_interval=60.0)
+
+        await coordinator.refresh()
+        modules = coordinator.get_modules()
+        assert len(modules) == 3
+        assert all(module.get_anti_freeze_temperature() is not None for module in modules.values())
+        assert all(module.get_holiday_data() is not None for module in modules.values())
+        assert all(module.get_date_time() is coordinator.get_date_time() for module in modules.values())
+        assert coordinator.get_gateway_data() is not None
+        assert coordinator.get_network_configuration() is not None
+
+        first = coordinator.get_snapshot()
+        simulator.get_module(2, 1).set_current_temperature(24.5)
+        await coordinator.refresh()
+
+        assert count_requests(transport, b"?F") == 6
+        assert count_requests(transport, b"?E#1#20") == 3
+        assert count_requests(transport, b"?RH") == 3
+        assert count_requests(transport, b"OPH") == 1
+        assert count_requests(transport, b"OPF") == 1
+        assert count_requests(transport, b"OPS38") == 1
+        module = coordinator.get_module("10.2.1.1")
+        assert module.get_module_data().get_current_temperature() == 24.5
+        assert module.get_anti_freeze_temperature() is not None
+        assert coordinator.get_module("10.1.1.1") is first.get_module("10.1.1.1")
+        assert dict(first.diff(coordinator.get_snapshot()).get_changed()) == {"10.2.1.1": ("current_temperature",)}
+
+    @pytest.mark.asyncio
+    async def test_slow_tier_expires(self):
+        """Test that anti-freeze, holiday and date / time are read again after settings_interval"""
+        simulator = GatewaySimulator.create([1])
+        client, transport = create_client(simulator)
+        coordinator = PollingCoordinator(client, settings_interval=0.0)
+
+        await coordinator.refresh()
+        await coordinator.refresh()
+
+        assert count_requests(transport, b"?E#1#20") == 2
+        assert count_requests(transport, b"?RH") == 2
+        assert count_requests(transport, b"OPH") == 2
+        assert count_requests(transport, b"OPS38") == 1
+
+    @pytest.mark.asyncio
+    async def test_snapshot_reads_without_io(self):
+        """Test that the getters do not talk to the gateway and own writes show up without a read"""
+        simulator = GatewaySimulator.create([1])
+        client, transport = create_client(simulator)
+        coordinator = PollingCoordinator(client)
+        await coordinator.refresh()
+
+        requests = len(transport.get_records())
+        coordinator.get_modules()
+        coordinator.get_module("10.1.1.1")
+        coordinator.get_gateway_data()
+        assert len(transport.get_records()) == requests
+
+        await client.set_module_anti_freeze_temperature(1, 1, 10.0)
+        await coordinator.refresh()
+        assert coordinator.get_module("10.1.1.1").get_anti_freeze_temperature() == 10.0
+        assert count_requests(transport, b"?E#1#20") == 1
+
+    @pytest.mark.asyncio
+    async def test_background_refresh(self):
+        """Test that the started coordinator keeps refreshing until it is stopped"""
+        simulator = GatewaySimulator.create([1])
+        client, _ = create_client(simulator)
+
+        async with PollingCoordinator(client, module_interval=0.01) as coordinator:
+            assert coordinator.is_running() is True
+            assert coordinator.get_module("10.1.1.1") is not None
+
+            simulator.get_module(1, 1).set_current_temperature(26.5)
+            await sleep(0.1)
+            assert coordinator.get_module("10.1.1.1").get_module_data().get_current_temperature() == 26.5
+
+        assert coordinator.is_running() is False
@@ -0,0 +1,84 @@
+"""Unit Tests for debounce.py - Thermotec AeroFlow® Library"""
+
+from asyncio import gather
+
+import pytest
+
+from tests.const import create_loopback_client
+from thermotecaeroflowflexismart.exception import InvalidResponse
+from thermotecaeroflowflexismart.simulator import GatewaySimulator, SimulatedModule
+
+
+class TestWriteDebounce:
+    """Tests for the coalescing of rapid writes of the same setting"""
+
+    @pytest.mark.asyncio
+    async def test_only_the_latest_write_is_sent(self):
+        """Test that rapid writes of one setting send the latest value once and resolve every caller"""
+        simulator = GatewaySimulator.create([2])
+        client = create_loopback_client(simulator, write_debounce=0.01)
+
+        results = await gather(*(client.set_module_temperature(1, 1, temperature, [2])
+                                 for temperature in (19.0, 19.5, 20.0, 20.5, 21.0)))
+
+        assert results == [None] * 5
+        assert simulator.get_request_count() == 1
+        assert simulator.get_module(1, 1).get_target_temperature() == 21.0
+        statistics = client.get_write_coalescing_statistics()
+        assert statistics.get_writes() == 5
+        assert statistics.get_sent() == 1
+        assert statistics.get_superseded() == 4
+
+    @pytest.mark.asyncio
+    async def test_settings_and_modules_are_not_mixed(self):
+        """Test that writes of different settings or modules are all sent"""
+        simulator = GatewaySimulator.create([2])
+        client = create_loopback_client(simulator, write_debounce=0.01)
+
+        await gather(
+            client.set_module_temperature(1, 1, 21.0, [2]),
+            client.set_module_temperature(1, 2, 22.0, [2]),
+            client.enable_module_smart_start(1, 1, [2]),
+        )
+
+        assert simulator.get_request_count() == 3
+        assert simulator.get_module(1, 2).get_target_temperature() == 22.0
+        assert simulator.get_module(1, 1).is_smart_start_enabled() is True
+
+    @pytest.mark.asyncio
+    async def test_zone_write_replaces_pending_module_writes(self):
+        """Test that a zone write supersedes the pending writes of its modules"""
+        simulator = GatewaySimulator.create([2])
+        client = create_loopback_client(simulator, write_debounce=0.01)
+
+        await gather(
+            client.set_module_temperature(1, 1, 25.0, [2]),
+            client.set_zone_temperature(1, 18.0, [2]),
+        )
+
+        assert simulator.get_request_count() == 1
+        assert simulator.get_module(1, 1).get_target_temperature() == 18.0
+        assert client.get_write_coalescing_statistics().get_superseded() == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_write_fails_every_caller(self):
+        """Test that the callers of superseded writes get the error of the write which was sent"""
+        simulator = GatewaySimulator([[SimulatedModule(error_rate=1.0)]])
+        client = create_loopback_client(simulator, write_debounce=0.01)
+
+        results = await gather(client.set_module_boost(1, 1, 10, [1]), client.set_module_boost(1, 1, 20, [1]),
+                               return_exceptions=True)
+
+        assert all(isinstance(result, InvalidResponse) for result in results)
+        assert simulator.get_request_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        """Test that every write is sent without write_debounce"""
+        simulator = GatewaySimulator.create([1])
+        client = create_loopback_client(simulator)
+
+        await gather(*(client.set_module_temperature(1, 1, 20.0, [1]) for _ in range(3)))
+
+        assert simulator.get_request_count() == 3
+        assert client.get_write_coalescing_statistics() is None
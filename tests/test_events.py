@@ -0,0 +1,89 @@
+"""Unit Tests for events.py - Thermotec AeroFlow® Library"""
+
+from asyncio import create_task, sleep, wait_for
+
+import pytest
+
+from tests.const import create_loopback_client
+from thermotecaeroflowflexismart.coordinator import PollingCoordinator
+from thermotecaeroflowflexismart.events import FIELD_MODULE_ADDED
+from thermotecaeroflowflexismart.simulator import GatewaySimulator
+
+
+class TestChangeEvents:
+    """Tests for the change events of consecutive polls"""
+
+    @pytest.mark.asyncio
+    async def test_subscribe(self):
+        """Test that subscribers get the changed fields of the modules they subscribed to"""
+        simulator = GatewaySimulator.create([2])
+        client = create_loopback_client(simulator)
+        events = []
+        filtered = []
+        client.subscribe(events.append)
+        client.subscribe(filtered.append, zone=1, module=2, fields=["current_temperature"])
+
+        await client.get_all_data()
+        assert [event.get_field() for event in events] == [FIELD_MODULE_ADDED] * 2
+        assert filtered == []
+
+        events.clear()
+        simulator.get_module(1, 2).set_current_temperature(25.5)
+        await client.set_module_boost(1, 1, 15)
+        await client.get_all_data()
+
+        assert {(event.get_device_identifier(), event.get_field()) for event in events} == {
+            ("10.1.2.1", "current_temperature"),
+            ("10.1.1.1", "boost_active"),
+            ("10.1.1.1", "boost_time_left"),
+        }
+        assert len(filtered) == 1
+        assert filtered[0].get_new_value() == 25.5
+        assert filtered[0].get_module_id() == 2
+        boost = next(event for event in events if event.get_field() == "boost_active")
+        assert (boost.get_old_value(), boost.get_new_value()) == (False, True)
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_and_failing_subscriber(self):
+        """Test that a failing subscriber does not stop the others and unsubscribed ones get nothing"""
+        simulator = GatewaySimulator.create([1])
+        client = create_loopback_client(simulator)
+        events = []
+        removed = []
+
+        def fail(event):
+            raise RuntimeError(event)
+
+        client.subscribe(fail)
+        client.subscribe(events.append)
+        unsubscribe = client.subscribe(removed.append)
+        unsubscribe()
+        unsubscribe()
+
+        await client.get_all_data()
+        assert len(events) == 1
+        assert removed == []
+
+        with pytest.raises(ValueError):
+            client.subscribe(events.append, fields=["unknown"])
+
+    @pytest.mark.asyncio
+    async def test_coordinator_events(self):
+        """Test that the events of the coordinator can be consumed as async iterator"""
+        simulator = GatewaySimulator.create([1])
+        client = create_loopback_client(simulator)
+        coordinator = PollingCoordinator(client)
+        await coordinator.refresh()
+
+        async def next_event():
+            async for event in coordinator.events(fields=["anti_freeze_temperature"]):
+                return event
+
+        consumer = create_task(next_event())
+        await sleep(0)
+        await client.set_module_anti_freeze_temperature(1, 1, 12.0)
+        await coordinator.refresh()
+
+        event = await wait_for(consumer, 1)
+        assert event.get_new_value() == 12.0
+        assert coordinator._notifier.get_subscriber_count() == 0
@@ -0,0 +1,98 @@
+"""Unit Tests for metrics.py - Thermotec AeroFlow® Library"""
+
+import pytest
+
+from tests.const import UdpResponder
+from thermotecaeroflowflexismart.communication import FlexiSmartGateway
+from thermotecaeroflowflexismart.exception import RequestTimeout
+from thermotecaeroflowflexismart.simulator import GatewaySimulator
+from thermotecaeroflowflexismart.metrics import (
+    Histogram,
+    get_command_family,
+    FAMILY_PING,
+    FAMILY_OP,
+    FAMILY_ZONE_READ,
+    FAMILY_ZONE_WRITE,
+    FAMILY_MODULE_READ,
+    FAMILY_MODULE_WRITE,
+    FAMILY_OTHER,
+)
+
+
+class TestMetrics:
+    """Tests for the metrics building blocks"""
+
+    def test_command_family(self):
+        """Test the classification of commands"""
+        assert get_command_family("PING") == FAMILY_PING
+        assert get_command_family("OPS1/") == FAMILY_OP
+        assert get_command_family("D#1#0#0#0*?T/") == FAMILY_ZONE_READ
+        assert get_command_family("D#1#0#0#0*T21/") == FAMILY_ZONE_WRITE
+        assert get_command_family("R#1#2#0#0*?F/") == FAMILY_MODULE_READ
+        assert get_command_family("R#1#2#0#0*SEP#1#2#7/") == FAMILY_MODULE_WRITE
+        assert get_command_family(b"R#1#2#0#0*?F/") == FAMILY_MODULE_READ
+        assert get_command_family(b"\xff\xfe") == FAMILY_OTHER
+
+    def test_histogram(self):
+        """Test counts, cumulative buckets and quantiles"""
+        histogram = Histogram((0.01, 0.1, 1.0))
+        for value in [0.005, 0.05, 0.05, 0.5, 3.0]:
+            histogram.observe(value)
+
+        assert histogram.get_count() == 5
+        assert histogram.get_sum() == pytest.approx(3.605)
+        assert histogram.get_max() == 3.0
+        assert histogram.get_buckets() == [(0.01, 1), (0.1, 3), (1.0, 4), (float("inf"), 5)]
+        assert histogram.get_quantile(0.5) == 0.1
+        assert histogram.get_quantile(0.99) == 3.0
+        assert Histogram().get_quantile(0.5) == 0.0
+
+
+class TestGatewayMetrics:
+    """Tests for the metrics recorded by the gateway"""
+
+    @pytest.mark.asyncio
+    async def test_requests_and_bytes(self):
+        """Test that requests and transferred bytes are counted per family"""
+        async with UdpResponder() as responder:
+            gateway = FlexiSmartGateway("127.0.0.1", responder.get_port())
+            await gateway.send_message_get_response("PING")
+            await gateway.send_message_get_response("R#1#1#0#0*?F/")
+            await gateway.send_message_get_response("R#1#1#0#0*?T/")
+            await gateway.close()
+
+        metrics = gateway.get_metrics()
+        assert sorted(metrics.get_families()) == [FAMILY_PING, FAMILY_MODULE_READ]
+        module_read = metrics.get_command_metrics(FAMILY_MODULE_READ)
+        assert module_read.get_requests() == 2
+        assert module_read.get_bytes_sent() == 26
+        assert module_read.get_bytes_received() == 34  # "OK," + message + "\x00"
+        assert module_read.get_wire_time().get_count() == 2
+        assert module_read.get_queue_wait().get_count() == 2
+        assert metrics.get_requests() == 3
+
+    @pytest.mark.asyncio
+    async def test_timeouts(self):
+        """Test that timeouts are counted without a wire time"""
+        async with UdpResponder(silent=True) as responder:
+            gateway = FlexiSmartGateway("127.0.0.1", responder.get_port())
+            with pytest.raises(RequestTimeout):
+                await gateway.send_message_get_response("D#1#0#0#0*T21/", 0.1)
+            await gateway.close()
+
+        zone_write = gateway.get_metrics().get_command_metrics(FAMILY_ZONE_WRITE)
+        assert zone_write.get_requests() == 1
+        assert zone_write.get_timeouts() == 1
+        assert zone_write.get_wire_time().get_count() == 0
+        assert gateway.get_metrics().get_timeouts() == 1
+
+    @pytest.mark.asyncio
+    async def test_error_responses(self):
+        """Test that ER,x responses are counted"""
+        async with GatewaySimulator.create([1], error_rate=1.0) as simulator:
+            gateway = FlexiSmartGateway(*simulator.get_address())
+            assert await gateway.send_message_get_response("D#1#0#0#0*T21/") == "ER,1"
+            await gateway.close()
+
+        assert gateway.get_metrics().get_command_metrics(FAMILY_ZONE_WRITE).get_error_responses() == 1
+        assert gateway.get_metrics().get_error_responses() == 1
@@ -0,0 +1,87 @@
+"""Unit Tests for pacing.py - Thermotec AeroFlow® Library"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from thermotecaeroflowflexismart.communication import FlexiSmartGateway
+from thermotecaeroflowflexismart.exception import RequestTimeout
+from thermotecaeroflowflexismart.pacing import AdaptivePacing, FixedPacing, PacingPolicy
+
+
+class TestFixedPacing:
+    """Tests for the fixed pacing policy"""
+
+    def test_delay_does_not_change(self):
+        """Test that errors and responses do not change the delay"""
+        pacing = FixedPacing(0.1)
+        pacing.record_response(0.05)
+        pacing.record_error()
+        pacing.record_timeout()
+        assert pacing.get_delay() == 0.1
+
+    def test_policy_is_abstract(self):
+        """Test that a policy has to implement get_delay"""
+        with pytest.raises(TypeError):
+            PacingPolicy()
+
+
+class TestAdaptivePacing:
+    """Tests for the adaptive pacing policy"""
+
+    def test_follows_response_time(self):
+        """Test that the delay follows the smoothed response time down to the minimum"""
+        pacing = AdaptivePacing(initial_delay=0.1, min_delay=0.02, smoothing=0.5, response_factor=0.5)
+        assert pacing.get_delay() == 0.1
+        pacing.record_response(0.4)
+        assert pacing.get_delay() == pytest.approx(0.2)
+        pacing.record_response(0.2)
+        assert pacing.get_response_time() == pytest.approx(0.3)
+        assert pacing.get_delay() == pytest.approx(0.15)
+        for _ in range(20):
+            pacing.record_response(0.01)
+        assert pacing.get_delay() == 0.02
+
+    def test_backs_off_on_gateway_failures(self):
+        """Test that errors and timeouts multiply the delay up to the maximum and responses shrink it again"""
+        pacing = AdaptivePacing(initial_delay=0.0, min_delay=0.0, max_delay=0.3, decrease_step=0.1,
+                                backoff_factor=2.0, min_backoff_delay=0.05)
+        pacing.record_error()
+        assert pacing.get_delay() == 0.1
+        pacing.record_timeout()
+        assert pacing.get_delay() == 0.2
+        pacing.record_timeout()
+        assert pacing.get_delay() == 0.3
+        pacing.record_response(0.0)
+        assert pacing.get_delay() == pytest.approx(0.2)
+
+
+class TestGatewayPacing:
+    """Tests for the pacing integration in FlexiSmartGateway"""
+
+    @pytest.mark.asyncio
+    async def test_gateway_reports_error_responses(self):
+        """Test that ER responses back off and valid responses are reported with their response time"""
+        gateway = FlexiSmartGateway("127.0.0.1", 6653, AdaptivePacing(initial_delay=0.1, min_delay=0.02))
+        gateway._FlexiSmartGateway__send_request_get_response = AsyncMock(side_effect=[b"ER,2", b"OK"])
+
+        with patch("thermotecaeroflowflexismart.communication.sleep", new_callable=AsyncMock) as mock_sleep:
+            await gateway.send_message_get_response("D#1#2#0#0*T20/")
+            mock_sleep.assert_not_called()  # nothing to wait for before the first request
+            assert gateway.get_pacing().get_delay() == 0.2
+
+            await gateway.send_message_get_response("D#1#2#0#0*T20/")
+            mock_sleep.assert_awaited_once()
+            assert 0.0 < mock_sleep.await_args.args[0] <= 0.2
+            assert gateway.get_pacing().get_delay() == pytest.approx(0.19)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("message", ["R#1#2#0#0*?F/", "PING"])
+    async def test_timeouts_back_off(self, message):
+        """Test that timeouts of module and gateway commands are reported to the policy"""
+        gateway = FlexiSmartGateway("127.0.0.1", 6653, AdaptivePacing(initial_delay=0.1, min_backoff_delay=0.05))
+        gateway._FlexiSmartGateway__send_request_get_response = AsyncMock(side_effect=TimeoutError())
+
+        with pytest.raises(RequestTimeout):
+            await gateway.send_message_get_response(message)
+        assert gateway.get_pacing().get_delay() == 0.2
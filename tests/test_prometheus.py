@@ -0,0 +1,74 @@
+"""Unit Tests for prometheus.py - Thermotec AeroFlow® Library"""
+
+from asyncio import open_connection
+
+import pytest
+
+from thermotecaeroflowflexismart.client import Client
+from thermotecaeroflowflexismart.pacing import FixedPacing
+from thermotecaeroflowflexismart.prometheus import render_metrics, MetricsServer
+from thermotecaeroflowflexismart.simulator import GatewaySimulator
+
+
+async def poll(simulator: GatewaySimulator) -> Client:
+    host, port = simulator.get_address()
+    async with Client(host, port, pacing=FixedPacing(0.0)) as client:
+        await client.get_all_data(extended=False)
+    return client
+
+
+async def http_get(address: tuple[str, int], path: str) -> bytes:
+    reader, writer = await open_connection(*address)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+class TestPrometheusExporter:
+    """Tests for the Prometheus text exposition"""
+
+    @pytest.mark.asyncio
+    async def test_render_metrics(self):
+        """Test gateway, poll and module metrics after a poll"""
+        async with GatewaySimulator.create([2]) as simulator:
+            client = await poll(simulator)
+
+        text = render_metrics({"home": client})
+
+        assert "# TYPE flexismart_gateway_requests_total counter" in text
+        assert 'flexismart_gateway_up{gateway="home"} 1' in text
+        assert 'flexismart_gateway_queue_depth{gateway="home"} 0' in text
+        assert 'flexismart_gateway_requests_total{gateway="home",family="R#_READ"} 2' in text
+        assert 'flexismart_gateway_wire_seconds_count{gateway="home",family="R#_READ"} 2' in text
+        assert 'flexismart_gateway_wire_seconds_bucket{gateway="home",family="R#_READ",le="+Inf"} 2' in text
+        assert 'flexismart_coalesced_reads_total{gateway="home"} 0' in text
+        assert "flexismart_module_data_memo_misses_total " in text
+        assert 'flexismart_polls_total{gateway="home"} 1' in text
+        assert 'flexismart_poll_duration_seconds_count{gateway="home"} 1' in text
+        assert 'flexismart_module_polls_total{gateway="home",zone="1",module="2"} 1' in text
+        assert 'flexismart_module_timeouts_total{gateway="home",zone="1",module="2"} 0' in text
+        assert 'flexismart_module_last_success_age_seconds{gateway="home",zone="1",module="1"}' in text
+        assert "flexismart_module_quarantined" not in text
+
+    def test_render_metrics_without_data(self):
+        """Test that the label values are escaped and families without samples are omitted"""
+        text = render_metrics({'a "b"': Client("127.0.0.1")})
+
+        assert 'flexismart_gateway_up{gateway="a \\"b\\""} 1' in text
+        assert "flexismart_gateway_requests_total" not in text
+
+    @pytest.mark.asyncio
+    async def test_metrics_server(self):
+        """Test that the metrics are served via HTTP"""
+        async with GatewaySimulator.create([1]) as simulator:
+            client = await poll(simulator)
+
+        async with MetricsServer({"home": client}, port=0) as server:
+            server_address = server.get_address()
+            response = await http_get(server_address, "/metrics")
+            assert response.startswith(b"HTTP/1.1 200 OK")
+            assert b'flexismart_polls_total{gateway="home"} 1' in response
+
+            response = await http_get(server_address, "/")
+            assert response.startswith(b"HTTP/1.1 404 Not Found")
@@ -0,0 +1,113 @@
+"""Unit Tests for protocol.py - Thermotec AeroFlow® Library"""
+
+from datetime import datetime
+
+import pytest
+
+from thermotecaeroflowflexismart import protocol
+from thermotecaeroflowflexismart.data_object import GatewayData, ModuleData, Temperature
+from thermotecaeroflowflexismart.exception import InvalidModule, InvalidRequest, InvalidResponse
+
+MODULE_DATA = b"18,8,19,2,50,9,3,0,0,0,246,1,1,129,0,4,8,9,10,v201106"
+
+
+class TestProtocol:
+    """Tests for the sans-IO intents"""
+
+    def test_gateway_intents(self):
+        """Test encoding and decoding of the gateway operations"""
+        assert protocol.ping().encode() == b"PING"
+        assert protocol.ping().decode(b"OP") is True
+
+        intent = protocol.get_status()
+        assert intent.encode() == b"OPS1/"
+        assert intent.decode(b"OPOK,OPS1,42,0,0,0,0,1,2,0,0,0") == {"serverSyncId": "42", "idA": "1", "idB": "2"}
+
+        assert protocol.get_zones_with_module_count().decode(b"OPOK,OPS3,1,2,3") == [1, 2, 3]
+        assert isinstance(protocol.get_gateway_data().decode(b"OPOK,1.0,1234,5678"), GatewayData)
+
+        set_date_time = protocol.set_date_time(datetime(2024, 6, 10, 12, 10, 22))
+        assert set_date_time.encode() == b"OPF1210220/10,06,24/"
+        assert set_date_time.decode(b"OPOK") is None
+
+        with pytest.raises(InvalidResponse):
+            protocol.get_status().decode(b"OPOK,OPS2,1")
+
+    def test_zone_intents_are_resolved_against_the_zones(self):
+        """Test that zone intents pick the D# or R# target and validate zone and module"""
+        zone_intent = protocol.get_temperature(2)
+        zone_intent.resolve([1, 3])
+        assert zone_intent.encode() == b"D#2#3#0#0*?T/"
+        assert isinstance(zone_intent.decode(b"OK,20,5,149"), Temperature)
+
+        module_intent = protocol.set_temperature(21.5, 2, 1)
+        module_intent.resolve([1, 3])
+        assert module_intent.encode() == b"R#2#1#0#0*T149/"
+        assert module_intent.decode(b"OK") is None
+
+        with pytest.raises(InvalidRequest):
+            protocol.get_temperature(2).encode()
+        with pytest.raises(Exception, match="Zone out of range"):
+            protocol.get_temperature(3).resolve([1, 3])
+        with pytest.raises(InvalidModule):
+            protocol.get_temperature(1, 2).resolve([1, 3])
+
+    def test_module_data_is_not_validated_against_the_module_count(self):
+        """Test that get_module_data addresses the module even if the zone reports less modules"""
+        intent = protocol.get_module_data(1, 4)
+        intent.resolve([1])
+        assert intent.encode() == b"R#1#4#0#0*?F/"
+        assert isinstance(intent.decode(b"OK," + MODULE_DATA), ModuleData)
+
+        with pytest.raises(InvalidResponse):
+            intent.decode(b"ER,1")
+
+    def test_builder_validation(self):
+        """Test that invalid requests are rejected before anything is encoded"""
+        with pytest.raises(InvalidRequest):
+            protocol.set_boost(100, 1)
+
+        today = datetime(2024, 6, 10, 12, 0)
+        with pytest.raises(InvalidRequest):
+            protocol.set_holiday_mode(datetime(2024, 6, 10, 18, 0), 16.0, 1, today=today)
+        with pytest.raises(InvalidRequest):
+            protocol.set_holiday_mode(datetime(2025, 6, 10, 18, 0), 16.0, 1, today=today)
+
+        intent = protocol.set_holiday_mode(datetime(2024, 6, 20, 12, 10), 16.0, 1, today=today)
+        intent.resolve([2])
+        assert intent.encode() == b"D#1#2#0#0*RH#10#12#10#16/"
+
+    def test_intent_is_abstract(self):
+        """Test that an intent has to implement encode and decode"""
+        with pytest.raises(TypeError):
+            protocol.Intent()
+
+    def test_datagram(self):
+        """Test the raw UDP payload helpers"""
+        intent = protocol.get_anti_freeze_temperature(1, 1)
+        intent.resolve([1])
+
+        assert protocol.encode_datagram(intent) == b"R#1#1#0#0*?E#1#20/"
+        assert protocol.decode_datagram(intent, b"OK,255\x00") == 5.0
+
+    def test_write_settings(self):
+        """Test that writes report the setting and the value a read returns afterwards"""
+        intent = protocol.set_temperature(21.3, 1)
+        intent.resolve([3])
+        assert intent.get_setting() == "temperature"
+        assert intent.get_value() == 21.5
+        assert intent.get_addressed_modules() == [1, 2, 3]
+
+        assert protocol.set_boost(17, 1, 2).get_value() == 15
+        assert protocol.set_anti_freeze_temperature(255, 1).get_value() == 5.0
+        assert protocol.set_anti_freeze_temperature(7.5, 1).get_value() == 7.0
+        for temperature in (300, -1):
+            intent = protocol.set_anti_freeze_temperature(temperature, 1, 1)
+            intent.resolve([1])
+            assert intent.encode() == b"R#1#1#0#0*SEP#1#20#%d/" % temperature
+            assert intent.get_value() is None
+        assert protocol.disable_holiday_mode(1).get_value() is None
+
+        read = protocol.read_setting("boost", 1, 2)
+        read.resolve([2])
+        assert read.encode() == b"R#1#2#0#0*?E#1#22/"
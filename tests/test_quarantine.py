@@ -0,0 +1,111 @@
+"""Unit Tests for quarantine.py - Thermotec AeroFlow® Library"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from tests.const import CLIENT_IP
+from thermotecaeroflowflexismart.client import Client
+from thermotecaeroflowflexismart.data_object import ModuleData
+from thermotecaeroflowflexismart.exception import RequestTimeout
+from thermotecaeroflowflexismart.quarantine import ModuleQuarantine, REASON_TIMEOUT, REASON_INVALID_DEVICE_IDENTIFIER
+
+
+class TestModuleQuarantine:
+    """Tests for the quarantine bookkeeping"""
+
+    def test_quarantine_after_threshold(self):
+        """Test that a module is quarantined after the threshold of failed polls"""
+        quarantine = ModuleQuarantine(threshold=2, base_backoff=60.0)
+        quarantine.record_failure(1, 2, REASON_TIMEOUT)
+        assert quarantine.is_quarantined(1, 2) is False
+        assert quarantine.get_entries() == []
+
+        quarantine.record_failure(1, 2, REASON_TIMEOUT)
+        assert quarantine.is_quarantined(1, 2) is True
+        assert quarantine.should_skip(1, 2) is True
+
+        entry = quarantine.get_entries()[0]
+        assert entry.get_zone() == 1
+        assert entry.get_module() == 2
+        assert entry.get_failures() == 2
+        assert entry.get_reason() == REASON_TIMEOUT
+        assert 59.0 < entry.get_retry_in() <= 60.0
+
+    def test_exponential_backoff(self):
+        """Test that every failed probe doubles the backoff up to the maximum"""
+        quarantine = ModuleQuarantine(threshold=1, base_backoff=10.0, max_backoff=30.0)
+        with patch("thermotecaeroflowflexismart.quarantine.monotonic", return_value=100.0):
+            quarantine.record_failure(1, 1, REASON_TIMEOUT)
+            assert quarantine.get_entries()[0].get_retry_in() == 10.0
+            quarantine.record_failure(1, 1, REASON_TIMEOUT)
+            assert quarantine.get_entries()[0].get_retry_in() == 20.0
+            quarantine.record_failure(1, 1, REASON_TIMEOUT)
+            assert quarantine.get_entries()[0].get_retry_in() == 30.0
+
+    def test_success_releases_module(self):
+        """Test that a successful read releases the module"""
+        quarantine = ModuleQuarantine(threshold=1)
+        quarantine.record_failure(1, 1, REASON_INVALID_DEVICE_IDENTIFIER)
+        quarantine.record_success(1, 1)
+        assert quarantine.is_quarantined(1, 1) is False
+
+
+class TestClientQuarantine:
+    """Tests for the quarantine integration in get_all_data"""
+
+    status = {"serverSyncId": "123", "idA": "16", "idB": "197"}
+    module_data = ModuleData(
+        ["18", "8", "19", "2", "50", "59", "3", "0", "0", "0", "0", "1", "1", "129", "0", "1", "1", "1", "1",
+         "v201106"])
+    invalid_module_data = ModuleData(
+        ["18", "8", "19", "2", "50", "59", "3", "0", "0", "0", "0", "1", "1", "129", "0", "0", "0", "0", "0",
+         "v201106"])
+
+    def create_client(self, quarantine: ModuleQuarantine) -> Client:
+        client = Client(CLIENT_IP, quarantine=quarantine)
+        client.get_status = AsyncMock(return_value=self.status)
+        client.get_zones_with_module_count = AsyncMock(return_value=[2])
+        client.ping = AsyncMock(return_value=True)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_timing_out_module_is_skipped(self):
+        """Test that a module which timed out twice is not requested anymore"""
+        client = self.create_client(ModuleQuarantine(threshold=2))
+        client.get_module_data = AsyncMock(side_effect=[
+            self.module_data, RequestTimeout(),
+            self.module_data, RequestTimeout(),
+            self.module_data,
+        ])
+
+        await client.get_all_data(extended=False)
+        await client.get_all_data(extended=False)
+        assert [entry.get_module() for entry in client.get_quarantined_modules()] == [2]
+
+        result = await client.get_all_data(extended=False)
+        assert len(result) == 1
+        assert client.get_module_data.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_quarantined_module_is_probed_once(self):
+        """Test that a quarantined module is probed with a single request after its backoff"""
+        client = self.create_client(ModuleQuarantine(threshold=1, base_backoff=0.0))
+        client.get_module_data = AsyncMock(side_effect=[
+            self.module_data, self.invalid_module_data, self.invalid_module_data, self.invalid_module_data,
+            self.invalid_module_data,
+            self.module_data, self.invalid_module_data,
+            self.module_data, self.module_data,
+        ])
+
+        await client.get_all_data(extended=False)
+        assert client.get_module_data.await_count == 5
+        assert client.get_quarantined_modules()[0].get_reason() == REASON_INVALID_DEVICE_IDENTIFIER
+
+        await client.get_all_data(extended=False)
+        assert client.get_module_data.await_count == 7
+        assert client.get_quarantined_modules()[0].get_failures() == 2
+
+        await client.get_all_data(extended=False)
+        assert client.get_module_data.await_count == 9
+        assert client.get_quarantined_modules() == []
@@ -0,0 +1,128 @@
+"""Unit Tests for scheduler.py - Thermotec AeroFlow® Library"""
+
+from asyncio import create_task, gather, sleep
+
+import pytest
+
+from thermotecaeroflowflexismart.client import Client
+from thermotecaeroflowflexismart.pacing import FixedPacing
+from thermotecaeroflowflexismart.scheduler import RequestScheduler, Priority, request_priority, get_request_priority
+from thermotecaeroflowflexismart.simulator import GatewaySimulator
+from thermotecaeroflowflexismart.transport import LoopbackTransport, RecordingTransport
+
+
+class TestRequestScheduler:
+    """Tests for the priority request scheduler"""
+
+    @pytest.mark.asyncio
+    async def test_requests_are_served_in_fifo_order(self):
+        """Test that queued requests are served in arrival order and never overlap"""
+        scheduler = RequestScheduler()
+        order = []
+        active = []
+
+        async def request(name: str):
+            async with scheduler.slot():
+                active.append(name)
+                assert len(active) == 1
+                await sleep(0)
+                order.append(name)
+                active.remove(name)
+
+        await gather(*(request(name) for name in ["a", "b", "c", "d"]))
+
+        assert order == ["a", "b", "c", "d"]
+        assert scheduler.is_busy() is False
+
+    @pytest.mark.asyncio
+    async def test_statistics(self):
+        """Test queue depth and wait time statistics"""
+        scheduler = RequestScheduler()
+
+        async def request():
+            async with scheduler.slot():
+                await sleep(0.01)
+
+        await gather(request(), request(), request())
+
+        statistics = scheduler.get_statistics()
+        assert statistics.get_requests() == 3
+        assert statistics.get_max_queue_depth() == 2
+        assert statistics.get_queue_depth() == 0
+        assert statistics.get_max_wait_time() >= 0.02
+        assert statistics.get_average_wait_time() > 0.0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_removed(self):
+        """Test that a cancelled waiter does not block the queue"""
+        scheduler = RequestScheduler()
+        await scheduler.acquire()
+
+        cancelled = create_task(scheduler.acquire())
+        waiting = create_task(scheduler.acquire())
+        await sleep(0)
+        assert scheduler.get_queue_depth() == 2
+
+        cancelled.cancel()
+        await sleep(0)
+        assert scheduler.get_queue_depth() == 1
+
+        scheduler.release()
+        await waiting
+        scheduler.release()
+        assert scheduler.is_busy() is False
+
+    @pytest.mark.asyncio
+    async def test_priority_lanes(self):
+        """Test that higher lanes are served first and FIFO order is kept within a lane"""
+        scheduler = RequestScheduler()
+        await scheduler.acquire()
+        order = []
+
+        async def request(name: str, priority: Priority):
+            async with scheduler.slot(priority):
+                order.append(name)
+
+        tasks = [create_task(request(name, priority)) for name, priority in [
+            ("poll-1", Priority.BACKGROUND),
+            ("read", Priority.INTERACTIVE_READ),
+            ("poll-2", Priority.BACKGROUND),
+            ("write-1", Priority.INTERACTIVE_WRITE),
+            ("write-2", Priority.INTERACTIVE_WRITE),
+        ]]
+        await sleep(0)
+        assert scheduler.get_queue_depth() == 5
+        assert scheduler.get_lane_statistics(Priority.BACKGROUND).get_max_queue_depth() == 2
+
+        scheduler.release()
+        await gather(*tasks)
+
+        assert order == ["write-1", "write-2", "read", "poll-1", "poll-2"]
+        assert scheduler.get_lane_statistics(Priority.INTERACTIVE_WRITE).get_requests() == 2
+        assert scheduler.get_lane_statistics(Priority.BACKGROUND).get_requests() == 2
+
+    def test_request_priority_context(self):
+        """Test that request_priority only applies inside the block"""
+        assert get_request_priority() is None
+        with request_priority(Priority.BACKGROUND):
+            assert get_request_priority() is Priority.BACKGROUND
+        assert get_request_priority() is None
+
+    @pytest.mark.asyncio
+    async def test_interactive_write_preempts_poll(self):
+        """Test that a write issued during a poll is sent before the remaining poll requests"""
+        simulator = GatewaySimulator.create([10], latency=0.002)
+        recording = RecordingTransport(LoopbackTransport(simulator))
+        client = Client("loopback", pacing=FixedPacing(0.0), transport=recording, change_detection=False)
+
+        async def write():
+            await sleep(0.01)
+            await client.set_zone_temperature(1, 23.0, [10])
+
+        await gather(client.get_all_data(extended=True), write())
+
+        requests = [request for request, _ in recording.get_records()]
+        assert requests.index(b"D#1#10#0#0*T23/") < len(requests) - 10
+        assert client.get_scheduler_statistics(Priority.INTERACTIVE_WRITE).get_requests() == 1
+        assert client.get_scheduler_statistics(Priority.INTERACTIVE_WRITE).get_max_wait_time() < 0.05
+        assert client.get_scheduler_statistics(Priority.BACKGROUND).get_requests() == len(requests) - 1
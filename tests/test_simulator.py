@@ -0,0 +1,146 @@
+"""Unit Tests for simulator.py - Thermotec AeroFlow® Library
+
+These tests run the client end-to-end against the simulated gateway over local UDP.
+"""
+
+from asyncio import sleep
+from datetime import datetime
+
+import pytest
+
+from thermotecaeroflowflexismart.client import Client
+from thermotecaeroflowflexismart.exception import InvalidResponse
+from thermotecaeroflowflexismart.pacing import FixedPacing
+from thermotecaeroflowflexismart.simulator import GatewaySimulator, SimulatedModule
+
+
+def create_client(simulator: GatewaySimulator) -> Client:
+    host, port = simulator.get_address()
+    return Client(host, port, pacing=FixedPacing(0.0))
+
+
+class TestGatewaySimulatorProtocol:
+    """Tests for the command handling of the simulator"""
+
+    def test_status_commands(self):
+        """Test the OPS responses"""
+        simulator = GatewaySimulator.create([2, 0, 1])
+        assert simulator.handle_command("PING") == "OP"
+        assert simulator.handle_command("OPS3/") == "OPOK,OPS3,2,0,1"
+        assert simulator.handle_command("OPS2/") == "OPOK,OPS2,1,2,3"
+        assert simulator.handle_command("OPS1/").startswith("OPOK,OPS1,100,")
+
+    def test_zone_configuration_changes_sync_id(self):
+        """Test that creating zones and registering modules changes the sync id"""
+        simulator = GatewaySimulator.create([1])
+        assert simulator.handle_command("OPMW10,2/") == "OPOK"
+        assert simulator.handle_command("OPZI199,2,1/") == "OPOK"
+        assert simulator.handle_command("OPS3/") == "OPOK,OPS3,1,1"
+        assert simulator.handle_command("OPMW129,0/") == "OPOK"
+        assert simulator.handle_command("OPS3/") == "OPOK,OPS3,1"
+        assert simulator.get_sync_id() == 103
+
+    def test_unknown_module_does_not_answer(self):
+        """Test that requests for modules which do not exist are not answered"""
+        simulator = GatewaySimulator.create([1])
+        assert simulator.handle_command("R#1#2#0#0*?F/") is None
+        assert simulator.handle_command("R#2#1#0#0*?F/") is None
+
+    def test_error_injection(self):
+        """Test that write commands fail with ER,<module> for failing modules"""
+        simulator = GatewaySimulator([[SimulatedModule(), SimulatedModule(error_rate=1.0)]])
+        assert simulator.handle_command("D#1#2#0#0*T21/") == "ER,2"
+        assert simulator.handle_command("R#1#1#0#0*T21/") == "OK"
+        assert simulator.handle_command("R#1#2#0#0*?T/") == "OK,20,5,21"
+
+    @pytest.mark.asyncio
+    async def test_packet_loss(self):
+        """Test that lost requests are not answered"""
+        simulator = GatewaySimulator.create([1], packet_loss=1.0)
+        assert await simulator.handle(b"PING") is None
+        simulator.set_packet_loss(0.0)
+        assert await simulator.handle(b"PING") == b"OP\x00"
+        assert simulator.get_request_count() == 2
+
+
+class TestGatewaySimulatorEndToEnd:
+    """Tests for the client against the simulator"""
+
+    @pytest.mark.asyncio
+    async def test_get_all_data(self):
+        """Test a full poll"""
+        async with GatewaySimulator.create([2, 0, 1]) as simulator:
+            async with create_client(simulator) as client:
+                assert await client.ping() is True
+                result = await client.get_all_data()
+
+        assert sorted(result) == ["10.1.1.1", "10.1.2.1", "10.3.1.1"]
+        module = result["10.3.1.1"]
+        assert module.get_zone_id() == 3
+        assert module.get_module_id() == 1
+        assert module.get_module_data().get_current_temperature() == 20.5
+        assert module.get_module_data().get_target_temperature() == 21.0
+        assert module.get_module_data().get_firmware_version() == "v201106"
+        assert module.get_anti_freeze_temperature() == 5.0
+        assert module.get_holiday_data().is_holiday_mode_active() is False
+
+    @pytest.mark.asyncio
+    async def test_settings_round_trip(self):
+        """Test that written settings can be read back"""
+        async with GatewaySimulator.create([2]) as simulator:
+            async with create_client(simulator) as client:
+                await client.set_zone_temperature(1, 22.5)
+                await client.set_module_boost(1, 2, 15)
+                await client.set_module_temperature_offset(1, 1, -1.5)
+                await client.disable_zone_window_open_detection(1)
+                await client.enable_module_smart_start(1, 2)
+                await client.set_module_anti_freeze_temperature(1, 1, 7)
+
+                assert (await client.get_module_temperature(1, 2)).get_target_temperature() == 22.5
+                assert await client.get_module_boost(1, 2) == 15
+                assert await client.get_module_temperature_offset(1, 1) == -1.5
+                assert await client.is_zone_window_open_detection_enabled(1) is False
+                assert await client.is_module_smart_start_enabled(1, 2) is True
+                assert await client.get_module_anti_freeze_temperature(1, 1) == 7.0
+
+                module_data = await client.get_module_data(1, 2)
+                assert module_data.get_boost_time_left() == 15
+                assert module_data.is_smart_start_enabled() is True
+
+    @pytest.mark.asyncio
+    async def test_date_time(self):
+        """Test setting and reading the gateway time"""
+        async with GatewaySimulator.create([1]) as simulator:
+            async with create_client(simulator) as client:
+                await client.set_date_time(datetime(2030, 6, 15, 12, 0, 0))
+                date_time = await client.get_date_time()
+
+        assert date_time.get_date() == "15.06.2030"
+        assert date_time.get_time().startswith("12:00:")
+
+    @pytest.mark.asyncio
+    async def test_error_response(self):
+        """Test that an ER response of the gateway results in an invalid response"""
+        async with GatewaySimulator.create([1], error_rate=1.0) as simulator:
+            async with create_client(simulator) as client:
+                with pytest.raises(InvalidResponse):
+                    await client.set_zone_temperature(1, 20.0)
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_pending_responses(self):
+        """Test that responses which are still delayed by the latency are cancelled on stop"""
+        simulator = GatewaySimulator.create([1], latency=10.0)
+        await simulator.start()
+        client = create_client(simulator)
+        await client._gateway.open()
+        await client._gateway.get_transport().send(b"PING")
+        await sleep(0.05)
+
+        protocol = simulator._transport.get_protocol()
+        responses = set(protocol._responses)
+        assert len(responses) == 1
+        simulator.stop()
+        await sleep(0.01)
+        assert all(task.cancelled() for task in responses)
+        assert protocol._responses == set()
+        await client.close()
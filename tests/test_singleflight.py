@@ -0,0 +1,101 @@
+"""Unit Tests for singleflight.py - Thermotec AeroFlow® Library"""
+
+from asyncio import create_task, gather, sleep
+
+import pytest
+
+from tests.const import create_loopback_client
+from thermotecaeroflowflexismart.exception import RequestTimeout
+from thermotecaeroflowflexismart.scheduler import Priority, request_priority
+from thermotecaeroflowflexismart.simulator import GatewaySimulator
+from thermotecaeroflowflexismart.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for the coalescing of concurrent identical reads"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_share_one_request(self):
+        """Test that identical reads in flight are sent once and different reads are not coalesced"""
+        simulator = GatewaySimulator.create([2], latency=0.01)
+        client = create_loopback_client(simulator)
+        zones = [2]
+
+        results = await gather(
+            *(client.get_module_data(1, 1, zones) for _ in range(5)),
+            client.get_module_data(1, 2, zones),
+            client.get_date_time(),
+            client.get_date_time(),
+        )
+
+        assert simulator.get_request_count() == 3
+        assert all(result is results[0] for result in results[:5])
+        statistics = client.get_single_flight_statistics()
+        assert statistics.get_calls() == 8
+        assert statistics.get_flights() == 3
+        assert statistics.get_coalesced() == 5
+
+        # The flight has landed, the next read is sent again
+        await client.get_module_data(1, 1, zones)
+        assert simulator.get_request_count() == 4
+
+    @pytest.mark.asyncio
+    async def test_writes_and_disabled_coalescing_are_not_shared(self):
+        """Test that writes are always sent and coalesce_reads=False sends every read"""
+        simulator = GatewaySimulator.create([1], latency=0.01)
+        client = create_loopback_client(simulator)
+        await gather(*(client.set_module_temperature(1, 1, 21.0, [1]) for _ in range(3)))
+        assert simulator.get_request_count() == 3
+
+        client = create_loopback_client(simulator, coalesce_reads=False)
+        await gather(*(client.get_module_temperature(1, 1, [1]) for _ in range(3)))
+        assert simulator.get_request_count() == 6
+        assert client.get_single_flight_statistics().get_calls() == 0
+
+    @pytest.mark.asyncio
+    async def test_lanes_are_not_shared(self):
+        """Test that an interactive read does not join the flight of the same read of a background poll"""
+        simulator = GatewaySimulator.create([1], latency=0.01)
+        client = create_loopback_client(simulator)
+
+        with request_priority(Priority.BACKGROUND):
+            background = create_task(client.get_module_data(1, 1, [1]))
+        await sleep(0)
+        await gather(background, client.get_module_data(1, 1, [1]), client.get_module_data(1, 1, [1]))
+
+        assert simulator.get_request_count() == 2
+        assert client.get_single_flight_statistics().get_coalesced() == 1
+        assert client.get_scheduler_statistics(Priority.INTERACTIVE_READ).get_requests() == 1
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared(self):
+        """Test that every caller of a failed flight gets the exception"""
+        simulator = GatewaySimulator.create([1], packet_loss=1.0)
+        client = create_loopback_client(simulator)
+
+        async def read():
+            return await client._gateway.send_message_get_response("PING", 0.05)
+
+        flight = SingleFlight()
+        results = await gather(*(flight.run("PING", read) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, RequestTimeout) for result in results)
+        assert simulator.get_request_count() == 1
+        assert flight.get_in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_flight(self):
+        """Test that the other callers still get the result if one of them is cancelled"""
+        flight = SingleFlight()
+
+        async def read():
+            await sleep(0.01)
+            return "OK"
+
+        first = create_task(flight.run("key", read))
+        second = create_task(flight.run("key", read))
+        await sleep(0)
+        first.cancel()
+
+        assert await second == "OK"
+        assert first.cancelled()
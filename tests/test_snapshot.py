@@ -0,0 +1,71 @@
+"""Unit Tests for snapshot.py - Thermotec AeroFlow® Library"""
+
+import pytest
+
+from tests.const import create_loopback_client
+from thermotecaeroflowflexismart.data_object import HomeAssistantModuleData
+from thermotecaeroflowflexismart.simulator import GatewaySimulator
+from thermotecaeroflowflexismart.snapshot import FleetSnapshot, diff
+
+
+def with_settings(module: HomeAssistantModuleData, **kwargs) -> HomeAssistantModuleData:
+    return HomeAssistantModuleData(module.get_zone_id(), module.get_module_id(),
+                                   module.get_module_data().with_settings(**kwargs),
+                                   module.get_anti_freeze_temperature(), module.get_holiday_data(),
+                                   module.get_date_time())
+
+
+class TestFleetSnapshot:
+    """Tests for the immutable fleet snapshots and their diff"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_modules_are_shared(self):
+        """Test that a poll without changes keeps the snapshot and a change only replaces the changed module"""
+        simulator = GatewaySimulator.create([2, 1])
+        client = create_loopback_client(simulator)
+
+        await client.get_all_data()
+        first = client.get_snapshot()
+        await client.get_all_data()
+        assert client.get_snapshot() is first
+
+        simulator.get_module(1, 2).set_current_temperature(25.5)
+        await client.get_all_data()
+        second = client.get_snapshot()
+
+        assert second is not first
+        assert second.get_module("10.1.1.1") is first.get_module("10.1.1.1")
+        assert second.get_module("10.2.1.1") is first.get_module("10.2.1.1")
+        assert second.get_module("10.1.2.1").get_module_data().get_current_temperature() == 25.5
+        changes = diff(first, second)
+        assert dict(changes.get_changed()) == {"10.1.2.1": ("current_temperature",)}
+        assert changes.get_added() == () and changes.get_removed() == ()
+        assert first.diff(first).is_empty() is True
+
+    @pytest.mark.asyncio
+    async def test_changed_fields(self):
+        """Test that the diff lists every changed field, added and removed modules"""
+        simulator = GatewaySimulator.create([3])
+        modules = await create_loopback_client(simulator).get_all_data()
+        first = FleetSnapshot({key: modules[key] for key in ("10.1.1.1", "10.1.2.1")})
+
+        second = first.with_modules({
+            "10.1.1.1": with_settings(modules["10.1.1.1"], target_temperature=24.0, smart_start=True),
+            "10.1.3.1": modules["10.1.3.1"],
+        })
+
+        changes = first.diff(second)
+        assert changes.get_changed_fields("10.1.1.1") == ("target_temperature", "smart_start")
+        assert changes.get_added() == ("10.1.3.1",)
+        assert changes.get_removed() == ("10.1.2.1",)
+        assert changes.get_changed_fields("10.1.3.1") == ()
+        assert len(second) == 2 and "10.1.2.1" not in second
+        assert len(first) == 2 and "10.1.2.1" in first
+
+    def test_immutable(self):
+        """Test that the modules of a snapshot cannot be changed"""
+        snapshot = FleetSnapshot()
+
+        with pytest.raises(TypeError):
+            snapshot.get_modules()["10.1.1.1"] = None
+        assert snapshot.with_modules({}) is snapshot
@@ -0,0 +1,76 @@
+"""Unit Tests for transport.py - Thermotec AeroFlow® Library
+
+These tests run the client against the simulated gateway without sockets.
+"""
+
+import pytest
+
+from tests.const import create_loopback_client
+from thermotecaeroflowflexismart.exception import InvalidResponse, RequestTimeout
+from thermotecaeroflowflexismart.simulator import GatewaySimulator
+from thermotecaeroflowflexismart.transport import LoopbackTransport, RecordingTransport, ReplayTransport, Transport
+
+
+class TestTransport:
+    """Tests for the loopback and record / replay transports"""
+
+    def test_transport_is_abstract(self):
+        """Test that a transport has to implement the datagram methods"""
+        with pytest.raises(TypeError):
+            Transport()
+
+    @pytest.mark.asyncio
+    async def test_loopback_transport(self):
+        """Test that the client talks to the simulator without a socket"""
+        simulator = GatewaySimulator.create([2, 1])
+        async with create_loopback_client(transport=LoopbackTransport(simulator)) as client:
+            assert client._gateway.is_open() is True
+            assert await client.ping() is True
+            assert await client.get_zones_with_module_count() == [2, 1]
+
+            await client.set_module_temperature(1, 2, 22.5)
+            assert (await client.get_module_temperature(1, 2)).get_target_temperature() == 22.5
+            assert len(await client.get_all_data()) == 3
+        assert client._gateway.is_open() is False
+
+    @pytest.mark.asyncio
+    async def test_loopback_packet_loss_times_out(self):
+        """Test that a lost datagram surfaces as RequestTimeout"""
+        simulator = GatewaySimulator.create([1], packet_loss=1.0)
+        client = create_loopback_client(transport=LoopbackTransport(simulator))
+
+        with pytest.raises(RequestTimeout):
+            await client._gateway.send_message_get_response("PING", 0.05)
+        assert client._gateway.is_open() is False
+
+    @pytest.mark.asyncio
+    async def test_record_and_replay(self):
+        """Test that a replayed session returns the recorded responses"""
+        simulator = GatewaySimulator.create([2])
+        recording = RecordingTransport(LoopbackTransport(simulator))
+        async with create_loopback_client(transport=recording) as client:
+            recorded = await client.get_all_data()
+
+        records = recording.get_records()
+        assert records[0][0] == b"OPS1/"
+        assert all(response is not None for _, response in records)
+
+        replay = ReplayTransport(records)
+        async with create_loopback_client(transport=replay) as client:
+            replayed = await client.get_all_data()
+        assert replay.get_remaining() == 0
+        assert replayed.keys() == recorded.keys()
+        for key, module in replayed.items():
+            module_data = module.get_module_data()
+            for name in module_data.__slots__:
+                assert getattr(module_data, name) == getattr(recorded[key].get_module_data(), name)
+
+    @pytest.mark.asyncio
+    async def test_replay_of_unknown_request(self):
+        """Test that a request which was not recorded fails"""
+        client = create_loopback_client(transport=ReplayTransport([(b"PING", b"OP\x00")]))
+        assert await client.ping() is True
+
+        with pytest.raises(InvalidResponse):
+            await client.get_gateway_data()
+        assert client.get_gateway_metrics().get_unexpected_errors() == 1
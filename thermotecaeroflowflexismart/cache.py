@@ -0,0 +1,142 @@
+"""Caches for the Python Thermotec AeroFlow® Library"""
+from time import monotonic
+
+KIND_MODULE_DATA = "module_data"
+KIND_TEMPERATURE = "temperature"
+KIND_TEMPERATURE_OFFSET = "temperature_offset"
+KIND_ANTI_FREEZE_TEMPERATURE = "anti_freeze_temperature"
+KIND_BOOST = "boost"
+KIND_WINDOW_OPEN_DETECTION = "window_open_detection"
+KIND_SMART_START = "smart_start"
+KIND_HOLIDAY_DATA = "holiday_data"
+
+# Settings which are part of the module data (?F) as well. The boost of the module data counts differently and the
+# holiday data is not part of it
+MODULE_DATA_SETTINGS = {
+    KIND_TEMPERATURE: "target_temperature",
+    KIND_TEMPERATURE_OFFSET: "temperature_offset",
+    KIND_WINDOW_OPEN_DETECTION: "window_open_detection",
+    KIND_SMART_START: "smart_start",
+}
+
+
+class TopologyCache:
+    """Remembers the zones with their module count (OPS3)
+
+    The topology is dropped after the ttl, when the server sync id of the gateway changes or when it is invalidated
+    explicitly (e.g. after a zone was created).
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self._ttl = ttl
+        self._zones: list[int] | None = None
+        self._updated_at: float = 0.0
+        self._sync_id: str | None = None
+
+    def get_zones(self) -> list[int] | None:
+        if self._zones is None:
+            return None
+
+        if monotonic() - self._updated_at > self._ttl:
+            self._zones = None
+            return None
+
+        return list(self._zones)
+
+    def set_zones(self, zones: list[int]) -> None:
+        self._zones = list(zones)
+        self._updated_at = monotonic()
+
+    # The environment is known to be unchanged, restart the ttl
+    def confirm(self) -> None:
+        if self._zones is not None:
+            self._updated_at = monotonic()
+
+    def get_sync_id(self) -> str | None:
+        return self._sync_id
+
+    # Returns True if the sync id differs from the last known one
+    def update_sync_id(self, sync_id: str) -> bool:
+        changed = self._sync_id is not None and self._sync_id != sync_id
+        if changed:
+            self.invalidate()
+        self._sync_id = sync_id
+        return changed
+
+    def invalidate(self) -> None:
+        self._zones = None
+
+
+class CacheEntry:
+    def __init__(self, value, updated_at: float):
+        self._value = value
+        self._updated_at = updated_at
+
+    def get_value(self):
+        return self._value
+
+    def get_updated_at(self) -> float:
+        return self._updated_at
+
+    def get_age(self) -> float:
+        return monotonic() - self._updated_at
+
+
+class ModuleStateCache:
+    """Remembers values read from modules, keyed by zone, module and kind of value
+
+    Zone wide values are stored with module -1, as used by the zone commands of the client.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[int, int, str], CacheEntry] = {}
+
+    def get(self, zone: int, module: int, kind: str, max_age: float | None = None) -> CacheEntry | None:
+        entry = self._entries.get((zone, module, kind))
+        if entry is None:
+            return None
+
+        if max_age is not None and entry.get_age() > max_age:
+            return None
+
+        return entry
+
+    def set(self, zone: int, module: int, kind: str, value) -> None:
+        self._entries[(zone, module, kind)] = CacheEntry(value, monotonic())
+
+    # Applies a successful write of a setting to the cached values, without asking the module
+    def update(self, zone: int, module: int, kind: str, value) -> None:
+        if kind == KIND_TEMPERATURE:
+            # The current temperature is only known from a read
+            entry = self._entries.get((zone, module, kind))
+            if entry is not None:
+                self.set(zone, module, kind, entry.get_value().with_target_temperature(value))
+        else:
+            self.set(zone, module, kind, value)
+
+        entry = self._entries.get((zone, module, KIND_MODULE_DATA))
+        if entry is None or kind == KIND_ANTI_FREEZE_TEMPERATURE:
+            return
+
+        setting = MODULE_DATA_SETTINGS.get(kind)
+        if setting is None:
+            del self._entries[(zone, module, KIND_MODULE_DATA)]
+            return
+
+        self.set(zone, module, KIND_MODULE_DATA, entry.get_value().with_settings(**{setting: value}))
+
+    # Drops all entries matching the given filters. No filter drops everything
+    def invalidate(self, zone: int | None = None, module: int | None = None, kind: str | None = None) -> None:
+        if zone is None and module is None and kind is None:
+            self._entries.clear()
+            return
+
+        for key in list(self._entries):
+            entry_zone, entry_module, entry_kind = key
+            if zone is not None and entry_zone != zone:
+                continue
+            if module is not None and entry_module != module:
+                continue
+            if kind is not None and entry_kind != kind:
+                continue
+            del self._entries[key]
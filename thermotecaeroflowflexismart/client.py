@@ -1,10 +1,33 @@
 """Client module for the Python Thermotec AeroFlow® Library"""
 import logging
-from asyncio import sleep
+from asyncio import Task, create_task, sleep
+from collections.abc import AsyncIterator, Callable, Iterable
 from datetime import datetime
 
+from .cache import (
+    TopologyCache,
+    ModuleStateCache,
+    KIND_MODULE_DATA,
+    KIND_TEMPERATURE,
+    KIND_TEMPERATURE_OFFSET,
+    KIND_ANTI_FREEZE_TEMPERATURE,
+    KIND_BOOST,
+    KIND_WINDOW_OPEN_DETECTION,
+    KIND_SMART_START,
+    KIND_HOLIDAY_DATA,
+)
+from . import protocol
 from .communication import FlexiSmartGateway
-from .const import OPERATION, OPERATION_OK, OKAY
+from .metrics import GatewayMetrics
+from .pacing import PacingPolicy
+from .poll import PollCycle, PollStatistics, GatewayLiveness
+from .scheduler import SchedulerStatistics, Priority, get_request_priority, request_priority
+from .singleflight import SingleFlight, SingleFlightStatistics
+from .snapshot import FleetSnapshot
+from .events import ChangeEvent, ChangeNotifier
+from .debounce import WriteCoalescer, WriteCoalescerStatistics
+from .transport import Transport
+from .quarantine import ModuleQuarantine, QuarantineEntry, REASON_TIMEOUT, REASON_INVALID_DEVICE_IDENTIFIER
 from .data_object import (
     GatewayNetworkConfiguration,
     Temperature,
@@ -14,42 +37,87 @@ from .data_object import (
     HolidayData,
     HomeAssistantModuleData
 )
-from .exception import InvalidResponse, InvalidRequest, RequestTimeout
-from .utils import (
-    check_if_zone_exists,
-    check_if_module_is_valid,
-    calculate_int_from_temperature,
-    calculate_temperature_offset_from_int,
-    calculate_int_from_temperature_offset
-)
+from .exception import InvalidResponse, RequestTimeout
+from .utils import check_if_zone_exists, check_if_module_is_valid
 
 _LOGGER = logging.getLogger(__name__)
 INVALID_DEVICE_IDENTIFIER = "0.0.0.0"
 
 
 class Client:
-    def __init__(self, host: str, port: int = 6653):
-        self._gateway = FlexiSmartGateway(host, port)
+    # pacing: how long to rest between two requests. Defaults to AdaptivePacing
+    # topology_ttl: seconds the zones with their module count are cached if not passed to a function
+    # change_detection: get_all_data probes the server sync id first and skips unchanged data
+    # settings_max_age: seconds get_all_data reuses anti-freeze and holiday data while nothing changed
+    # max_consecutive_timeouts: module timeouts in a row after which get_all_data checks if the gateway went dark
+    # quarantine: keeps failing modules out of get_all_data. Defaults to ModuleQuarantine
+    # transport: how the datagrams reach the gateway. Defaults to UDP to host:port, see transport.py
+    # coalesce_reads: concurrent identical reads share one request to the gateway
+    # verify_writes: seconds after a successful write to read the setting again. None trusts the write
+    # write_debounce: seconds writes of the same setting are collected, only the latest one is sent. None sends all
+    def __init__(
+            self,
+            host: str,
+            port: int = 6653,
+            pacing: PacingPolicy | None = None,
+            topology_ttl: float = 300.0,
+            change_detection: bool = True,
+            settings_max_age: float = 900.0,
+            max_consecutive_timeouts: int = 3,
+            quarantine: ModuleQuarantine | None = None,
+            transport: Transport | None = None,
+            coalesce_reads: bool = True,
+            verify_writes: float | None = None,
+            write_debounce: float | None = None
+    ):
+        self._gateway = FlexiSmartGateway(host, port, pacing, transport)
+        self._topology = TopologyCache(topology_ttl)
+        self._module_state = ModuleStateCache()
+        self._change_detection = change_detection
+        self._settings_max_age = settings_max_age
+        self._poll_statistics = PollStatistics()
+        self._liveness = GatewayLiveness(max_consecutive_timeouts)
+        self._last_modules: dict[str, HomeAssistantModuleData] = {}
+        self._snapshot = FleetSnapshot()
+        self._notifier = ChangeNotifier()
+        self._quarantine = quarantine if quarantine is not None else ModuleQuarantine()
+        self._coalesce_reads = coalesce_reads
+        self._single_flight = SingleFlight()
+        self._revalidations: dict[tuple[int, int, str], Task] = {}
+        self._verify_writes = verify_writes
+        self._verifications: set[Task] = set()
+        self._write_coalescer = WriteCoalescer(write_debounce) if write_debounce is not None else None
+
+    async def __aenter__(self) -> "Client":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    # Opens the (long-lived) connection to the gateway. Optional, the first request opens it as well
+    async def open(self) -> None:
+        await self._gateway.open()
+
+    async def close(self) -> None:
+        for task in [*self._revalidations.values(), *self._verifications]:
+            task.cancel()
+        if self._write_coalescer is not None:
+            self._write_coalescer.cancel()
+        await self._gateway.close()
 
     # Command: PING
     # GatewayResponse: OP
     async def ping(self) -> bool:
-        command = "PING"
-
         try:
-            response = await self._gateway.send_message_get_response(command)
-            if not response.startswith(OPERATION):
-                raise InvalidResponse()
-            return True
+            return await self.__execute(protocol.ping())
         except Exception:
             return False
 
     # Command: OPH...
     # GatewayResponse: OPOK,<>
     async def get_date_time(self) -> GatewayDateTime:
-        operation = "OPH"
-        data = await self.__get_data(operation, False)
-        return GatewayDateTime(data)
+        return await self.__execute(protocol.get_date_time())
 
     async def update_date_time(self) -> None:
         now = datetime.now()
@@ -58,50 +126,98 @@ class Client:
     # Command: OPF...
     # GatewayResponse: OPOK
     async def set_date_time(self, target_datetime: datetime) -> None:
-        hour = "%H"
-        minute = "%M"
-        second = "%S"
-        day_of_week = target_datetime.weekday()  # Sunday = 6 - Monday = 0
-        day = "%d"
-        month = "%m"
-        year = "%y"
-
-        operation = "OPF"
-        command = target_datetime.strftime(f"{operation}{hour}{minute}{second}{day_of_week}/{day},{month},{year}/")
-
-        response = await self._gateway.send_message_get_response(command)
-
-        if not response.startswith(OPERATION_OK):
-            raise InvalidResponse()
-
-        return None
+        return await self.__execute(protocol.set_date_time(target_datetime))
 
     # Command: OPF/
     # GatewayResponse: OPOK,<firmware_version>,<installation_id>,<idu>
     async def get_gateway_data(self) -> GatewayData:
-        operation = "OPF"
-        data = await self.__get_data(operation, False)
-        return GatewayData(data)
+        return await self.__execute(protocol.get_gateway_data())
 
     # Command: OPS1/
     # GatewayResponse: OPOK,OPS1,<server_sync_id>,x,x,x,x,<id_a>,<id_b>,x,x,x
     # if sync id != last sync id -> environment has changed
     async def get_status(self):
-        operation = "OPS1"
-        data = await self.__get_data(operation, True)
-        return {"serverSyncId": data[0], "idA": data[5], "idB": data[6]}
+        status = await self.__execute(protocol.get_status())
+        if self._topology.update_sync_id(status["serverSyncId"]):
+            # A module may have been paired again under the address of a quarantined or a last known module
+            self._quarantine.clear()
+            self._last_modules.clear()
+        return status
+
+    # Cheap probe (one OPS1 round trip) if anything changed since the last call.
+    # Returns True if the response was invalid or the gateway was never asked before. A timeout is raised, so a poll
+    # can stop at once if the gateway is gone
+    async def has_changed(self) -> bool:
+        known_sync_id = self._topology.get_sync_id()
+        try:
+            status = await self.get_status()
+        except InvalidResponse:
+            _LOGGER.debug("Could not read server sync id. Assume the environment has changed")
+            return True
+
+        sync_id = status["serverSyncId"]
+        if known_sync_id is None or known_sync_id != sync_id:
+            self._module_state.invalidate()
+            return True
+
+        self._topology.confirm()
+        return False
+
+    def get_poll_statistics(self) -> PollStatistics:
+        return self._poll_statistics
+
+    # Requests, errors, bytes and latencies per command family
+    def get_gateway_metrics(self) -> GatewayMetrics:
+        return self._gateway.get_metrics()
+
+    # All requests or only the ones of one priority lane, e.g. to check the queue wait of interactive writes during a poll
+    def get_scheduler_statistics(self, priority: Priority | None = None) -> SchedulerStatistics:
+        return self._gateway.get_scheduler_statistics(priority)
+
+    # Writes which were replaced by a later write of the same setting. None if write_debounce is not used
+    def get_write_coalescing_statistics(self) -> WriteCoalescerStatistics | None:
+        if self._write_coalescer is None:
+            return None
+        return self._write_coalescer.get_statistics()
+
+    # Reads which shared the request of an identical read in flight
+    def get_single_flight_statistics(self) -> SingleFlightStatistics:
+        return self._single_flight.get_statistics()
+
+    # Data of all modules of the last get_all_data. Unchanged modules are shared with the snapshot before
+    def get_snapshot(self) -> FleetSnapshot:
+        return self._snapshot
+
+    # Calls the callback with the changes between two get_all_data. zone, module and fields (see
+    # snapshot.MODULE_FIELDS) filter the events. Returns a function which ends the subscription
+    def subscribe(self, callback: Callable[[ChangeEvent], None], zone: int | None = None, module: int | None = None,
+                  fields: Iterable[str] | None = None) -> Callable[[], None]:
+        return self._notifier.subscribe(callback, zone, module, fields)
+
+    # Same as subscribe, as async iterator
+    def events(self, zone: int | None = None, module: int | None = None,
+               fields: Iterable[str] | None = None) -> AsyncIterator[ChangeEvent]:
+        return self._notifier.events(zone, module, fields)
+
+    # Modules get_all_data currently skips, because they timed out or could not be identified repeatedly
+    def get_quarantined_modules(self) -> list[QuarantineEntry]:
+        return self._quarantine.get_entries()
+
+    # False after a poll was aborted because the gateway did not respond, until a PING succeeds again
+    def is_gateway_available(self) -> bool:
+        return self._liveness.is_available()
 
     # Command: OPS2/
     # GatewayResponse: OPOK,OPS2,<zone_id>,<...>
     async def get_zones(self) -> list[int]:
-        operation = "OPS2"
-        return await self.__get_zones(operation)
+        return await self.__execute(protocol.get_zones())
 
     # Command: OPS3/
     # GatewayResponse: OPOK,OPS3,<module_count>,<...>
     async def get_zones_with_module_count(self) -> list[int]:
-        operation = "OPS3"
-        return await self.__get_zones(operation)
+        zones = await self.__execute(protocol.get_zones_with_module_count())
+        self._topology.set_zones(zones)
+        return zones
 
     # Command: OPS4/
     # GatewayResponse: OPOK,OPS4,<x>,<x>,<x>
@@ -170,9 +286,7 @@ class Client:
     # Command: OPS38/
     # GatewayResponse: OPOK,OPS38,<ip[0-3]>,<gateway[4-7]>,<netmask[8-11],x,x,x,x
     async def get_network_configuration(self) -> GatewayNetworkConfiguration:
-        operation = "OPS38"
-        data = await self.__get_data(operation, True)
-        return GatewayNetworkConfiguration(data)
+        return await self.__execute(protocol.get_network_configuration())
 
     # Command: OPS43/
     # GatewayResponse: OPOK,OPS43,<x>,<x>
@@ -191,126 +305,103 @@ class Client:
     #     return placeholder
 
     async def register_module_in_zone(self, zone: int, timeout: int = 30, zones: list[int] | None = None) -> None:
-        return await self._register_module(zone, timeout, zones)
+        try:
+            return await self._register_module(zone, timeout, zones)
+        finally:
+            self.__invalidate_topology()
 
     # Command: OPMW<zone_position>,<zone_id>/
     # GatewayResponse: OPOK
     async def create_zone(self) -> None:
         zones = await self.get_zones_with_module_count()
-        await sleep(0.1)
-
-        total_zones = len(zones)
-
-        zone_position = total_zones + 9
-        new_zone_id = total_zones + 1
-
-        operation = "OPMW"
-        command = f"{operation}{zone_position},{new_zone_id}/"
-        response = await self._gateway.send_message_get_response(command)
-
-        if not response.startswith(OPERATION_OK):
-            raise InvalidResponse()
-
-        return None
+        try:
+            return await self.__execute(protocol.create_zone(zones))
+        finally:
+            self.__invalidate_topology()
 
     # Command: OPMW<big_zone_id>,0/
     # GatewayResponse: OPOK
     async def delete_zone(self, zone: int, zones: list[int] | None = None) -> None:
-        if zones is None or len(zones) == 0:
-            zones = await self.get_zones_with_module_count()
-            await sleep(0.1)
-
-        check_if_zone_exists(zones, zone)
-
-        # module type = 120
-        # some crazy constant value = 8
-        # zone id = <zone>
-        big_zone_id = 120 + 8 + zone
-
-        operation = "OPMW"
-        command = f"{operation}{big_zone_id},0/"
-        response = await self._gateway.send_message_get_response(command)
-
-        if not response.startswith(OPERATION_OK):
-            raise InvalidResponse()
-        return None
+        intent = protocol.delete_zone(zone)
+        intent.resolve(await self.__resolve_zones(zones))
+        try:
+            return await self.__execute(intent)
+        finally:
+            self.__invalidate_topology()
 
     # Command: R#<zone_id>#<zone_module_count>#0#0*?F/
-    async def get_module_data(self, zone: int, module: int, zones: list[int] | None = None) -> ModuleData:
-        if zones is None or len(zones) == 0:
-            zones = await self.get_zones_with_module_count()
-            await sleep(0.1)
-
-        check_if_zone_exists(zones, zone)
+    async def get_module_data(self, zone: int, module: int, zones: list[int] | None = None,
+                              max_age: float | None = None, stale_while_revalidate: bool = False) -> ModuleData:
+        intent = protocol.get_module_data(zone, module)
+        return await self.__read(intent, KIND_MODULE_DATA, zones, max_age, stale_while_revalidate)
 
-        operation = "R"
-        command = f"{operation}#{zone}#{module}#0#0*?F/"
-        response = await self._gateway.send_message_get_response(command)
-
-        status = OKAY
-        response_identifier = f"{status},"
-
-        if not response.startswith(response_identifier):
-            raise InvalidResponse()
-
-        data = response.replace(response_identifier, "").split(",")
-        return ModuleData(data)
+    # Reads accept max_age: seconds a value of the module state cache may be old to be returned without a request.
+    # stale_while_revalidate returns an older value at once and refreshes it in the background
 
     # >>>>>>> Temperature <<<<<<< #
-    async def get_zone_temperature(self, zone: int, zones: list[int] | None = None) -> Temperature:
-        return await self._get_temperature(zone, zones)
+    async def get_zone_temperature(self, zone: int, zones: list[int] | None = None,
+                                   max_age: float | None = None, stale_while_revalidate: bool = False) -> Temperature:
+        return await self._get_temperature(zone, zones, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def set_zone_temperature(self, zone: int, temperature: float, zones: list[int] | None = None) -> None:
         return await self._set_temperature(temperature, zone, zones)
 
-    async def get_module_temperature(self, zone: int, module: int, zones: list[int] | None = None) -> Temperature:
-        return await self._get_temperature(zone, zones, module)
+    async def get_module_temperature(self, zone: int, module: int, zones: list[int] | None = None,
+                                     max_age: float | None = None, stale_while_revalidate: bool = False) -> Temperature:
+        return await self._get_temperature(zone, zones, module, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def set_module_temperature(self, zone: int, module: int, temperature: float, zones: list[int] | None = None) -> None:
         return await self._set_temperature(temperature, zone, zones, module)
 
     # >>>>>>> Offset Temperature <<<<<<< #
-    async def get_zone_temperature_offset(self, zone: int, zones: list[int] | None = None) -> float:
-        return await self._get_temperature_offset(zone, zones)
+    async def get_zone_temperature_offset(self, zone: int, zones: list[int] | None = None,
+                                          max_age: float | None = None, stale_while_revalidate: bool = False) -> float:
+        return await self._get_temperature_offset(zone, zones, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def set_zone_temperature_offset(self, zone: int, temperature: float, zones: list[int] | None = None) -> None:
         return await self._set_temperature_offset(temperature, zone, zones)
 
-    async def get_module_temperature_offset(self, zone: int, module: int, zones: list[int] | None = None) -> float:
-        return await self._get_temperature_offset(zone, zones, module)
+    async def get_module_temperature_offset(self, zone: int, module: int, zones: list[int] | None = None,
+                                            max_age: float | None = None, stale_while_revalidate: bool = False) -> float:
+        return await self._get_temperature_offset(zone, zones, module, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def set_module_temperature_offset(self, zone: int, module: int, temperature: float, zones: list[int] | None = None) -> None:
         return await self._set_temperature_offset(temperature, zone, zones, module)
 
     # >>>>>>> Anti Freeze Temperature <<<<<<< #
-    async def get_zone_anti_freeze_temperature(self, zone: int, zones: list[int] | None = None) -> float:
-        return await self._get_anti_freeze_temperature(zone, zones)
+    async def get_zone_anti_freeze_temperature(self, zone: int, zones: list[int] | None = None,
+                                               max_age: float | None = None, stale_while_revalidate: bool = False) -> float:
+        return await self._get_anti_freeze_temperature(zone, zones, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def set_zone_anti_freeze_temperature(self, zone: int, temperature: float, zones: list[int] | None = None) -> None:
         return await self._set_anti_freeze_temperature(temperature, zone, zones)
 
-    async def get_module_anti_freeze_temperature(self, zone: int, module: int, zones: list[int] | None = None) -> float:
-        return await self._get_anti_freeze_temperature(zone, zones, module)
+    async def get_module_anti_freeze_temperature(self, zone: int, module: int, zones: list[int] | None = None,
+                                                 max_age: float | None = None, stale_while_revalidate: bool = False) -> float:
+        return await self._get_anti_freeze_temperature(zone, zones, module, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def set_module_anti_freeze_temperature(self, zone: int, module: int, temperature: float, zones: list[int] | None = None) -> None:
         return await self._set_anti_freeze_temperature(temperature, zone, zones, module)
 
     # >>>>>>> Boost <<<<<<< #
-    async def get_zone_boost(self, zone: int, zones: list[int] | None = None) -> float:
-        return await self._get_boost(zone, zones)
+    async def get_zone_boost(self, zone: int, zones: list[int] | None = None,
+                             max_age: float | None = None, stale_while_revalidate: bool = False) -> float:
+        return await self._get_boost(zone, zones, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def set_zone_boost(self, zone: int, time: int, zones: list[int] | None = None) -> None:
         return await self._set_boost(time, zone, zones)
 
-    async def get_module_boost(self, zone: int, module: int, zones: list[int] | None = None) -> int:
-        return await self._get_boost(zone, zones, module)
+    async def get_module_boost(self, zone: int, module: int, zones: list[int] | None = None,
+                               max_age: float | None = None, stale_while_revalidate: bool = False) -> int:
+        return await self._get_boost(zone, zones, module, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def set_module_boost(self, zone: int, module: int, time: int, zones: list[int] | None = None) -> None:
         return await self._set_boost(time, zone, zones, module)
 
     # >>>>>>> Window Open Detection <<<<<<< #
-    async def is_zone_window_open_detection_enabled(self, zone: int, zones: list[int] | None = None) -> bool:
-        return await self._is_window_open_detection_enabled(zone, zones)
+    async def is_zone_window_open_detection_enabled(self, zone: int, zones: list[int] | None = None,
+                                                    max_age: float | None = None, stale_while_revalidate: bool = False) -> bool:
+        return await self._is_window_open_detection_enabled(zone, zones, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def enable_zone_window_open_detection(self, zone: int, zones: list[int] | None = None) -> None:
         return await self._set_window_open_detection(True, zone, zones)
@@ -321,8 +412,9 @@ class Client:
     async def set_zone_window_open_detection(self, zone: int, value: bool, zones: list[int] | None = None) -> None:
         return await self._set_window_open_detection(value, zone, zones)
 
-    async def is_module_window_open_detection_enabled(self, zone: int, module: int, zones: list[int] | None = None) -> bool:
-        return await self._is_window_open_detection_enabled(zone, zones, module)
+    async def is_module_window_open_detection_enabled(self, zone: int, module: int, zones: list[int] | None = None,
+                                                      max_age: float | None = None, stale_while_revalidate: bool = False) -> bool:
+        return await self._is_window_open_detection_enabled(zone, zones, module, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def enable_module_window_open_detection(self, zone: int, module: int, zones: list[int] | None = None) -> None:
         return await self._set_window_open_detection(True, zone, zones, module)
@@ -334,8 +426,9 @@ class Client:
         return await self._set_window_open_detection(value, zone, zones, module)
 
     # >>>>>>> Smart Start <<<<<<< #
-    async def is_zone_smart_start_enabled(self, zone: int, zones: list[int] | None = None) -> bool:
-        return await self._is_smart_start_enabled(zone, zones)
+    async def is_zone_smart_start_enabled(self, zone: int, zones: list[int] | None = None,
+                                          max_age: float | None = None, stale_while_revalidate: bool = False) -> bool:
+        return await self._is_smart_start_enabled(zone, zones, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def enable_zone_smart_start(self, zone: int, zones: list[int] | None = None) -> None:
         return await self._set_smart_start(True, zone, zones)
@@ -346,8 +439,9 @@ class Client:
     async def set_zone_smart_start(self, zone: int, value: bool, zones: list[int] | None = None) -> None:
         return await self._set_smart_start(value, zone, zones)
 
-    async def is_module_smart_start_enabled(self, zone: int, module: int, zones: list[int] | None = None) -> bool:
-        return await self._is_smart_start_enabled(zone, zones, module)
+    async def is_module_smart_start_enabled(self, zone: int, module: int, zones: list[int] | None = None,
+                                            max_age: float | None = None, stale_while_revalidate: bool = False) -> bool:
+        return await self._is_smart_start_enabled(zone, zones, module, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def enable_module_smart_start(self, zone: int, module: int, zones: list[int] | None = None) -> None:
         return await self._set_smart_start(True, zone, zones, module)
@@ -359,8 +453,9 @@ class Client:
         return await self._set_smart_start(value, zone, zones, module)
 
     # >>>>>>> Holiday <<<<<<< #
-    async def get_zone_holiday_mode(self, zone: int, zones: list[int] | None = None) -> HolidayData:
-        return await self._get_holiday_mode(zone, zones)
+    async def get_zone_holiday_mode(self, zone: int, zones: list[int] | None = None,
+                                    max_age: float | None = None, stale_while_revalidate: bool = False) -> HolidayData:
+        return await self._get_holiday_mode(zone, zones, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def disable_zone_holiday_mode(self, zone: int, zones: list[int] | None = None) -> None:
         return await self._disable_holiday_mode(zone, zones)
@@ -368,8 +463,9 @@ class Client:
     async def set_zone_holiday_mode(self, zone: int, target_datetime: datetime, target_temperature: float, zones: list[int] | None = None) -> None:
         return await self._set_holiday_mode(target_datetime, target_temperature, zone, zones)
 
-    async def get_module_holiday_mode(self, zone: int, module: int, zones: list[int] | None = None) -> HolidayData:
-        return await self._get_holiday_mode(zone, zones, module)
+    async def get_module_holiday_mode(self, zone: int, module: int, zones: list[int] | None = None,
+                                      max_age: float | None = None, stale_while_revalidate: bool = False) -> HolidayData:
+        return await self._get_holiday_mode(zone, zones, module, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
 
     async def disable_module_holiday_mode(self, zone: int, module: int, zones: list[int] | None = None) -> None:
         return await self._disable_holiday_mode(zone, zones, module)
@@ -391,9 +487,7 @@ class Client:
 
     # >>>>>>> HomeAssistant <<<<<<< #
     async def get_module_all_data(self, zone: int, module: int, zones: list[int] | None = None, extended: bool = True) -> HomeAssistantModuleData:
-        if zones is None or len(zones) == 0:
-            zones = await self.get_zones_with_module_count()
-            await sleep(0.1)
+        zones = await self.__resolve_zones(zones)
 
         check_if_zone_exists(zones, zone)
 
@@ -407,79 +501,126 @@ class Client:
         holiday_data = None
         date_time = None
         if extended:
-            await sleep(0.1)
             anti_freeze_temperature = await self.get_module_anti_freeze_temperature(zone=zone, module=module)
-            await sleep(0.1)
             holiday_data = await self.get_module_holiday_mode(zone=zone, module=module)
-            await sleep(0.1)
             date_time = await self.get_date_time()
-            await sleep(0.1)
 
         return HomeAssistantModuleData(zone_id=zone, module_id=module, module_data=module_data,
                                        anti_freeze_temperature=anti_freeze_temperature, holiday_data=holiday_data,
                                        date_time=date_time)
 
     async def get_all_data(self, zones: list[int] | None = None, extended: bool = True) -> dict[str, HomeAssistantModuleData]:
-        if zones is None or len(zones) == 0:
-            zones = await self.get_zones_with_module_count()
-            await sleep(0.1)
-
-        _LOGGER.debug("Zones with modules: %s", ", ".join(map(str, zones)))
-
-        date_time = None
-        if extended:
-            date_time = await self.get_date_time() if extended else None
-            await sleep(0.1)
-
         home_assistant_modules = dict()
-        zone = 0
-        for modules in zones:
-            zone = zone + 1
-            if modules == 0:
-                _LOGGER.debug("Zone: %s is empty. Skipping", zone)
-                continue
-
-            for module in range(1, (modules + 1)):
-                try:
-                    _LOGGER.debug("Zone: %s, Module: %s. Request module data", zone, module)
+        async for home_assistant_module in self.iter_all_data(zones, extended):
+            device_identifier = home_assistant_module.get_module_data().get_device_identifier()
+            home_assistant_modules[device_identifier] = home_assistant_module
 
-                    device_identifier = INVALID_DEVICE_IDENTIFIER
-                    module_data = None
-                    for attempt in range(4):  # UDP and Gateway are sometimes not 100% reliable. Retry 3 times
-                        module_data = await self.get_module_data(zone, module, zones)
-                        device_identifier = module_data.get_device_identifier()
-                        if device_identifier != INVALID_DEVICE_IDENTIFIER:
-                            break
-
-                    if device_identifier == INVALID_DEVICE_IDENTIFIER:
-                        _LOGGER.warning("Could not uniquely identify module after 3 attempts. Skip this module")
-                        continue
-
-                    _LOGGER.debug("Add module with Identifier: %s", device_identifier)
+        snapshot = self._snapshot
+        self._snapshot = snapshot.with_modules(home_assistant_modules)
+        self._notifier.publish(snapshot, self._snapshot)
+        return home_assistant_modules
 
-                    anti_freeze_temperature = None
-                    holiday_data = None
+    # Yields the data of every module as soon as it is complete.
+    # If the gateway goes dark, the poll is aborted and the last known data of the missing modules is yielded as stale
+    async def iter_all_data(self, zones: list[int] | None = None, extended: bool = True) -> AsyncIterator[HomeAssistantModuleData]:
+        cycle = PollCycle()
+        try:
+            if not self._liveness.is_available():
+                # Gateway was dark in the last poll, a cheap PING decides if it makes sense to try again
+                cycle.add_round_trip()
+                with request_priority(Priority.BACKGROUND):
+                    available = await self.ping()
+                if not available:
+                    cycle.abort()
+                    for home_assistant_module in self.__get_stale_modules(cycle):
+                        yield home_assistant_module
+                    return
+                self._liveness.record_success()
+
+            try:
+                with request_priority(Priority.BACKGROUND):
+                    if self._change_detection:
+                        cycle.set_unchanged(not await self.has_changed())
+                        cycle.add_round_trip()
+
+                    if zones is None or len(zones) == 0:
+                        cached_zones = self._topology.get_zones()
+                        zones = await self.__resolve_zones(cached_zones)
+                        if cached_zones is None:
+                            cycle.add_round_trip()
+                        else:
+                            cycle.add_saved_round_trip()
+
+                    _LOGGER.debug("Zones with modules: %s", ", ".join(map(str, zones)))
+
+                    date_time = None
                     if extended:
-                        anti_freeze_temperature = await self.get_module_anti_freeze_temperature(zone=zone, zones=zones, module=module)
-                        await sleep(0.1)
-                        holiday_data = await self.get_module_holiday_mode(zone=zone, zones=zones, module=module)
-                        await sleep(0.1)
-
-                    home_assistant_module = HomeAssistantModuleData(
-                        zone_id=zone,
-                        module_id=module,
-                        module_data=module_data,
-                        anti_freeze_temperature=anti_freeze_temperature,
-                        holiday_data=holiday_data,
-                        date_time=date_time
-                    )
-                    home_assistant_modules[device_identifier] = home_assistant_module
-                except RequestTimeout:
-                    _LOGGER.warning(f"Timeout while fetching data for Module: {module} in Zone: {zone} - If this "
-                                    f"module does not exist anymore, remove it from the Gateway to improve "
-                                    f"performance and update speed")
+                        cycle.add_round_trip()
+                        date_time = await self.get_date_time()
+            except RequestTimeout:
+                _LOGGER.warning("Timeout while fetching gateway data. Gateway seems to be unavailable")
+                self._liveness.set_unavailable()
+                cycle.abort()
+                for home_assistant_module in self.__get_stale_modules(cycle):
+                    yield home_assistant_module
+                return
+
+            zone = 0
+            for modules in zones:
+                zone = zone + 1
+                if modules == 0:
+                    _LOGGER.debug("Zone: %s is empty. Skipping", zone)
+                    continue
+
+                for module in range(1, (modules + 1)):
+                    attempts = 4  # UDP and Gateway are sometimes not 100% reliable. Retry 3 times
+                    if self._quarantine.is_quarantined(zone, module):
+                        if self._quarantine.should_skip(zone, module):
+                            _LOGGER.debug("Zone: %s, Module: %s is quarantined. Skipping", zone, module)
+                            cycle.add_skipped_module()
+                            continue
+                        # Backoff is over, probe the module with a single request
+                        attempts = 1
+
+                    try:
+                        with request_priority(Priority.BACKGROUND):
+                            home_assistant_module = await self.__poll_module(cycle, zone, module, zones, extended,
+                                                                             date_time, attempts)
+                    except RequestTimeout:
+                        _LOGGER.warning(f"Timeout while fetching data for Module: {module} in Zone: {zone} - If this "
+                                        f"module does not exist anymore, remove it from the Gateway to improve "
+                                        f"performance and update speed")
+                        self._quarantine.record_failure(zone, module, REASON_TIMEOUT)
+                        self._poll_statistics._record_module_poll(zone, module, success=False, timeout=True)
+                        with request_priority(Priority.BACKGROUND):
+                            gateway_dark = self._liveness.record_timeout() and not await self.__is_gateway_alive(cycle)
+                        if gateway_dark:
+                            _LOGGER.warning("Gateway does not respond anymore. Abort poll and keep the last known data")
+                            cycle.abort()
+                            for home_assistant_module in self.__get_stale_modules(cycle):
+                                yield home_assistant_module
+                            return
+                        continue
 
-        return home_assistant_modules
+                    self._liveness.record_success()
+                    self._poll_statistics._record_module_poll(zone, module, success=home_assistant_module is not None)
+                    if home_assistant_module is None:
+                        self._quarantine.record_failure(zone, module, REASON_INVALID_DEVICE_IDENTIFIER)
+                    else:
+                        self._quarantine.record_success(zone, module)
+                        device_identifier = home_assistant_module.get_module_data().get_device_identifier()
+                        cycle.add_device_identifier(device_identifier)
+                        self._last_modules[device_identifier] = home_assistant_module
+                        yield home_assistant_module
+
+            # The poll is complete, modules which were not read are gone (or skipped) and must not come back as stale
+            for device_identifier in [device_identifier for device_identifier in self._last_modules
+                                      if not cycle.has_device_identifier(device_identifier)]:
+                del self._last_modules[device_identifier]
+        finally:
+            self._poll_statistics._record_poll(cycle)
+            _LOGGER.debug("Poll finished with %s round trips, %s saved", cycle.get_round_trips(),
+                          cycle.get_saved_round_trips())
 
     # --------------------------------- #
     # >>>>>>> Private functions <<<<<<< #
@@ -488,257 +629,316 @@ class Client:
     # Command: OPZI199,<zone>,<module>/
     # GatewayResponse: OPOK
     async def _register_module(self, zone: int, timeout: int, zones: list[int] | None, module: int = -1) -> None:
-        if zones is None or len(zones) == 0:
-            zones = await self.get_zones_with_module_count()
-            await sleep(0.1)
-
-        check_if_zone_exists(zones, zone)
-
-        target_module = zones[(zone - 1)]
-
-        # if module was not -1 we verify the requested module
-        if module != -1:
-            check_if_module_is_valid(target_module, module)
-            target_module = module
-
-        operation = "OPZI199"
-        command = f"{operation},{zone},{target_module}/"
-        response = await self._gateway.send_message_get_response(command, timeout)
-
-        status = OPERATION_OK
-        response_identifier = f"{status}"
-
-        if not response.startswith(response_identifier):
-            raise InvalidResponse()
-
-        return None
+        return await self.__execute(protocol.register_module(zone, timeout, module), zones)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*?T/
     # GatewayResponse: OK,<current_temperature>,<current_temperature>,<target_temperature>
-    async def _get_temperature(self, zone: int, zones: list[int] | None, module: int = -1) -> Temperature:
-        data = await self.__get_zone_command("?T", zone, zones, module)
-
-        return Temperature(data)
+    async def _get_temperature(self, zone: int, zones: list[int] | None, module: int = -1, max_age: float | None = None,
+                               stale_while_revalidate: bool = False) -> Temperature:
+        return await self.__read(protocol.get_temperature(zone, module), KIND_TEMPERATURE, zones, max_age, stale_while_revalidate)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*T<target_temperature>/
     # GatewayResponse: OK
     async def _set_temperature(self, temperature: float, zone: int, zones: list[int] | None, module: int = -1) -> None:
-        target_temperature = calculate_int_from_temperature(temperature)
-
-        sub_command = f"T{target_temperature}"
-
-        return await self.__set_zone_command(sub_command, zone, zones, module)
+        return await self.__write(protocol.set_temperature(temperature, zone, module), zones)
 
     # Command: R<zone_id>#<zone_module_count>#0#0*?E#0#9/
     # GatewayResponse: OK,<offset_temperature>
-    async def _get_temperature_offset(self, zone: int, zones: list[int] | None, module: int = -1) -> float:
-        data = await self.__get_zone_command("?E#0#9", zone, zones, module)
-
-        return calculate_temperature_offset_from_int(int(data[0]))
+    async def _get_temperature_offset(self, zone: int, zones: list[int] | None, module: int = -1, max_age: float | None = None,
+                                      stale_while_revalidate: bool = False) -> float:
+        return await self.__read(protocol.get_temperature_offset(zone, module), KIND_TEMPERATURE_OFFSET, zones, max_age, stale_while_revalidate)
 
     # Command: R<zone_id>#<zone_module_count>#0#0*SEP#0#9#<target_offset_temperature>/
     # GatewayResponse: OK
     async def _set_temperature_offset(self, temperature: float, zone: int, zones: list[int] | None, module: int = -1) -> None:
-        target_temperature = calculate_int_from_temperature_offset(temperature)
-
-        sub_command = f"SEP#0#9#{target_temperature}"
-
-        return await self.__set_zone_command(sub_command, zone, zones, module)
+        return await self.__write(protocol.set_temperature_offset(temperature, zone, module), zones)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*?E#1#20/
     # GatewayResponse: OK,<anti_freeze_temperature>
-    async def _get_anti_freeze_temperature(self, zone: int, zones: list[int] | None, module: int = -1) -> float:
-        response = await self.__get_zone_command_string("?E#1#20", zone, zones, module)
-
-        data = int(response)
-
-        # if data == 255 -> Anti Freeze was never Set -> default might be 5°C
-        if data == 255:
-            data = 5
-
-        return float(data)
+    async def _get_anti_freeze_temperature(self, zone: int, zones: list[int] | None, module: int = -1, max_age: float | None = None,
+                                           stale_while_revalidate: bool = False) -> float:
+        return await self.__read(protocol.get_anti_freeze_temperature(zone, module), KIND_ANTI_FREEZE_TEMPERATURE, zones, max_age, stale_while_revalidate)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*SEP#1#20#<target_temperature>/
     # GatewayResponse: OK
     async def _set_anti_freeze_temperature(self, temperature: float, zone: int, zones: list[int] | None, module: int = -1) -> None:
-        target_temperature = int(temperature)
-
-        sub_command = f"SEP#1#20#{target_temperature}"
-
-        return await self.__set_zone_command(sub_command, zone, zones, module)
+        return await self.__write(protocol.set_anti_freeze_temperature(temperature, zone, module), zones)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*?E#1#22/
     # GatewayResponse: OK,<boost_time>
-    async def _get_boost(self, zone: int, zones: list[int] | None, module: int = -1) -> int:
-        response = await self.__get_zone_command_string("?E#1#22", zone, zones, module)
-
-        data = int(response)
-
-        if data == 255:
-            data = 0
-
-        # Multiply by 5 as each step is 5 minutes
-        return data * 5
+    async def _get_boost(self, zone: int, zones: list[int] | None, module: int = -1, max_age: float | None = None,
+                         stale_while_revalidate: bool = False) -> int:
+        return await self.__read(protocol.get_boost(zone, module), KIND_BOOST, zones, max_age, stale_while_revalidate)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*SEP#1#22#<target_temperature>/
     # GatewayResponse: OK
     async def _set_boost(self, time: int, zone: int, zones: list[int] | None, module: int = -1) -> None:
-        if time > 95:
-            raise InvalidRequest("Boost time can not exceed 95 Minutes")
-
-        target_time = 0
-        if time >= 5:
-            target_time = int(time / 5)
-
-        sub_command = f"SEP#1#22#{target_time}"
-
-        return await self.__set_zone_command(sub_command, zone, zones, module)
+        return await self.__write(protocol.set_boost(time, zone, module), zones)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*?E#0#6/
     # GatewayResponse: OK,<0|1>
-    async def _is_window_open_detection_enabled(self, zone: int, zones: list[int] | None, module: int = -1) -> bool:
-        response = await self.__get_zone_command_string("?E#0#6", zone, zones, module)
-
-        return bool(int(response))
+    async def _is_window_open_detection_enabled(self, zone: int, zones: list[int] | None, module: int = -1, max_age: float | None = None,
+                                                stale_while_revalidate: bool = False) -> bool:
+        return await self.__read(protocol.is_window_open_detection_enabled(zone, module), KIND_WINDOW_OPEN_DETECTION, zones, max_age, stale_while_revalidate)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*SEP#0#6#<target_temperature>/
     # GatewayResponse: OK
     async def _set_window_open_detection(self, value: bool, zone: int, zones: list[int] | None, module: int = -1) -> None:
-        target_value = int(value)
-
-        sub_command = f"SEP#0#6#{target_value}"
-
-        return await self.__set_zone_command(sub_command, zone, zones, module)
+        return await self.__write(protocol.set_window_open_detection(value, zone, module), zones)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*RH#<days>#<final_hour>#<final_minute>#<target_temperature_afterwards>/
     # GatewayResponse: OK
     async def _set_holiday_mode(self, target_datetime: datetime, temperature: float, zone: int,
                                 zones: list[int] | None, module: int = -1) -> None:
-        today = datetime.now()
-
-        days_to_target = (
-                (target_datetime.replace(hour=0, minute=0, second=0, microsecond=0)) -
-                (today.replace(hour=0, minute=0, second=0, microsecond=0))
-        ).days
-
-        if days_to_target > 240:
-            raise InvalidRequest("Holiday Target Date can not exceed 240 Days")
-
-        if days_to_target <= 0:
-            raise InvalidRequest("Holiday Target Date needs to be at least one day in the future")
-
-        target_temperature = calculate_int_from_temperature(temperature)
-
-        sub_command = f"RH#{days_to_target}#{target_datetime.hour}#{target_datetime.minute}#{target_temperature}"
-
-        return await self.__set_zone_command(sub_command, zone, zones, module)
+        intent = protocol.set_holiday_mode(target_datetime, temperature, zone, module, today=datetime.now())
+        return await self.__write(intent, zones)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*RH#<days>#<final_hour>#<final_minute>#<target_temperature_afterwards>/
     # GatewayResponse: OK
     async def _disable_holiday_mode(self, zone: int, zones: list[int] | None, module: int = -1) -> None:
-        sub_command = f"RH#0#0#0#251"
-
-        return await self.__set_zone_command(sub_command, zone, zones, module)
+        return await self.__write(protocol.disable_holiday_mode(zone, module), zones)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*?RH
     # GatewayResponse: OK
-    async def _get_holiday_mode(self, zone: int, zones: list[int] | None, module: int = -1) -> HolidayData:
-        data = await self.__get_zone_command("?RH", zone, zones, module)
-
-        return HolidayData(data)
+    async def _get_holiday_mode(self, zone: int, zones: list[int] | None, module: int = -1, max_age: float | None = None,
+                                stale_while_revalidate: bool = False) -> HolidayData:
+        return await self.__read(protocol.get_holiday_mode(zone, module), KIND_HOLIDAY_DATA, zones, max_age, stale_while_revalidate)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*?E#0#7/
     # GatewayResponse: OK
-    async def _is_smart_start_enabled(self, zone: int, zones: list[int] | None, module: int = -1) -> bool:
-        response = await self.__get_zone_command_string("?E#0#7", zone, zones, module)
-
-        return bool(int(response))
+    async def _is_smart_start_enabled(self, zone: int, zones: list[int] | None, module: int = -1, max_age: float | None = None,
+                                      stale_while_revalidate: bool = False) -> bool:
+        return await self.__read(protocol.is_smart_start_enabled(zone, module), KIND_SMART_START, zones, max_age, stale_while_revalidate)
 
     # Command: D<zone_id>#<zone_module_count>#0#0*SEP#0#7#<target_temperature>/
     # GatewayResponse: OK
     async def _set_smart_start(self, value: bool, zone: int, zones: list[int] | None, module: int = -1) -> None:
-        target_value = int(value)
-
-        sub_command = f"SEP#0#7#{target_value}"
-
-        return await self.__set_zone_command(sub_command, zone, zones, module)
+        return await self.__write(protocol.set_smart_start(value, zone, module), zones)
 
     # Command: D<zone_id><module>#0#0*-TU#0#0#0#0#2/
-    # GatewayResponse: OPOK,<module-data>
+    # GatewayResponse: OK,<module-data>
     async def _restart_module(self, zone: int, zones: list[int] | None, module: int = -1) -> ModuleData:
-        # if we remove one 0 after TU, we reset the module (by accident?)
-        data = await self.__get_zone_command("-TU#0#0#0#0#2", zone, zones, module)
-
-        return ModuleData(data)
-
-    async def __get_data(self, operation: str, include_operation_in_response_identifier: bool) -> list[str]:
-        command = f"{operation}/"
-        response = await self._gateway.send_message_get_response(command)
-
-        status = OPERATION_OK
-        response_identifier = f"{status},"
-        if include_operation_in_response_identifier:
-            response_identifier += f"{operation},"
-
-        if not response.startswith(response_identifier):
-            raise InvalidResponse()
-
-        return response.replace(response_identifier, "").split(",")
-
-    async def __get_zones(self, operation: str) -> list[int]:
-        data = await self.__get_data(operation, True)
-
-        zones = []
-        for value in data:
-            zones.append(int(value))
-
-        return zones
-
-    async def __set_zone_command(self, sub_command: str, zone: int, zones: list[int] | None, module: int = -1):
-        response = await self.__zone_command(sub_command, zone, zones, module)
-
-        status = OKAY
-        response_identifier = f"{status}"
-
-        if not response.startswith(response_identifier):
-            raise InvalidResponse()
-
-        return None
-
-    async def __get_zone_command(self, sub_command: str, zone: int, zones: list[int] | None, module: int = -1):
-        response = await self.__get_zone_command_string(sub_command, zone, zones, module)
-
-        return response.split(",")
+        try:
+            return await self.__execute(protocol.restart_module(zone, module), zones)
+        finally:
+            self.__invalidate_module_state(zone, module)
+
+    # Serves the value from the module state cache if it is not older than max_age, otherwise reads and caches it.
+    # With stale_while_revalidate an outdated value is returned at once and refreshed in the background
+    async def __read(self, intent: protocol.ZoneQuery, kind: str, zones: list[int] | None, max_age: float | None,
+                     stale_while_revalidate: bool):
+        zone = intent.get_zone()
+        module = intent.get_module()
+        if max_age is not None:
+            entry = self._module_state.get(zone, module, kind)
+            if entry is not None and entry.get_age() <= max_age:
+                return entry.get_value()
+            if entry is not None and stale_while_revalidate:
+                self.__revalidate(intent, kind, zones)
+                return entry.get_value()
+
+        return await self.__read_through(intent, kind, zones)
+
+    async def __read_through(self, intent: protocol.ZoneQuery, kind: str, zones: list[int] | None):
+        value = await self.__execute(intent, zones)
+        self._module_state.set(intent.get_zone(), intent.get_module(), kind, value)
+        return value
+
+    def __revalidate(self, intent: protocol.ZoneQuery, kind: str, zones: list[int] | None) -> None:
+        key = (intent.get_zone(), intent.get_module(), kind)
+        if key in self._revalidations:
+            return
+
+        with request_priority(Priority.BACKGROUND):
+            task = create_task(self.__read_through(intent, kind, zones))
+        self._revalidations[key] = task
+        task.add_done_callback(lambda done: self.__revalidated(key, done))
+
+    def __revalidated(self, key: tuple[int, int, str], task: Task) -> None:
+        del self._revalidations[key]
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.debug("Zone: %s, Module: %s. Could not refresh %s: %r", *key, task.exception())
+
+    # With write_debounce only the latest write of a setting within the window is sent. A zone write replaces the
+    # pending writes of the modules of the zone
+    async def __write(self, intent: protocol.ZoneCommand, zones: list[int] | None) -> None:
+        if self._write_coalescer is None:
+            return await self.__write_now(intent, zones)
+
+        zone = intent.get_zone()
+        module = intent.get_module()
+        setting = intent.get_setting()
+        supersedes = None
+        if module == -1:
+            supersedes = lambda key: key[0] == zone and key[2] == setting
+        return await self._write_coalescer.submit((zone, module, setting), lambda: self.__write_now(intent, zones),
+                                                  supersedes)
+
+    # A successful write updates the module state cache at once (every module of the zone for zone commands). After
+    # a failed write, e.g. ER,<module>, the state of the setting is unknown
+    async def __write_now(self, intent: protocol.ZoneCommand, zones: list[int] | None) -> None:
+        try:
+            result = await self.__execute(intent, zones)
+        except BaseException:
+            self.__invalidate_module_state(intent.get_zone(), intent.get_module(), intent.get_setting(), KIND_MODULE_DATA)
+            raise
+
+        self.__update_module_state(intent)
+        if self._verify_writes is not None:
+            self.__verify_later(intent, zones)
+        return result
+
+    def __update_module_state(self, intent: protocol.ZoneCommand) -> None:
+        zone = intent.get_zone()
+        module = intent.get_module()
+        setting = intent.get_setting()
+        value = intent.get_value()
+        if value is None:
+            self.__invalidate_module_state(zone, module, setting)
+            return
+
+        # The zone wide value is unknown after only one module changed
+        if module == -1:
+            self._module_state.update(zone, -1, setting, value)
+        else:
+            self._module_state.invalidate(zone=zone, module=-1, kind=setting)
+
+        for addressed_module in intent.get_addressed_modules():
+            self._module_state.update(zone, addressed_module, setting, value)
+
+    def __verify_later(self, intent: protocol.ZoneCommand, zones: list[int] | None) -> None:
+        setting = intent.get_setting()
+        for module in intent.get_addressed_modules():
+            with request_priority(Priority.BACKGROUND):
+                task = create_task(self.__verify(protocol.read_setting(setting, intent.get_zone(), module), setting,
+                                                 zones))
+            self._verifications.add(task)
+            task.add_done_callback(self._verifications.discard)
+
+    async def __verify(self, intent: protocol.ZoneQuery, setting: str, zones: list[int] | None) -> None:
+        await sleep(self._verify_writes)
+        try:
+            await self.__read_through(intent, setting, zones)
+        except Exception as exception:
+            _LOGGER.debug("Zone: %s, Module: %s. Could not verify %s: %r", intent.get_zone(), intent.get_module(),
+                          setting, exception)
+
+    # Sends the intent and decodes the response. Zone intents are resolved against the zones first
+    async def __execute(self, intent: protocol.Intent, zones: list[int] | None = None):
+        if isinstance(intent, protocol.ZoneIntent) and not intent.is_resolved():
+            intent.resolve(await self.__resolve_zones(zones))
+
+        command = intent.encode()
+        timeout = intent.get_timeout()
+        if self._coalesce_reads and intent.is_read():
+            # Only reads of the same lane share a request, an interactive read must not wait behind a poll
+            priority = get_request_priority()
+            key = (command, timeout, priority if priority is not None else Priority.INTERACTIVE_READ)
+            return await self._single_flight.run(key, lambda: self.__send(intent, command, timeout))
+        return await self.__send(intent, command, timeout)
+
+    async def __send(self, intent: protocol.Intent, command: bytes, timeout: int | None):
+        if timeout is None:
+            response = await self._gateway.send_request_get_response(command)
+        else:
+            response = await self._gateway.send_request_get_response(command, timeout)
+
+        return intent.decode(response)
+
+    async def __poll_module(self, cycle: PollCycle, zone: int, module: int, zones: list[int], extended: bool,
+                            date_time: GatewayDateTime | None, attempts: int) -> HomeAssistantModuleData | None:
+        _LOGGER.debug("Zone: %s, Module: %s. Request module data", zone, module)
+
+        device_identifier = INVALID_DEVICE_IDENTIFIER
+        module_data = None
+        for attempt in range(attempts):
+            cycle.add_round_trip()
+            module_data = await self.get_module_data(zone, module, zones)
+            device_identifier = module_data.get_device_identifier()
+            if device_identifier != INVALID_DEVICE_IDENTIFIER:
+                break
+
+        if device_identifier == INVALID_DEVICE_IDENTIFIER:
+            _LOGGER.warning("Could not uniquely identify module after %s attempts. Skip this module", attempts)
+            return None
+
+        _LOGGER.debug("Add module with Identifier: %s", device_identifier)
 
-    async def __get_zone_command_string(self, sub_command: str, zone: int, zones: list[int] | None, module: int = -1):
-        response = await self.__zone_command(sub_command, zone, zones, module)
+        anti_freeze_temperature = None
+        holiday_data = None
+        if extended:
+            settings_max_age = self._settings_max_age if cycle.is_unchanged() else 0.0
+
+            entry = self._module_state.get(zone, module, KIND_ANTI_FREEZE_TEMPERATURE, settings_max_age)
+            if entry is not None:
+                anti_freeze_temperature = entry.get_value()
+                cycle.add_saved_round_trip()
+            else:
+                cycle.add_round_trip()
+                anti_freeze_temperature = await self.get_module_anti_freeze_temperature(zone=zone, zones=zones, module=module)
+
+            entry = self._module_state.get(zone, module, KIND_HOLIDAY_DATA, settings_max_age)
+            if entry is not None:
+                holiday_data = entry.get_value()
+                cycle.add_saved_round_trip()
+            else:
+                cycle.add_round_trip()
+                holiday_data = await self.get_module_holiday_mode(zone=zone, zones=zones, module=module)
+
+        return HomeAssistantModuleData(
+            zone_id=zone,
+            module_id=module,
+            module_data=module_data,
+            anti_freeze_temperature=anti_freeze_temperature,
+            holiday_data=holiday_data,
+            date_time=date_time
+        )
+
+    # Sends a PING after too many timeouts in a row. A responding gateway means the modules are the problem
+    async def __is_gateway_alive(self, cycle: PollCycle) -> bool:
+        cycle.add_round_trip()
+        if await self.ping():
+            self._liveness.record_success()
+            return True
 
-        status = OKAY
-        response_identifier = f"{status},"
+        self._liveness.set_unavailable()
+        return False
+
+    # Last known data of all modules which were not read in the given poll
+    def __get_stale_modules(self, cycle: PollCycle) -> list[HomeAssistantModuleData]:
+        stale_modules = []
+        for device_identifier, home_assistant_module in self._last_modules.items():
+            if not cycle.has_device_identifier(device_identifier):
+                stale_modules.append(home_assistant_module.as_stale())
+
+        return stale_modules
+
+    # Zones or modules were added / removed. Modules might have moved, so the quarantine starts over as well
+    def __invalidate_topology(self) -> None:
+        self._topology.invalidate()
+        self._quarantine.clear()
+        self._last_modules.clear()
+
+    # A zone command changes every module of the zone. No kind drops every kind
+    def __invalidate_module_state(self, zone: int, module: int, *kinds: str | None) -> None:
+        for kind in kinds or (None,):
+            if module == -1:
+                self._module_state.invalidate(zone=zone, kind=kind)
+                continue
 
-        if not response.startswith(response_identifier):
-            raise InvalidResponse()
+            self._module_state.invalidate(zone=zone, module=module, kind=kind)
+            self._module_state.invalidate(zone=zone, module=-1, kind=kind)
 
-        return response.replace(response_identifier, "")
+    # Zones passed by the caller win, otherwise the cached topology is used
+    async def __resolve_zones(self, zones: list[int] | None) -> list[int]:
+        if zones is not None and len(zones) > 0:
+            return zones
 
-    async def __zone_command(self, sub_command: str, zone: int, zones: list[int] | None, module: int = -1):
-        if zones is None or len(zones) == 0:
+        zones = self._topology.get_zones()
+        if zones is None:
             zones = await self.get_zones_with_module_count()
-            await sleep(0.1)
-
-        check_if_zone_exists(zones, zone)
 
-        operation = "D"
-        target_module = zones[(zone - 1)]
-
-        # if module was not -1 we verify the requested module
-        if module != -1:
-            check_if_module_is_valid(target_module, module)
-            operation = "R"
-            target_module = module
-
-        command = f"{operation}#{zone}#{target_module}#0#0*{sub_command}/"
-        return await self._gateway.send_message_get_response(command)
+        return zones
 
 # Update Temperature etc.:
 # ER,2 = Communication error with one module (2 in this case)
@@ -0,0 +1,258 @@
+"""Protocol codec for the Python Thermotec AeroFlow® Library
+
+Encodes requests straight to bytes from precompiled templates and decodes the responses of the hot poll path
+(module data, temperature, holiday data) without building intermediate strings. The decoders accept the payload
+of a response (everything after "OK,") as bytes, memoryview or str.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+from sys import intern
+from .data_object import ModuleData, Temperature, HolidayData
+from .exception import InvalidResponse
+from .utils import (
+    CURRENT_TEMPERATURE,
+    FIELD_VALUES,
+    TEMPERATURE_FROM_INT,
+    TEMPERATURE_OFFSET_FROM_INT,
+    TWO_DIGITS,
+)
+
+OKAY_STATUS = b"OK"
+OPERATION_STATUS = b"OP"
+OPERATION_OK_STATUS = b"OPOK"
+OKAY_PREFIX = OKAY_STATUS + b","
+OPERATION_OK_PREFIX = OPERATION_OK_STATUS + b","
+
+ZONE_COMMAND = b"D#%d#%d#0#0*%b/"
+MODULE_COMMAND = b"R#%d#%d#0#0*%b/"
+OPERATION_COMMAND = b"%b/"
+
+GET_MODULE_DATA = b"?F"
+GET_TEMPERATURE = b"?T"
+GET_ANTI_FREEZE_TEMPERATURE = b"?E#1#20"
+GET_HOLIDAY_DATA = b"?RH"
+SET_TEMPERATURE = b"T%d"
+
+MODULE_DATA_NUMBERS = 15
+MODULE_DATA_TEXTS = 5
+HOLIDAY_DATA_FIELDS = 13
+
+
+# >>>>>>> Encoder <<<<<<< #
+
+# module -1 addresses all <target> modules of the zone (D#), otherwise the single module (R#)
+@lru_cache(maxsize=4096)
+def encode_zone_command(zone: int, target: int, sub_command: bytes, module: int = -1) -> bytes:
+    if module == -1:
+        return ZONE_COMMAND % (zone, target, sub_command)
+    return MODULE_COMMAND % (zone, module, sub_command)
+
+
+def encode_operation(operation: bytes) -> bytes:
+    return OPERATION_COMMAND % operation
+
+
+# >>>>>>> Decoder <<<<<<< #
+
+# Returns the payload after the status prefix, e.g. b"OK,1,2" -> b"1,2"
+def strip_status(response: bytes | memoryview, prefix: bytes = OKAY_PREFIX) -> bytes | memoryview:
+    if response[:len(prefix)] != prefix:
+        raise InvalidResponse()
+    return response[len(prefix):]
+
+
+def _split(payload: bytes | memoryview | str, numbers: int) -> list:
+    if isinstance(payload, str):
+        return payload.split(",", numbers)
+    if isinstance(payload, memoryview):
+        payload = payload.tobytes()
+    return payload.split(b",", numbers)
+
+
+# Every numeric field is a single byte on the gateway side, so the values are looked up in FIELD_VALUES which is
+# much cheaper than int(). Fields which are not in the table (e.g. with leading zeros) are parsed, but still have
+# to be a byte value
+def _parse_values(fields: list) -> tuple[int, ...]:
+    try:
+        values = tuple(int(field) for field in fields)
+    except ValueError:
+        raise InvalidResponse()
+
+    if min(values) < 0 or max(values) > 255:
+        raise InvalidResponse()
+    return values
+
+
+# GatewayResponse: OK,<current_temperature>,<current_temperature>,<target_temperature>
+def decode_temperature(payload: bytes | memoryview | str) -> Temperature:
+    fields = _split(payload, 3)[:3]
+    if len(fields) < 3:
+        raise InvalidResponse()
+
+    try:
+        main_value, second_value, target_temperature = map(FIELD_VALUES.__getitem__, fields)
+    except KeyError:
+        main_value, second_value, target_temperature = _parse_values(fields)
+
+    if second_value > 9:
+        raise InvalidResponse()
+
+    return Temperature.from_values(CURRENT_TEMPERATURE[main_value][second_value],
+                                   TEMPERATURE_FROM_INT[target_temperature])
+
+
+# GatewayResponse: OK,<15 numeric fields>,<id0>,<id1>,<id2>,<id3>,<firmware_version>
+def decode_module_data(payload: bytes | memoryview | str) -> ModuleData:
+    if isinstance(payload, memoryview):
+        payload = payload.tobytes()
+    text = str if isinstance(payload, str) else bytes.decode
+    fields = payload.split("," if text is str else b",")
+    if len(fields) < MODULE_DATA_NUMBERS + MODULE_DATA_TEXTS:
+        raise InvalidResponse()
+
+    # Field 6 and 14 are not used
+    try:
+        (main_value, second_value, target_temperature, hours, minutes, seconds, _, programing, programing2, boost,
+         temperature_offset, smart_start, window_open_detection, language, _) = map(FIELD_VALUES.__getitem__,
+                                                                                    fields[:MODULE_DATA_NUMBERS])
+    except KeyError:
+        (main_value, second_value, target_temperature, hours, minutes, seconds, programing, programing2, boost,
+         temperature_offset, smart_start, window_open_detection, language) = _parse_values(fields[:6] + fields[7:14])
+
+    if second_value > 9:
+        raise InvalidResponse()
+
+    return ModuleData.from_values(
+        CURRENT_TEMPERATURE[main_value][second_value],
+        TEMPERATURE_FROM_INT[target_temperature],
+        f"{TWO_DIGITS[hours]}:{TWO_DIGITS[minutes]}:{TWO_DIGITS[seconds]}",
+        programing,
+        programing2,
+        boost,
+        TEMPERATURE_OFFSET_FROM_INT[temperature_offset],
+        smart_start,
+        window_open_detection,
+        language,
+        (intern(text(fields[15])), intern(text(fields[16])), intern(text(fields[17])), intern(text(fields[18]))),
+        intern(text(fields[19])),
+    )
+
+
+class ModuleDataMemoStatistics:
+    _hits: int = 0
+    _misses: int = 0
+
+    def _record_hit(self) -> None:
+        self._hits += 1
+
+    def _record_miss(self) -> None:
+        self._misses += 1
+
+    def get_hits(self) -> int:
+        return self._hits
+
+    def get_misses(self) -> int:
+        return self._misses
+
+
+class ModuleDataMemo:
+    """Bounded LRU from raw module data payloads to the decoded ModuleData
+
+    The clock of the module is part of the payload and ticks from one poll to the next, so it is left out of the key.
+    A payload which only differs in the clock reuses the decoded values, only the time is decoded again. An identical
+    payload returns the same (not to be modified) ModuleData object.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self._maxsize = maxsize
+        self._entries: OrderedDict[tuple, ModuleData] = OrderedDict()
+        self._statistics = ModuleDataMemoStatistics()
+
+    def get_statistics(self) -> ModuleDataMemoStatistics:
+        return self._statistics
+
+    def get_size(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def decode(self, payload: bytes | memoryview | str) -> ModuleData:
+        if isinstance(payload, memoryview):
+            payload = payload.tobytes()
+
+        # current temperature (2 fields), target temperature | hours, minutes, seconds | everything else
+        fields = payload.split(b"," if isinstance(payload, bytes) else ",", 6)
+        if len(fields) < 7:
+            return decode_module_data(payload)
+
+        key = (fields[0], fields[1], fields[2], fields[6])
+        module_data = self._entries.get(key)
+        if module_data is None:
+            self._statistics._record_miss()
+            module_data = decode_module_data(payload)
+            self._entries[key] = module_data
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+            return module_data
+
+        self._statistics._record_hit()
+        self._entries.move_to_end(key)
+        time = _decode_clock(fields[3], fields[4], fields[5])
+        if time != module_data.get_time():
+            module_data = module_data.with_time(time)
+            self._entries[key] = module_data
+        return module_data
+
+
+def _decode_clock(hours, minutes, seconds) -> str:
+    try:
+        hours, minutes, seconds = FIELD_VALUES[hours], FIELD_VALUES[minutes], FIELD_VALUES[seconds]
+    except KeyError:
+        hours, minutes, seconds = _parse_values([hours, minutes, seconds])
+    return f"{TWO_DIGITS[hours]}:{TWO_DIGITS[minutes]}:{TWO_DIGITS[seconds]}"
+
+
+# Shared by all clients of the process, the payload contains the device identifier of the module
+MODULE_DATA_MEMO = ModuleDataMemo()
+
+
+# GatewayResponse: OK,RH,<12 fields of holiday data>
+def decode_holiday_data(payload: bytes | memoryview | str) -> HolidayData:
+    fields = _split(payload, HOLIDAY_DATA_FIELDS)
+    if len(fields) < HOLIDAY_DATA_FIELDS:
+        raise InvalidResponse()
+
+    numbers = fields[1:7] + fields[9:13]
+    try:
+        values = tuple(map(FIELD_VALUES.__getitem__, numbers))
+    except KeyError:
+        values = _parse_values(numbers)
+
+    (main_value, second_value, target_temperature, hours, minutes, seconds, days, end_hours, end_minutes,
+     after_holiday_temperature) = values
+    if second_value > 9:
+        raise InvalidResponse()
+
+    return HolidayData.from_values(
+        CURRENT_TEMPERATURE[main_value][second_value],
+        TEMPERATURE_FROM_INT[target_temperature],
+        f"{TWO_DIGITS[hours]}:{TWO_DIGITS[minutes]}:{TWO_DIGITS[seconds]}",
+        days,
+        intern(f"{TWO_DIGITS[end_hours]}:{TWO_DIGITS[end_minutes]}"),
+        TEMPERATURE_FROM_INT[after_holiday_temperature],
+    )
+
+
+# GatewayResponse: OK,<anti_freeze_temperature>. 255 = never set, the heater uses 5°C
+def decode_anti_freeze_temperature(payload: bytes | memoryview | str) -> float:
+    if isinstance(payload, memoryview):
+        payload = payload.tobytes()
+
+    value = FIELD_VALUES.get(payload)
+    if value is None:
+        value = _parse_values([payload])[0]
+    if value == 255:
+        return 5.0
+
+    return float(value)
@@ -1,56 +1,122 @@
 """Communication module for the Python Thermotec AeroFlow® Library"""
-from random import randint
 from asyncio import wait_for, exceptions, sleep
-from asyncio_dgram import connect
+from time import monotonic
+from .const import ERROR
 from .exception import RequestTimeout
+from .metrics import GatewayMetrics, CommandMetrics, get_command_family, FAMILY_ZONE_WRITE, FAMILY_MODULE_WRITE
+from .pacing import PacingPolicy, AdaptivePacing
+from .scheduler import RequestScheduler, SchedulerStatistics, Priority, get_request_priority
+from .transport import Transport, UdpTransport
 
+UNEXPECTED_ERROR = "UNEXPECTED_ERROR"
+ERROR_PREFIX = ERROR.encode()
+WRITE_FAMILIES = (FAMILY_ZONE_WRITE, FAMILY_MODULE_WRITE)
 
-class FlexiSmartGateway:
-    _running: bool = False
 
-    def __init__(self, host: str, port: int):
+class FlexiSmartGateway:
+    # transport: defaults to a UdpTransport to host:port
+    def __init__(self, host: str, port: int, pacing: PacingPolicy | None = None, transport: Transport | None = None):
         self._host = host
         self._port = port
+        self._transport = transport if transport is not None else UdpTransport(host, port)
+        self._scheduler = RequestScheduler()
+        self._pacing = pacing if pacing is not None else AdaptivePacing()
+        self._last_response_at: float | None = None
+        self._metrics = GatewayMetrics()
 
-    async def __send_message_get_response(self, message: str):
-        # Create a client for the gateway
-        client = await connect((self._host, self._port))
-        try:
-            # Send the encoded string to the desired gateway
-            await client.send(str.encode(message))
-            # (Hopefully) Get the response message from the gateway
-            data, remote_addr = await client.recv()
-            # Close socket manually after call to free the resources
-            client.close()
-            # Extract the message from the response and remove the null value at the end of the message
-            response_message = data.rstrip(b'\x00')
-            # Decode the message to a string and return
-            return response_message.decode()
-        except Exception:
-            client.close()
-            raise
+    def get_metrics(self) -> GatewayMetrics:
+        return self._metrics
+
+    def get_pacing(self) -> PacingPolicy:
+        return self._pacing
+
+    # All requests or only the ones of one priority lane
+    def get_scheduler_statistics(self, priority: Priority | None = None) -> SchedulerStatistics:
+        if priority is None:
+            return self._scheduler.get_statistics()
+        return self._scheduler.get_lane_statistics(priority)
+
+    def get_transport(self) -> Transport:
+        return self._transport
+
+    def is_open(self) -> bool:
+        return self._transport.is_open()
+
+    async def open(self) -> None:
+        await self._transport.open()
+
+    async def close(self) -> None:
+        self._discard_stream()
+
+    def _discard_stream(self) -> None:
+        # Dropping the connection also drops any late response of a previous request, so it can not be
+        # mistaken for the response of the next one. The next request reconnects transparently.
+        self._transport.close()
+
+    async def __send_request_get_response(self, request: bytes, command_metrics: CommandMetrics) -> bytes:
+        transport = self._transport
+        # Send the encoded request to the desired gateway
+        sent_at = monotonic()
+        await transport.send(request)
+        command_metrics._record_sent(len(request))
+        # (Hopefully) Get the response message from the gateway
+        data = await transport.recv()
+        command_metrics._record_received(len(data), monotonic() - sent_at)
+        # Extract the message from the response and remove the null value at the end of the message
+        return data.rstrip(b'\x00')
+
+    async def __wait_for_gateway(self) -> None:
+        if self._last_response_at is None:
+            return
+
+        # Only wait for the part of the gap which has not already passed since the last response
+        delay = self._pacing.get_delay() - (monotonic() - self._last_response_at)
+        if delay > 0:
+            self._pacing._record_delay(delay)
+            await sleep(delay)
 
     async def send_message_get_response(self, message: str, timeout: int = 3):
-        task = self.__send_message_get_response(message)
+        response = await self.send_request_get_response(str.encode(message), timeout)
         try:
-            force_execution_max_count = 30
-            execution_attempt = 0
-            while self._running:
-                execution_attempt += 1
-                if execution_attempt > force_execution_max_count:
-                    break
-                wait_time = (randint(1, 5) / 10)
-                await sleep(wait_time)
-
-            self._running = True
-            await sleep(0.1)
-            response = await wait_for(task, timeout)
-            # print("Message: {}, Response: {}".format(message, response))
-            self._running = False
+            return response.decode()
+        except UnicodeDecodeError:
+            return UNEXPECTED_ERROR
+
+    # Same as send_message_get_response, but without the str round trip (see codec.py)
+    async def send_request_get_response(self, request: bytes, timeout: int = 3) -> bytes:
+        family = get_command_family(request)
+        command_metrics = self._metrics.get_command_metrics(family)
+        # Writes go first unless the caller chose a lane (see request_priority)
+        priority = get_request_priority()
+        if priority is None:
+            priority = Priority.INTERACTIVE_WRITE if family in WRITE_FAMILIES else Priority.INTERACTIVE_READ
+
+        enqueued_at = monotonic()
+        # The gateway can only handle one request at a time, wait for our turn
+        async with self._scheduler.slot(priority):
+            dispatched_at = monotonic()
+            await self.__wait_for_gateway()
+            sent_at = monotonic()
+            command_metrics._record_dispatch(dispatched_at - enqueued_at, sent_at - dispatched_at)
+            try:
+                response = await wait_for(self.__send_request_get_response(request, command_metrics), timeout)
+            except exceptions.TimeoutError:
+                self._discard_stream()
+                self._pacing.record_timeout()
+                command_metrics._record_timeout()
+                raise RequestTimeout()
+            except Exception:
+                self._discard_stream()
+                self._pacing.record_error()
+                command_metrics._record_unexpected_error()
+                return UNEXPECTED_ERROR.encode()
+            finally:
+                self._last_response_at = monotonic()
+
+            if response.startswith(ERROR_PREFIX):
+                self._pacing.record_error()
+                command_metrics._record_error_response()
+            else:
+                self._pacing.record_response(self._last_response_at - sent_at)
+
             return response
-        except exceptions.TimeoutError:
-            self._running = False
-            raise RequestTimeout()
-        except Exception:
-            self._running = False
-            return "UNEXPECTED_ERROR"
@@ -2,3 +2,4 @@
 OPERATION = "OP"
 OPERATION_OK = "OPOK"
 OKAY = "OK"
+ERROR = "ER"
@@ -0,0 +1,214 @@
+"""Polling coordinator for the Python Thermotec AeroFlow® Library"""
+import logging
+from asyncio import CancelledError, Task, create_task, sleep
+from collections.abc import AsyncIterator, Callable, Iterable
+from time import monotonic
+
+from .client import Client
+from .data_object import GatewayData, GatewayDateTime, GatewayNetworkConfiguration, HomeAssistantModuleData
+from .events import ChangeEvent, ChangeNotifier
+from .exception import InvalidResponse, RequestTimeout
+from .scheduler import Priority, request_priority
+from .snapshot import FleetSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollingCoordinator:
+    """Keeps the data of the gateway and all modules current in the background
+
+    Every kind of data is refreshed in its own tier:
+    - fast: the module data (temperatures, boost, ...) is polled every module_interval
+    - slow: anti-freeze, holiday and the gateway date / time are read again after settings_interval. In between they
+      are served from the module state cache of the client, which its own writes keep current
+    - very slow: firmware and network configuration are read again after gateway_interval
+
+    All requests run with background priority, so callers of the client are served first. The getters only return
+    the data of the last refresh and never talk to the gateway.
+    """
+
+    # module_interval: seconds between two polls of the module data
+    # settings_interval: seconds anti-freeze, holiday and the gateway date / time are reused
+    # gateway_interval: seconds firmware and network configuration are reused
+    # zones: zones with their module count, passed to the client. None uses its cached topology
+    def __init__(
+            self,
+            client: Client,
+            module_interval: float = 30.0,
+            settings_interval: float = 900.0,
+            gateway_interval: float = 86400.0,
+            zones: list[int] | None = None
+    ):
+        self._client = client
+        self._module_interval = module_interval
+        self._settings_interval = settings_interval
+        self._gateway_interval = gateway_interval
+        self._zones = zones
+        self._task: Task | None = None
+        self._snapshot = FleetSnapshot()
+        self._notifier = ChangeNotifier()
+        self._date_time: GatewayDateTime | None = None
+        self._date_time_refreshed_at: float | None = None
+        self._gateway_data: GatewayData | None = None
+        self._network_configuration: GatewayNetworkConfiguration | None = None
+        self._gateway_refreshed_at: float | None = None
+        self._refreshed_at: float | None = None
+
+    async def __aenter__(self) -> "PollingCoordinator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.stop()
+
+    # Refreshes all tiers once, so the getters have data when it returns, and keeps refreshing them in the background
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+
+        await self.refresh()
+        self._task = create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except CancelledError:
+            pass
+        self._task = None
+
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    # >>>>>>> Snapshot <<<<<<< #
+    # Data of all modules of the last refresh. Unchanged modules are shared with the snapshot before
+    def get_snapshot(self) -> FleetSnapshot:
+        return self._snapshot
+
+    # Data of all modules of the last refresh by device identifier
+    def get_modules(self) -> dict[str, HomeAssistantModuleData]:
+        return dict(self._snapshot.get_modules())
+
+    def get_module(self, device_identifier: str) -> HomeAssistantModuleData | None:
+        return self._snapshot.get_module(device_identifier)
+
+    # Calls the callback with the changes between two refreshes, see Client.subscribe
+    def subscribe(self, callback: Callable[[ChangeEvent], None], zone: int | None = None, module: int | None = None,
+                  fields: Iterable[str] | None = None) -> Callable[[], None]:
+        return self._notifier.subscribe(callback, zone, module, fields)
+
+    # Same as subscribe, as async iterator
+    def events(self, zone: int | None = None, module: int | None = None,
+               fields: Iterable[str] | None = None) -> AsyncIterator[ChangeEvent]:
+        return self._notifier.events(zone, module, fields)
+
+    def get_date_time(self) -> GatewayDateTime | None:
+        return self._date_time
+
+    def get_gateway_data(self) -> GatewayData | None:
+        return self._gateway_data
+
+    def get_network_configuration(self) -> GatewayNetworkConfiguration | None:
+        return self._network_configuration
+
+    # Seconds since the last refresh finished, None before the first one
+    def get_age(self) -> float | None:
+        if self._refreshed_at is None:
+            return None
+
+        return monotonic() - self._refreshed_at
+
+    # >>>>>>> Refresh <<<<<<< #
+    # Refreshes the module data and every tier which is due
+    async def refresh(self) -> None:
+        if self.__is_due(self._gateway_refreshed_at, self._gateway_interval):
+            await self.__refresh_gateway()
+
+        if self.__is_due(self._date_time_refreshed_at, self._settings_interval):
+            await self.__refresh_date_time()
+
+        modules = {}
+        async for home_assistant_module in self._client.iter_all_data(self._zones, extended=False):
+            device_identifier = home_assistant_module.get_module_data().get_device_identifier()
+            if home_assistant_module.is_stale():
+                # The poll was aborted. The client does not know the settings of its last poll, the coordinator does
+                last_module = self._snapshot.get_module(device_identifier)
+                modules[device_identifier] = last_module.as_stale() if last_module is not None else home_assistant_module
+                continue
+
+            modules[device_identifier] = await self.__with_settings(home_assistant_module)
+
+        snapshot = self._snapshot
+        self._snapshot = snapshot.with_modules(modules)
+        self._refreshed_at = monotonic()
+        self._notifier.publish(snapshot, self._snapshot)
+
+    async def _run(self) -> None:
+        while True:
+            await sleep(max(0.0, self._module_interval - self.get_age()))
+            try:
+                await self.refresh()
+            except CancelledError:
+                raise
+            except Exception:
+                _LOGGER.exception("Refresh failed. Keep the last known data")
+                self._refreshed_at = monotonic()
+
+    async def __refresh_gateway(self) -> None:
+        try:
+            with request_priority(Priority.BACKGROUND):
+                gateway_data = await self._client.get_gateway_data()
+            with request_priority(Priority.BACKGROUND):
+                network_configuration = await self._client.get_network_configuration()
+        except (RequestTimeout, InvalidResponse) as exception:
+            _LOGGER.warning("Could not refresh firmware and network configuration: %r", exception)
+            return
+
+        self._gateway_data = gateway_data
+        self._network_configuration = network_configuration
+        self._gateway_refreshed_at = monotonic()
+
+    async def __refresh_date_time(self) -> None:
+        try:
+            with request_priority(Priority.BACKGROUND):
+                self._date_time = await self._client.get_date_time()
+        except (RequestTimeout, InvalidResponse) as exception:
+            _LOGGER.warning("Could not refresh the gateway date / time: %r", exception)
+            return
+
+        self._date_time_refreshed_at = monotonic()
+
+    # Adds anti-freeze and holiday data. Both are only read if the cached values are older than settings_interval.
+    # If they cannot be read, the last known values are kept
+    async def __with_settings(self, home_assistant_module: HomeAssistantModuleData) -> HomeAssistantModuleData:
+        zone = home_assistant_module.get_zone_id()
+        module = home_assistant_module.get_module_id()
+        last_module = self._snapshot.get_module(home_assistant_module.get_module_data().get_device_identifier())
+
+        anti_freeze_temperature = last_module.get_anti_freeze_temperature() if last_module is not None else None
+        holiday_data = last_module.get_holiday_data() if last_module is not None else None
+        try:
+            with request_priority(Priority.BACKGROUND):
+                anti_freeze_temperature = await self._client.get_module_anti_freeze_temperature(
+                    zone, module, self._zones, max_age=self._settings_interval)
+            with request_priority(Priority.BACKGROUND):
+                holiday_data = await self._client.get_module_holiday_mode(zone, module, self._zones,
+                                                                          max_age=self._settings_interval)
+        except (RequestTimeout, InvalidResponse) as exception:
+            _LOGGER.debug("Zone: %s, Module: %s. Could not refresh settings: %r", zone, module, exception)
+
+        return HomeAssistantModuleData(
+            zone_id=zone,
+            module_id=module,
+            module_data=home_assistant_module.get_module_data(),
+            anti_freeze_temperature=anti_freeze_temperature,
+            holiday_data=holiday_data,
+            date_time=self._date_time
+        )
+
+    @staticmethod
+    def __is_due(refreshed_at: float | None, interval: float) -> bool:
+        return refreshed_at is None or monotonic() - refreshed_at >= interval
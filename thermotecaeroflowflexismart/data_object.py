@@ -1,10 +1,16 @@
 """Data Objects for the Python Thermotec AeroFlow® Library"""
 from __future__ import annotations
 
+from copy import copy
+from sys import intern
+
 from .utils import create_current_temperature, calculate_temperature_from_int, calculate_temperature_offset_from_int
 
 
 class HomeAssistantModuleData:
+    __slots__ = ("_zone_id", "_module_id", "_module_data", "_anti_freeze_temperature", "_holiday_data", "_date_time",
+                 "_stale")
+
     def __init__(
             self,
             zone_id: int,
@@ -12,7 +18,8 @@ class HomeAssistantModuleData:
             module_data: ModuleData,
             anti_freeze_temperature: float | None,
             holiday_data: HolidayData | None,
-            date_time: GatewayDateTime | None
+            date_time: GatewayDateTime | None,
+            stale: bool = False
     ):
         self._zone_id = zone_id
         self._module_id = module_id
@@ -20,6 +27,7 @@ class HomeAssistantModuleData:
         self._anti_freeze_temperature = anti_freeze_temperature
         self._holiday_data = holiday_data
         self._date_time = date_time
+        self._stale = stale
 
     def get_module_id(self) -> int:
         return self._module_id
@@ -39,14 +47,40 @@ class HomeAssistantModuleData:
     def get_date_time(self) -> GatewayDateTime | None:
         return self._date_time
 
+    # True if the data was not read in the current poll (e.g. the gateway was unavailable)
+    def is_stale(self) -> bool:
+        return self._stale
+
+    def as_stale(self) -> HomeAssistantModuleData:
+        return HomeAssistantModuleData(
+            zone_id=self._zone_id,
+            module_id=self._module_id,
+            module_data=self._module_data,
+            anti_freeze_temperature=self._anti_freeze_temperature,
+            holiday_data=self._holiday_data,
+            date_time=self._date_time,
+            stale=True
+        )
+
 
 class Temperature:
-    _current_temperature: float = 0.0
-    _target_temperature: float = 0.0
+    __slots__ = ("_current_temperature", "_target_temperature")
 
     def __init__(self, data):
         self._set_data_from_array(data)
 
+    # Creates the object from already converted values (used by the codec)
+    @classmethod
+    def from_values(cls, current_temperature: float, target_temperature: float) -> Temperature:
+        temperature = cls.__new__(cls)
+        temperature._current_temperature = current_temperature
+        temperature._target_temperature = target_temperature
+        return temperature
+
+    # Copy with a new target temperature, e.g. after the client wrote it
+    def with_target_temperature(self, target_temperature: float) -> Temperature:
+        return Temperature.from_values(self._current_temperature, target_temperature)
+
     def _set_data_from_array(self, data):
         self._current_temperature = create_current_temperature(int(data[0]), int(data[1]))
         self._target_temperature = calculate_temperature_from_int(int(data[2]))
@@ -59,17 +93,15 @@ class Temperature:
 
 
 class GatewayData:
-    _firmware = "undefined"
-    _installation_id = "undefined"
-    _idu = "undefined"
+    __slots__ = ("_firmware", "_installation_id", "_idu")
 
     def __init__(self, data):
         self._set_data_from_array(data)
 
     def _set_data_from_array(self, data):
-        self._firmware = data[0]
-        self._installation_id = data[1]
-        self._idu = data[2]
+        self._firmware = intern(data[0])
+        self._installation_id = intern(data[1])
+        self._idu = intern(data[2])
 
     def get_firmware(self):
         return self._firmware
@@ -82,12 +114,7 @@ class GatewayData:
 
 
 class GatewayNetworkConfiguration:
-    _ip: str = "0.0.0.0"
-    _port: int = -1
-    _gateway: str = "0.0.0.0"
-    _subnet_mask: str = "0.0.0.0"
-    _registration_server_ip: str = "0.0.0.0"
-    _registration_server_port: int = -1
+    __slots__ = ("_ip", "_port", "_gateway", "_subnet_mask", "_registration_server_ip", "_registration_server_port")
 
     def __init__(self, data):
         self._set_data_from_array(data)
@@ -126,12 +153,7 @@ class GatewayNetworkConfiguration:
 
 
 class GatewayDateTime:
-    _time: str = "00:00:00"
-    _date: str = "00.00.0000"
-    # _day_of_week: int = -1
-    # _online: bool = False
-    _ip: str = "undefined"
-    _id: str = "00000"
+    __slots__ = ("_time", "_date", "_ip", "_id")
 
     def __init__(self, data):
         self._set_data_from_array(data)
@@ -161,22 +183,31 @@ class GatewayDateTime:
 
 
 class HolidayData:
-    _current_temperature: float = 0.0
-    _target_temperature: float = 0.0
-    _time: str = "00:00:00"
-    _days: int = -1
-    _end_time: str = "00:00"
-    _after_holiday_temperature: float = 0.0
+    __slots__ = ("_current_temperature", "_target_temperature", "_time", "_days", "_end_time",
+                 "_after_holiday_temperature")
 
     def __init__(self, data):
         self._set_data_from_array(data)
 
+    # Creates the object from already converted values (used by the codec)
+    @classmethod
+    def from_values(cls, current_temperature: float, target_temperature: float, time: str, days: int, end_time: str,
+                    after_holiday_temperature: float) -> HolidayData:
+        holiday_data = cls.__new__(cls)
+        holiday_data._current_temperature = current_temperature
+        holiday_data._target_temperature = target_temperature
+        holiday_data._time = time
+        holiday_data._days = days
+        holiday_data._end_time = end_time
+        holiday_data._after_holiday_temperature = after_holiday_temperature
+        return holiday_data
+
     def _set_data_from_array(self, data) -> None:
         self._current_temperature = create_current_temperature(int(data[1]), int(data[2]))
         self._target_temperature = calculate_temperature_from_int(int(data[3]))
         self._time = f"{data[4].zfill(2)}:{data[5].zfill(2)}:{data[6].zfill(2)}"
         self._days = int(data[9])
-        self._end_time = f"{data[10].zfill(2)}:{data[11].zfill(2)}"
+        self._end_time = intern(f"{data[10].zfill(2)}:{data[11].zfill(2)}")
         self._after_holiday_temperature = calculate_temperature_from_int(int(data[12]))
 
     def get_current_temperature(self) -> float:
@@ -205,25 +236,56 @@ class HolidayData:
 
 
 class ModuleData:
-    _current_temperature: float = 0.0
-    _target_temperature: float = 0.0
-    _time: str = "00:00:00"
-    _programing: int = 0
-    _programing2: int = 0
-    _boost: int = 0
-    _temperature_offset: float = 0.0
-    _smart_start: int = 0
-    _window_open_detection: int = 0
-    _language: int = 0
-    _id0 = "undefined"
-    _id1 = "undefined"
-    _id2 = "undefined"
-    _id3 = "undefined"
-    _fw_version: str = "undefined"
+    __slots__ = ("_current_temperature", "_target_temperature", "_time", "_programing", "_programing2", "_boost",
+                 "_temperature_offset", "_smart_start", "_window_open_detection", "_language", "_id0", "_id1", "_id2",
+                 "_id3", "_fw_version")
 
     def __init__(self, data):
         self._set_data_from_array(data)
 
+    # Creates the object from already converted values (used by the codec)
+    @classmethod
+    def from_values(cls, current_temperature: float, target_temperature: float, time: str, programing: int,
+                    programing2: int, boost: int, temperature_offset: float, smart_start: int,
+                    window_open_detection: int, language: int, device_identifier: tuple[str, str, str, str],
+                    fw_version: str) -> ModuleData:
+        module_data = cls.__new__(cls)
+        module_data._current_temperature = current_temperature
+        module_data._target_temperature = target_temperature
+        module_data._time = time
+        module_data._programing = programing
+        module_data._programing2 = programing2
+        module_data._boost = boost
+        module_data._temperature_offset = temperature_offset
+        module_data._smart_start = smart_start
+        module_data._window_open_detection = window_open_detection
+        module_data._language = language
+        module_data._id0, module_data._id1, module_data._id2, module_data._id3 = device_identifier
+        module_data._fw_version = fw_version
+        return module_data
+
+    # Copy with some settings changed, e.g. after the client wrote them
+    def with_settings(self, target_temperature: float | None = None, temperature_offset: float | None = None,
+                      smart_start: bool | None = None, window_open_detection: bool | None = None) -> ModuleData:
+        module_data = copy(self)
+        if target_temperature is not None:
+            module_data._target_temperature = target_temperature
+        if temperature_offset is not None:
+            module_data._temperature_offset = temperature_offset
+        if smart_start is not None:
+            module_data._smart_start = int(smart_start)
+        if window_open_detection is not None:
+            module_data._window_open_detection = int(window_open_detection)
+        return module_data
+
+    # Copy with another module clock, e.g. for a response which only differs in the time. Runs for every poll of an
+    # unchanged module, from_values is much cheaper than copy()
+    def with_time(self, time: str) -> ModuleData:
+        return ModuleData.from_values(self._current_temperature, self._target_temperature, time, self._programing,
+                                      self._programing2, self._boost, self._temperature_offset, self._smart_start,
+                                      self._window_open_detection, self._language,
+                                      (self._id0, self._id1, self._id2, self._id3), self._fw_version)
+
     def _set_data_from_array(self, data):
         self._current_temperature = create_current_temperature(int(data[0]), int(data[1]))
         self._target_temperature = calculate_temperature_from_int(int(data[2]))
@@ -235,11 +297,11 @@ class ModuleData:
         self._smart_start = int(data[11])
         self._window_open_detection = int(data[12])
         self._language = int(data[13])  # 128 English, 129 German
-        self._id0 = data[15]
-        self._id1 = data[16]
-        self._id2 = data[17]
-        self._id3 = data[18]
-        self._fw_version = data[19]
+        self._id0 = intern(data[15])
+        self._id1 = intern(data[16])
+        self._id2 = intern(data[17])
+        self._id3 = intern(data[18])
+        self._fw_version = intern(data[19])
 
     def get_current_temperature(self) -> float:
         return self._current_temperature
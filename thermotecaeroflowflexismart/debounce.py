@@ -0,0 +1,112 @@
+"""Write debouncing for the Python Thermotec AeroFlow® Library"""
+from asyncio import CancelledError, Future, Task, create_task, get_running_loop, sleep
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class WriteCoalescerStatistics:
+    _writes: int = 0
+    _sent: int = 0
+    _superseded: int = 0
+
+    def _record_write(self) -> None:
+        self._writes += 1
+
+    def _record_sent(self) -> None:
+        self._sent += 1
+
+    def _record_superseded(self) -> None:
+        self._superseded += 1
+
+    def get_writes(self) -> int:
+        return self._writes
+
+    def get_sent(self) -> int:
+        return self._sent
+
+    # Writes which were replaced by a later write before they were sent
+    def get_superseded(self) -> int:
+        return self._superseded
+
+
+class _PendingWrite:
+    def __init__(self):
+        self.function: Callable[[], Awaitable] | None = None
+        self.waiters: list[Future] = []
+        self.task: Task | None = None
+
+
+class WriteCoalescer:
+    """Collects writes with the same key for a debounce window and only sends the latest one
+
+    The window starts with the first pending write of a key, so a steady stream of writes (e.g. a thermostat slider)
+    is sent at least once per window. Every caller of a superseded write gets the result (or exception) of the write
+    which was sent in the end. A write submitted while the previous one is on the way starts a new window.
+    """
+
+    def __init__(self, delay: float):
+        self._delay = delay
+        self._pending: dict[Hashable, _PendingWrite] = {}
+        self._statistics = WriteCoalescerStatistics()
+
+    def get_statistics(self) -> WriteCoalescerStatistics:
+        return self._statistics
+
+    def get_pending(self) -> int:
+        return len(self._pending)
+
+    # supersedes: pending writes of other keys which the write replaces as well (e.g. a zone write replaces the
+    # pending writes of the modules of the zone)
+    async def submit(self, key: Hashable, function: Callable[[], Awaitable],
+                     supersedes: Callable[[Hashable], bool] | None = None):
+        self._statistics._record_write()
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = _PendingWrite()
+            self._pending[key] = pending
+            pending.task = create_task(self._flush(key, pending))
+        else:
+            self._statistics._record_superseded()
+        pending.function = function
+
+        if supersedes is not None:
+            for other_key in [other_key for other_key in self._pending if other_key != key and supersedes(other_key)]:
+                other = self._pending.pop(other_key)
+                other.task.cancel()
+                pending.waiters.extend(other.waiters)
+                self._statistics._record_superseded()
+
+        waiter = get_running_loop().create_future()
+        pending.waiters.append(waiter)
+        return await waiter
+
+    # Cancels every pending write, the callers get a CancelledError
+    def cancel(self) -> None:
+        for pending in self._pending.values():
+            pending.task.cancel()
+            for waiter in pending.waiters:
+                waiter.cancel()
+        self._pending.clear()
+
+    async def _flush(self, key: Hashable, pending: _PendingWrite) -> None:
+        try:
+            await sleep(self._delay)
+        except CancelledError:
+            return
+
+        del self._pending[key]
+        self._statistics._record_sent()
+        try:
+            result = await pending.function()
+        except CancelledError:
+            for waiter in pending.waiters:
+                waiter.cancel()
+            raise
+        except Exception as exception:
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    waiter.set_exception(exception)
+            return
+
+        for waiter in pending.waiters:
+            if not waiter.done():
+                waiter.set_result(result)
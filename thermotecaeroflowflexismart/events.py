@@ -0,0 +1,139 @@
+"""Change events for the Python Thermotec AeroFlow® Library"""
+import logging
+from asyncio import Queue
+from collections.abc import AsyncIterator, Callable, Iterable
+
+from .snapshot import FleetSnapshot, MODULE_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fields of the events of modules which appeared in or disappeared from a poll. Every other event has the name of the
+# changed field, see MODULE_FIELDS (e.g. boost_active for the start / end of a boost)
+FIELD_MODULE_ADDED = "module_added"
+FIELD_MODULE_REMOVED = "module_removed"
+
+
+class ChangeEvent:
+    def __init__(self, device_identifier: str, zone_id: int, module_id: int, field: str, old_value, new_value):
+        self._device_identifier = device_identifier
+        self._zone_id = zone_id
+        self._module_id = module_id
+        self._field = field
+        self._old_value = old_value
+        self._new_value = new_value
+
+    def get_device_identifier(self) -> str:
+        return self._device_identifier
+
+    def get_zone_id(self) -> int:
+        return self._zone_id
+
+    def get_module_id(self) -> int:
+        return self._module_id
+
+    def get_field(self) -> str:
+        return self._field
+
+    # Value of the older poll. The module data for module_removed
+    def get_old_value(self):
+        return self._old_value
+
+    # Value of the newer poll. The module data for module_added
+    def get_new_value(self):
+        return self._new_value
+
+    def __repr__(self) -> str:
+        return (f"ChangeEvent({self._device_identifier}, zone={self._zone_id}, module={self._module_id}, "
+                f"{self._field}: {self._old_value!r} -> {self._new_value!r})")
+
+
+class _Subscription:
+    def __init__(self, callback: Callable[[ChangeEvent], None], zone: int | None, module: int | None,
+                 fields: Iterable[str] | None):
+        self.callback = callback
+        self.zone = zone
+        self.module = module
+        self.fields = frozenset(fields) if fields is not None else None
+
+    def matches(self, event: ChangeEvent) -> bool:
+        return ((self.zone is None or self.zone == event.get_zone_id())
+                and (self.module is None or self.module == event.get_module_id())
+                and (self.fields is None or event.get_field() in self.fields))
+
+
+class ChangeNotifier:
+    """Turns consecutive snapshots into change events for its subscribers
+
+    The snapshots are only compared if somebody subscribed. Modules which did not change are shared between two
+    snapshots, so comparing them costs an identity check.
+    """
+
+    def __init__(self):
+        self._subscriptions: list[_Subscription] = []
+
+    def get_subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    # zone, module and fields filter the events, None matches all. Returns a function which ends the subscription
+    def subscribe(self, callback: Callable[[ChangeEvent], None], zone: int | None = None, module: int | None = None,
+                  fields: Iterable[str] | None = None) -> Callable[[], None]:
+        for field in fields or ():
+            if field not in MODULE_FIELDS and field not in (FIELD_MODULE_ADDED, FIELD_MODULE_REMOVED):
+                raise ValueError(f"Unknown field: {field}")
+
+        subscription = _Subscription(callback, zone, module, fields)
+        self._subscriptions.append(subscription)
+
+        def unsubscribe() -> None:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+        return unsubscribe
+
+    # Same as subscribe, as async iterator. The subscription starts with the first iteration and ends with the loop
+    async def events(self, zone: int | None = None, module: int | None = None,
+                     fields: Iterable[str] | None = None) -> AsyncIterator[ChangeEvent]:
+        queue: Queue[ChangeEvent] = Queue()
+        unsubscribe = self.subscribe(queue.put_nowait, zone, module, fields)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            unsubscribe()
+
+    def publish(self, old: FleetSnapshot, new: FleetSnapshot) -> None:
+        if not self._subscriptions or old is new:
+            return
+
+        for event in self.__create_events(old, new):
+            for subscription in list(self._subscriptions):
+                if not subscription.matches(event):
+                    continue
+                try:
+                    subscription.callback(event)
+                except Exception:
+                    _LOGGER.exception("Subscriber failed on %r", event)
+
+    @staticmethod
+    def __create_events(old: FleetSnapshot, new: FleetSnapshot) -> list[ChangeEvent]:
+        changes = old.diff(new)
+        events = []
+        for device_identifier in changes.get_removed():
+            module = old.get_module(device_identifier)
+            events.append(ChangeEvent(device_identifier, module.get_zone_id(), module.get_module_id(),
+                                      FIELD_MODULE_REMOVED, module, None))
+
+        for device_identifier in changes.get_added():
+            module = new.get_module(device_identifier)
+            events.append(ChangeEvent(device_identifier, module.get_zone_id(), module.get_module_id(),
+                                      FIELD_MODULE_ADDED, None, module))
+
+        for device_identifier, fields in changes.get_changed().items():
+            old_module = old.get_module(device_identifier)
+            new_module = new.get_module(device_identifier)
+            for field in fields:
+                getter = MODULE_FIELDS[field]
+                events.append(ChangeEvent(device_identifier, new_module.get_zone_id(), new_module.get_module_id(),
+                                          field, getter(old_module), getter(new_module)))
+
+        return events
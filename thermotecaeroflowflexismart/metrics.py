@@ -0,0 +1,187 @@
+"""Request metrics for the Python Thermotec AeroFlow® Library"""
+from bisect import bisect_left
+
+FAMILY_PING = "PING"
+FAMILY_OP = "OP"
+FAMILY_ZONE_READ = "D#_READ"
+FAMILY_ZONE_WRITE = "D#_WRITE"
+FAMILY_MODULE_READ = "R#_READ"
+FAMILY_MODULE_WRITE = "R#_WRITE"
+FAMILY_OTHER = "OTHER"
+
+FAMILIES = [FAMILY_PING, FAMILY_OP, FAMILY_ZONE_READ, FAMILY_ZONE_WRITE, FAMILY_MODULE_READ, FAMILY_MODULE_WRITE,
+            FAMILY_OTHER]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+# PING, OP* or D#/R# read/write. Zone (D#) and module (R#) commands are reads if the sub command starts with "?"
+def get_command_family(message: str | bytes) -> str:
+    if isinstance(message, str):
+        message = message.encode()
+    if message == b"PING":
+        return FAMILY_PING
+    if message.startswith(b"OP"):
+        return FAMILY_OP
+    if message.startswith(b"D#"):
+        return FAMILY_ZONE_READ if b"*?" in message else FAMILY_ZONE_WRITE
+    if message.startswith(b"R#"):
+        return FAMILY_MODULE_READ if b"*?" in message else FAMILY_MODULE_WRITE
+    return FAMILY_OTHER
+
+
+class Histogram:
+    """Latency histogram with fixed upper bounds in seconds (like a Prometheus histogram)"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self._buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._buckets, value)] += 1
+        self._count += 1
+        self._sum += value
+        self._max = max(self._max, value)
+
+    def get_count(self) -> int:
+        return self._count
+
+    def get_sum(self) -> float:
+        return self._sum
+
+    def get_max(self) -> float:
+        return self._max
+
+    def get_average(self) -> float:
+        if self._count == 0:
+            return 0.0
+        return self._sum / self._count
+
+    # Cumulative counts per upper bound, the last bound is infinity
+    def get_buckets(self) -> list[tuple[float, int]]:
+        buckets = []
+        cumulative = 0
+        for upper_bound, count in zip(self._buckets + (float("inf"),), self._counts):
+            cumulative += count
+            buckets.append((upper_bound, cumulative))
+        return buckets
+
+    # Upper bound of the bucket which contains the quantile. Values above the last bucket report the maximum
+    def get_quantile(self, quantile: float) -> float:
+        if self._count == 0:
+            return 0.0
+
+        rank = quantile * self._count
+        for upper_bound, cumulative in self.get_buckets():
+            if cumulative >= rank:
+                return min(upper_bound, self._max)
+        return self._max
+
+
+class CommandMetrics:
+    """Counters and latencies of one command family
+
+    queue_wait is the time a request waited for its turn in the RequestScheduler, pacing the time it was held back
+    afterwards to give the gateway a break and wire_time the time between sending the request and receiving the
+    response (gateway and RF link).
+    """
+
+    def __init__(self, family: str):
+        self._family = family
+        self._requests = 0
+        self._timeouts = 0
+        self._unexpected_errors = 0
+        self._error_responses = 0
+        self._bytes_sent = 0
+        self._bytes_received = 0
+        self._queue_wait = Histogram()
+        self._pacing = Histogram()
+        self._wire_time = Histogram()
+
+    def _record_dispatch(self, queue_wait: float, pacing: float) -> None:
+        self._requests += 1
+        self._queue_wait.observe(queue_wait)
+        self._pacing.observe(pacing)
+
+    def _record_sent(self, size: int) -> None:
+        self._bytes_sent += size
+
+    def _record_received(self, size: int, wire_time: float) -> None:
+        self._bytes_received += size
+        self._wire_time.observe(wire_time)
+
+    def _record_timeout(self) -> None:
+        self._timeouts += 1
+
+    def _record_unexpected_error(self) -> None:
+        self._unexpected_errors += 1
+
+    def _record_error_response(self) -> None:
+        self._error_responses += 1
+
+    def get_family(self) -> str:
+        return self._family
+
+    def get_requests(self) -> int:
+        return self._requests
+
+    def get_timeouts(self) -> int:
+        return self._timeouts
+
+    # Requests which returned "UNEXPECTED_ERROR"
+    def get_unexpected_errors(self) -> int:
+        return self._unexpected_errors
+
+    # "ER,x" responses of the gateway
+    def get_error_responses(self) -> int:
+        return self._error_responses
+
+    def get_bytes_sent(self) -> int:
+        return self._bytes_sent
+
+    def get_bytes_received(self) -> int:
+        return self._bytes_received
+
+    def get_queue_wait(self) -> Histogram:
+        return self._queue_wait
+
+    def get_pacing(self) -> Histogram:
+        return self._pacing
+
+    def get_wire_time(self) -> Histogram:
+        return self._wire_time
+
+
+class GatewayMetrics:
+    """Per command family metrics of one FlexiSmartGateway"""
+
+    def __init__(self):
+        self._families = {family: CommandMetrics(family) for family in FAMILIES}
+
+    def get_command_metrics(self, family: str) -> CommandMetrics:
+        return self._families[family]
+
+    # Only the families which were used at least once
+    def get_families(self) -> dict[str, CommandMetrics]:
+        return {family: metrics for family, metrics in self._families.items() if metrics.get_requests() > 0}
+
+    def get_requests(self) -> int:
+        return sum(metrics.get_requests() for metrics in self._families.values())
+
+    def get_timeouts(self) -> int:
+        return sum(metrics.get_timeouts() for metrics in self._families.values())
+
+    def get_unexpected_errors(self) -> int:
+        return sum(metrics.get_unexpected_errors() for metrics in self._families.values())
+
+    def get_error_responses(self) -> int:
+        return sum(metrics.get_error_responses() for metrics in self._families.values())
+
+    def get_bytes_sent(self) -> int:
+        return sum(metrics.get_bytes_sent() for metrics in self._families.values())
+
+    def get_bytes_received(self) -> int:
+        return sum(metrics.get_bytes_received() for metrics in self._families.values())
@@ -0,0 +1,101 @@
+"""Request pacing for the Python Thermotec AeroFlow® Library"""
+from abc import ABC, abstractmethod
+
+
+class PacingPolicy(ABC):
+    """Decides how long the gateway needs to rest between the response of one request and the next request"""
+
+    _total_delay: float = 0.0
+
+    @abstractmethod
+    def get_delay(self) -> float:
+        pass
+
+    # The gateway answered after duration seconds
+    def record_response(self, duration: float) -> None:
+        pass
+
+    # An ER,x response or a broken transport
+    def record_error(self) -> None:
+        pass
+
+    def record_timeout(self) -> None:
+        pass
+
+    def _record_delay(self, delay: float) -> None:
+        self._total_delay += delay
+
+    # Total time spent waiting because of this policy
+    def get_total_delay(self) -> float:
+        return self._total_delay
+
+
+class FixedPacing(PacingPolicy):
+    """Always waits the same gap. FixedPacing(0.1) is the behaviour of previous versions"""
+
+    def __init__(self, delay: float = 0.1):
+        self._delay = delay
+
+    def get_delay(self) -> float:
+        return self._delay
+
+
+class AdaptivePacing(PacingPolicy):
+    """Follows the measured response time of the gateway
+
+    The response times are smoothed (EWMA) and the gap is response_factor times the average, but never less than
+    min_delay: a busy gateway answers slower and gets more rest, an idle one less. An ER,x response or a timeout is a
+    sign that the gateway (or the RF link behind it) can not keep up, so the gap is multiplied. The back-off shrinks by
+    decrease_step with every successful response again.
+    """
+
+    # smoothing: weight of the latest response time in the average
+    def __init__(
+            self,
+            initial_delay: float = 0.1,
+            min_delay: float = 0.02,
+            max_delay: float = 2.0,
+            smoothing: float = 0.2,
+            response_factor: float = 0.5,
+            decrease_step: float = 0.01,
+            backoff_factor: float = 2.0,
+            min_backoff_delay: float = 0.05
+    ):
+        self._initial_delay = initial_delay
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._smoothing = smoothing
+        self._response_factor = response_factor
+        self._decrease_step = decrease_step
+        self._backoff_factor = backoff_factor
+        self._min_backoff_delay = min_backoff_delay
+        self._response_time: float | None = None
+        self._backoff_delay = 0.0
+
+    def get_delay(self) -> float:
+        if self._response_time is None:
+            delay = self._initial_delay
+        else:
+            delay = max(self._min_delay, self._response_time * self._response_factor)
+        return min(self._max_delay, max(delay, self._backoff_delay))
+
+    # Smoothed response time of the gateway, None before the first response
+    def get_response_time(self) -> float | None:
+        return self._response_time
+
+    def record_response(self, duration: float) -> None:
+        if self._response_time is None:
+            self._response_time = duration
+        else:
+            self._response_time += self._smoothing * (duration - self._response_time)
+        self._backoff_delay = max(0.0, self._backoff_delay - self._decrease_step)
+
+    def record_error(self) -> None:
+        self._back_off()
+
+    def record_timeout(self) -> None:
+        self._back_off()
+
+    def _back_off(self) -> None:
+        delay = max(self.get_delay(), self._min_backoff_delay) * self._backoff_factor
+        self._backoff_delay = min(self._max_delay, delay)
@@ -0,0 +1,192 @@
+"""Poll bookkeeping for the Python Thermotec AeroFlow® Library"""
+from time import monotonic
+from .metrics import Histogram
+
+POLL_DURATION_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class PollCycle:
+    """State of one get_all_data / iter_all_data run"""
+
+    def __init__(self):
+        self._started_at = monotonic()
+        self._unchanged = False
+        self._aborted = False
+        self._round_trips = 0
+        self._saved_round_trips = 0
+        self._skipped_modules = 0
+        self._device_identifiers: set[str] = set()
+
+    def is_unchanged(self) -> bool:
+        return self._unchanged
+
+    def set_unchanged(self, unchanged: bool) -> None:
+        self._unchanged = unchanged
+
+    # The gateway went dark, the remaining modules are not requested
+    def is_aborted(self) -> bool:
+        return self._aborted
+
+    def abort(self) -> None:
+        self._aborted = True
+
+    def add_device_identifier(self, device_identifier: str) -> None:
+        self._device_identifiers.add(device_identifier)
+
+    def has_device_identifier(self, device_identifier: str) -> bool:
+        return device_identifier in self._device_identifiers
+
+    def add_round_trip(self) -> None:
+        self._round_trips += 1
+
+    def add_saved_round_trip(self) -> None:
+        self._saved_round_trips += 1
+
+    # Quarantined modules which were not requested
+    def add_skipped_module(self) -> None:
+        self._skipped_modules += 1
+
+    def get_skipped_modules(self) -> int:
+        return self._skipped_modules
+
+    def get_round_trips(self) -> int:
+        return self._round_trips
+
+    def get_saved_round_trips(self) -> int:
+        return self._saved_round_trips
+
+    # Seconds since the poll started
+    def get_duration(self) -> float:
+        return monotonic() - self._started_at
+
+
+class GatewayLiveness:
+    """Decides when the gateway has to be treated as unavailable
+
+    After max_consecutive_timeouts timeouts of different modules without any successful read in between, the
+    gateway is suspected to be dark. A PING decides if it is really offline.
+    """
+
+    def __init__(self, max_consecutive_timeouts: int = 3):
+        self._max_consecutive_timeouts = max_consecutive_timeouts
+        self._consecutive_timeouts = 0
+        self._available = True
+
+    def is_available(self) -> bool:
+        return self._available
+
+    def get_consecutive_timeouts(self) -> int:
+        return self._consecutive_timeouts
+
+    def record_success(self) -> None:
+        self._consecutive_timeouts = 0
+        self._available = True
+
+    # Returns True if the gateway is suspected to be dark
+    def record_timeout(self) -> bool:
+        self._consecutive_timeouts += 1
+        return self._consecutive_timeouts >= self._max_consecutive_timeouts
+
+    def set_unavailable(self) -> None:
+        self._available = False
+
+
+class ModuleHealth:
+    def __init__(self, zone: int, module: int):
+        self._zone = zone
+        self._module = module
+        self._polls = 0
+        self._timeouts = 0
+        self._last_success_at: float | None = None
+
+    def get_zone(self) -> int:
+        return self._zone
+
+    def get_module(self) -> int:
+        return self._module
+
+    # Polls which requested the module (quarantined modules which were skipped are not counted)
+    def get_polls(self) -> int:
+        return self._polls
+
+    def get_timeouts(self) -> int:
+        return self._timeouts
+
+    # Seconds since the module was read successfully. None if it never was
+    def get_last_success_age(self) -> float | None:
+        if self._last_success_at is None:
+            return None
+        return monotonic() - self._last_success_at
+
+
+class PollStatistics:
+    _polls: int = 0
+    _unchanged_polls: int = 0
+    _aborted_polls: int = 0
+    _last_round_trips: int = 0
+    _last_saved_round_trips: int = 0
+    _total_round_trips: int = 0
+    _total_saved_round_trips: int = 0
+    _last_duration: float = 0.0
+
+    def __init__(self):
+        self._poll_duration = Histogram(POLL_DURATION_BUCKETS)
+        self._modules: dict[tuple[int, int], ModuleHealth] = {}
+
+    def _record_poll(self, cycle: PollCycle) -> None:
+        self._polls += 1
+        self._last_duration = cycle.get_duration()
+        self._poll_duration.observe(self._last_duration)
+        if cycle.is_unchanged():
+            self._unchanged_polls += 1
+        if cycle.is_aborted():
+            self._aborted_polls += 1
+        self._last_round_trips = cycle.get_round_trips()
+        self._last_saved_round_trips = cycle.get_saved_round_trips()
+        self._total_round_trips += cycle.get_round_trips()
+        self._total_saved_round_trips += cycle.get_saved_round_trips()
+
+    def get_polls(self) -> int:
+        return self._polls
+
+    # Polls where the server sync id reported no change of the environment
+    def get_unchanged_polls(self) -> int:
+        return self._unchanged_polls
+
+    # Polls which were cut short, because the gateway did not respond
+    def get_aborted_polls(self) -> int:
+        return self._aborted_polls
+
+    def get_last_round_trips(self) -> int:
+        return self._last_round_trips
+
+    # Round trips the last poll did not need compared to a full refresh (the sync id probe is not deducted)
+    def get_last_saved_round_trips(self) -> int:
+        return self._last_saved_round_trips
+
+    def get_total_round_trips(self) -> int:
+        return self._total_round_trips
+
+    def get_total_saved_round_trips(self) -> int:
+        return self._total_saved_round_trips
+
+    def get_last_duration(self) -> float:
+        return self._last_duration
+
+    def get_poll_duration(self) -> Histogram:
+        return self._poll_duration
+
+    def _record_module_poll(self, zone: int, module: int, success: bool, timeout: bool = False) -> None:
+        health = self._modules.get((zone, module))
+        if health is None:
+            health = ModuleHealth(zone, module)
+            self._modules[(zone, module)] = health
+
+        health._polls += 1
+        if timeout:
+            health._timeouts += 1
+        if success:
+            health._last_success_at = monotonic()
+
+    def get_module_health(self) -> list[ModuleHealth]:
+        return list(self._modules.values())
@@ -0,0 +1,208 @@
+"""Prometheus exporter for the Python Thermotec AeroFlow® Library"""
+import logging
+from asyncio import start_server, StreamReader, StreamWriter, IncompleteReadError, LimitOverrunError, wait_for
+from .client import Client
+from .codec import MODULE_DATA_MEMO
+from .metrics import Histogram
+from .scheduler import Priority
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _MetricFamily:
+    def __init__(self, name: str, metric_type: str, description: str):
+        self._name = name
+        self._type = metric_type
+        self._description = description
+        self._lines: list[str] = []
+
+    def add(self, value: float, labels: dict[str, str], suffix: str = "") -> None:
+        self._lines.append(f"{self._name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+
+    def add_histogram(self, histogram: Histogram, labels: dict[str, str]) -> None:
+        for upper_bound, count in histogram.get_buckets():
+            self.add(count, {**labels, "le": _format_value(upper_bound)}, "_bucket")
+        self.add(histogram.get_sum(), labels, "_sum")
+        self.add(histogram.get_count(), labels, "_count")
+
+    def render(self) -> list[str]:
+        if not self._lines:
+            return []
+        return [f"# HELP {self._name} {self._description}", f"# TYPE {self._name} {self._type}"] + self._lines
+
+
+# Renders the metrics of all clients in the Prometheus text exposition format. The key of a client is used as
+# "gateway" label, e.g. the host of the gateway or the name of the location
+def render_metrics(clients: dict[str, Client]) -> str:
+    families = {
+        "up": _MetricFamily("flexismart_gateway_up", "gauge",
+                            "1 if the gateway answered the last poll, 0 if it was aborted"),
+        "queue_depth": _MetricFamily("flexismart_gateway_queue_depth", "gauge",
+                                     "Requests waiting for the gateway"),
+        "lane_requests": _MetricFamily("flexismart_gateway_lane_requests_total", "counter",
+                                       "Requests per priority lane of the request queue"),
+        "lane_wait": _MetricFamily("flexismart_gateway_lane_wait_seconds_total", "counter",
+                                   "Time the requests of a priority lane waited for their turn"),
+        "lane_max_wait": _MetricFamily("flexismart_gateway_lane_max_wait_seconds", "gauge",
+                                       "Longest time a request of a priority lane waited for its turn"),
+        "requests": _MetricFamily("flexismart_gateway_requests_total", "counter",
+                                  "Requests sent to the gateway"),
+        "timeouts": _MetricFamily("flexismart_gateway_timeouts_total", "counter",
+                                  "Requests without response"),
+        "unexpected_errors": _MetricFamily("flexismart_gateway_unexpected_errors_total", "counter",
+                                           "Requests which failed with an unexpected error"),
+        "error_responses": _MetricFamily("flexismart_gateway_error_responses_total", "counter",
+                                         "ER responses of the gateway"),
+        "bytes_sent": _MetricFamily("flexismart_gateway_sent_bytes_total", "counter",
+                                    "Bytes sent to the gateway"),
+        "bytes_received": _MetricFamily("flexismart_gateway_received_bytes_total", "counter",
+                                        "Bytes received from the gateway"),
+        "queue_wait": _MetricFamily("flexismart_gateway_queue_wait_seconds", "histogram",
+                                    "Time a request waited for its turn"),
+        "pacing": _MetricFamily("flexismart_gateway_pacing_seconds", "histogram",
+                                "Time a request was held back to give the gateway a break"),
+        "wire_time": _MetricFamily("flexismart_gateway_wire_seconds", "histogram",
+                                   "Time between sending a request and receiving the response"),
+        "coalesced_reads": _MetricFamily("flexismart_coalesced_reads_total", "counter",
+                                         "Reads which shared the request of an identical read in flight"),
+        "module_data_memo_hits": _MetricFamily("flexismart_module_data_memo_hits_total", "counter",
+                                               "Module data responses which reused already decoded data"),
+        "module_data_memo_misses": _MetricFamily("flexismart_module_data_memo_misses_total", "counter",
+                                                 "Module data responses which were decoded"),
+        "polls": _MetricFamily("flexismart_polls_total", "counter", "Polls of all modules"),
+        "aborted_polls": _MetricFamily("flexismart_aborted_polls_total", "counter",
+                                       "Polls which were aborted, because the gateway did not respond"),
+        "poll_duration": _MetricFamily("flexismart_poll_duration_seconds", "histogram",
+                                       "Duration of a poll of all modules"),
+        "module_polls": _MetricFamily("flexismart_module_polls_total", "counter", "Polls which requested the module"),
+        "module_timeouts": _MetricFamily("flexismart_module_timeouts_total", "counter",
+                                         "Polls in which the module did not respond"),
+        "module_last_success_age": _MetricFamily("flexismart_module_last_success_age_seconds", "gauge",
+                                                 "Seconds since the module was read successfully"),
+        "module_quarantined": _MetricFamily("flexismart_module_quarantined", "gauge",
+                                            "1 if the module is skipped by the poll"),
+    }
+
+    for gateway, client in clients.items():
+        labels = {"gateway": gateway}
+        families["up"].add(1 if client.is_gateway_available() else 0, labels)
+        families["queue_depth"].add(client.get_scheduler_statistics().get_queue_depth(), labels)
+
+        for priority in Priority:
+            lane_statistics = client.get_scheduler_statistics(priority)
+            lane_labels = {**labels, "lane": priority.name.lower()}
+            families["lane_requests"].add(lane_statistics.get_requests(), lane_labels)
+            families["lane_wait"].add(lane_statistics.get_total_wait_time(), lane_labels)
+            families["lane_max_wait"].add(lane_statistics.get_max_wait_time(), lane_labels)
+
+        for family, command_metrics in client.get_gateway_metrics().get_families().items():
+            family_labels = {**labels, "family": family}
+            families["requests"].add(command_metrics.get_requests(), family_labels)
+            families["timeouts"].add(command_metrics.get_timeouts(), family_labels)
+            families["unexpected_errors"].add(command_metrics.get_unexpected_errors(), family_labels)
+            families["error_responses"].add(command_metrics.get_error_responses(), family_labels)
+            families["bytes_sent"].add(command_metrics.get_bytes_sent(), family_labels)
+            families["bytes_received"].add(command_metrics.get_bytes_received(), family_labels)
+            families["queue_wait"].add_histogram(command_metrics.get_queue_wait(), family_labels)
+            families["pacing"].add_histogram(command_metrics.get_pacing(), family_labels)
+            families["wire_time"].add_histogram(command_metrics.get_wire_time(), family_labels)
+
+        families["coalesced_reads"].add(client.get_single_flight_statistics().get_coalesced(), labels)
+
+        poll_statistics = client.get_poll_statistics()
+        families["polls"].add(poll_statistics.get_polls(), labels)
+        families["aborted_polls"].add(poll_statistics.get_aborted_polls(), labels)
+        families["poll_duration"].add_histogram(poll_statistics.get_poll_duration(), labels)
+
+        for health in poll_statistics.get_module_health():
+            module_labels = {**labels, "zone": str(health.get_zone()), "module": str(health.get_module())}
+            families["module_polls"].add(health.get_polls(), module_labels)
+            families["module_timeouts"].add(health.get_timeouts(), module_labels)
+            last_success_age = health.get_last_success_age()
+            if last_success_age is not None:
+                families["module_last_success_age"].add(last_success_age, module_labels)
+
+        for entry in client.get_quarantined_modules():
+            module_labels = {**labels, "zone": str(entry.get_zone()), "module": str(entry.get_module())}
+            families["module_quarantined"].add(1, module_labels)
+
+    # The memo is shared by all clients of the process
+    memo_statistics = MODULE_DATA_MEMO.get_statistics()
+    families["module_data_memo_hits"].add(memo_statistics.get_hits(), {})
+    families["module_data_memo_misses"].add(memo_statistics.get_misses(), {})
+
+    lines = []
+    for family in families.values():
+        lines.extend(family.render())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Minimal HTTP endpoint which serves render_metrics() on GET /metrics
+
+    The clients dict is read on every scrape, so clients can be added or removed while the server is running.
+    """
+
+    def __init__(self, clients: dict[str, Client], host: str = "127.0.0.1", port: int = 9464):
+        self._clients = clients
+        self._host = host
+        self._port = port
+        self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    async def start(self) -> tuple[str, int]:
+        self._server = await start_server(self._handle, self._host, self._port)
+        return self.get_address()
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def get_address(self) -> tuple[str, int]:
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def _handle(self, reader: StreamReader, writer: StreamWriter) -> None:
+        try:
+            request = await wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+            method, path = request.split(b" ", 2)[:2]
+            if method != b"GET":
+                status, body = "405 Method Not Allowed", ""
+            elif path.split(b"?")[0] != b"/metrics":
+                status, body = "404 Not Found", ""
+            else:
+                status, body = "200 OK", render_metrics(self._clients)
+
+            payload = body.encode()
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\nContent-Length: {len(payload)}\r\n"
+                         f"Connection: close\r\n\r\n".encode() + payload)
+            await writer.drain()
+        except (IncompleteReadError, LimitOverrunError, TimeoutError, ValueError, ConnectionError):
+            _LOGGER.debug("Invalid metrics request")
+        finally:
+            writer.close()
@@ -0,0 +1,505 @@
+"""Sans-IO protocol for the Python Thermotec AeroFlow® Library
+
+Every command of the gateway is an Intent. encode() turns it into the request datagram (see codec.py), decode() turns
+the response datagram into the typed result (or raises InvalidResponse). Nothing in here does any I/O, the Client is
+just one driver over these intents:
+
+    intent = protocol.get_temperature(zone=1, module=2)
+    intent.resolve(zones)  # only zone intents, validates the zone / module and picks the D# or R# target
+    result = intent.decode(send(intent.encode()))
+
+encode_datagram() / decode_datagram() do the same on the raw UDP payload, including the null byte at the end of the
+response.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from .cache import (
+    KIND_TEMPERATURE,
+    KIND_TEMPERATURE_OFFSET,
+    KIND_ANTI_FREEZE_TEMPERATURE,
+    KIND_BOOST,
+    KIND_WINDOW_OPEN_DETECTION,
+    KIND_SMART_START,
+    KIND_HOLIDAY_DATA,
+)
+from .codec import (
+    MODULE_DATA_MEMO,
+    OKAY_STATUS,
+    OKAY_PREFIX,
+    OPERATION_STATUS,
+    OPERATION_OK_STATUS,
+    OPERATION_OK_PREFIX,
+    GET_MODULE_DATA,
+    GET_TEMPERATURE,
+    GET_ANTI_FREEZE_TEMPERATURE,
+    GET_HOLIDAY_DATA,
+    SET_TEMPERATURE,
+    encode_zone_command,
+    encode_operation,
+    strip_status,
+    decode_temperature,
+    decode_holiday_data,
+    decode_anti_freeze_temperature,
+)
+from .data_object import GatewayDateTime, GatewayData, GatewayNetworkConfiguration
+from .exception import InvalidResponse, InvalidRequest
+from .utils import (
+    check_if_zone_exists,
+    check_if_module_is_valid,
+    calculate_int_from_temperature,
+    calculate_temperature_from_int,
+    calculate_temperature_offset_from_int,
+    calculate_int_from_temperature_offset
+)
+
+
+class Intent(ABC):
+    """A single request to the gateway and the interpretation of its response"""
+
+    def __init__(self, timeout: int | None = None):
+        self._timeout = timeout
+
+    # Seconds to wait for the response. None uses the default of the driver
+    def get_timeout(self) -> int | None:
+        return self._timeout
+
+    # Reads have no side effect on the gateway, so identical reads in flight at the same time can share one request
+    def is_read(self) -> bool:
+        return False
+
+    @abstractmethod
+    def encode(self) -> bytes:
+        pass
+
+    # response is the datagram of the gateway without the null byte at the end
+    @abstractmethod
+    def decode(self, response: bytes):
+        pass
+
+
+def encode_datagram(intent: Intent) -> bytes:
+    return intent.encode()
+
+
+def decode_datagram(intent: Intent, datagram: bytes):
+    return intent.decode(datagram.rstrip(b"\x00"))
+
+
+# Command: PING
+# GatewayResponse: OP
+class Ping(Intent):
+    def is_read(self) -> bool:
+        return True
+
+    def encode(self) -> bytes:
+        return b"PING"
+
+    def decode(self, response: bytes) -> bool:
+        if not response.startswith(OPERATION_STATUS):
+            raise InvalidResponse()
+        return True
+
+
+# Command: <operation>/
+# GatewayResponse: OPOK,[<operation>,]<data>
+class GatewayQuery(Intent):
+    def __init__(self, operation: bytes, include_operation_in_response_identifier: bool, factory=None):
+        super().__init__()
+        self._operation = operation
+        self._response_identifier = OPERATION_OK_PREFIX
+        if include_operation_in_response_identifier:
+            self._response_identifier += operation + b","
+        self._factory = factory
+
+    def is_read(self) -> bool:
+        return True
+
+    def encode(self) -> bytes:
+        return encode_operation(self._operation)
+
+    def decode(self, response: bytes):
+        try:
+            data = strip_status(response, self._response_identifier).decode().split(",")
+        except UnicodeDecodeError:
+            raise InvalidResponse()
+
+        if self._factory is None:
+            return data
+        return self._factory(data)
+
+
+# GatewayResponse: OPOK
+class GatewayCommand(Intent):
+    def __init__(self, command: bytes, timeout: int | None = None):
+        super().__init__(timeout)
+        self._command = command
+
+    def encode(self) -> bytes:
+        return self._command
+
+    def decode(self, response: bytes) -> None:
+        if not response.startswith(OPERATION_OK_STATUS):
+            raise InvalidResponse()
+        return None
+
+
+class ZoneIntent(Intent):
+    """Intent which addresses a zone or a single module of a zone
+
+    resolve() has to be called with the zones (module count per zone) before the intent can be encoded. Without a
+    module the command goes to all modules of the zone (D#<zone>#<module_count>), otherwise to the module
+    (R#<zone>#<module>).
+    """
+
+    def __init__(self, zone: int, module: int = -1, validate_module: bool = True, timeout: int | None = None):
+        super().__init__(timeout)
+        self._zone = zone
+        self._module = module
+        self._validate_module = validate_module
+        self._target: int | None = None
+
+    def get_zone(self) -> int:
+        return self._zone
+
+    def get_module(self) -> int:
+        return self._module
+
+    def resolve(self, zones: list[int] | None) -> None:
+        check_if_zone_exists(zones, self._zone)
+
+        target = zones[(self._zone - 1)]
+
+        # if module was not -1 we verify the requested module
+        if self._module != -1:
+            if self._validate_module:
+                check_if_module_is_valid(target, self._module)
+            target = self._module
+
+        self._target = target
+
+    def is_resolved(self) -> bool:
+        return self._target is not None
+
+    # The modules which receive the command, every module of the zone for zone commands
+    def get_addressed_modules(self) -> list[int]:
+        if self._module == -1:
+            return list(range(1, self._get_target() + 1))
+        return [self._module]
+
+    def _get_target(self) -> int:
+        if self._target is None:
+            raise InvalidRequest("Zone intent was not resolved")
+        return self._target
+
+    def _encode_zone_command(self, sub_command: bytes) -> bytes:
+        return encode_zone_command(self._zone, self._get_target(), sub_command, self._module)
+
+
+# Command: D#<zone_id>#<zone_module_count>#0#0*<sub_command>/ or R#<zone_id>#<module>#0#0*<sub_command>/
+# GatewayResponse: OK,<data>
+class ZoneQuery(ZoneIntent):
+    def __init__(self, zone: int, module: int, sub_command: bytes, factory, validate_module: bool = True):
+        super().__init__(zone, module, validate_module)
+        self._sub_command = sub_command
+        self._factory = factory
+
+    def get_sub_command(self) -> bytes:
+        return self._sub_command
+
+    # "?" queries only read, e.g. the restart (-TU) answers with module data as well
+    def is_read(self) -> bool:
+        return self._sub_command.startswith(b"?")
+
+    def encode(self) -> bytes:
+        return self._encode_zone_command(self._sub_command)
+
+    def decode(self, response: bytes):
+        try:
+            return self._factory(strip_status(response, OKAY_PREFIX))
+        except UnicodeDecodeError:
+            raise InvalidResponse()
+
+
+# Command: D#<zone_id>#<zone_module_count>#0#0*<sub_command>/ or R#<zone_id>#<module>#0#0*<sub_command>/
+# GatewayResponse: OK
+class ZoneCommand(ZoneIntent):
+    """Writes one setting of a zone or module
+
+    setting is the cache kind the command changes and value what a read returns afterwards (None if it can not be
+    derived from the command, e.g. the holiday data).
+    """
+
+    def __init__(self, zone: int, module: int, sub_command: bytes, setting: str | None = None, value=None):
+        super().__init__(zone, module)
+        self._sub_command = sub_command
+        self._setting = setting
+        self._value = value
+
+    def get_sub_command(self) -> bytes:
+        return self._sub_command
+
+    def get_setting(self) -> str | None:
+        return self._setting
+
+    def get_value(self):
+        return self._value
+
+    def encode(self) -> bytes:
+        return self._encode_zone_command(self._sub_command)
+
+    def decode(self, response: bytes) -> None:
+        if not response.startswith(OKAY_STATUS):
+            raise InvalidResponse()
+        return None
+
+
+# Command: OPZI199,<zone>,<module>/
+# GatewayResponse: OPOK
+class RegisterModule(ZoneIntent):
+    def encode(self) -> bytes:
+        return encode_operation(b"OPZI199,%d,%d" % (self._zone, self._get_target()))
+
+    def decode(self, response: bytes) -> None:
+        if not response.startswith(OPERATION_OK_STATUS):
+            raise InvalidResponse()
+        return None
+
+
+# Command: OPMW<big_zone_id>,0/
+# GatewayResponse: OPOK
+class DeleteZone(ZoneIntent):
+    def encode(self) -> bytes:
+        self._get_target()
+        # module type = 120
+        # some crazy constant value = 8
+        # zone id = <zone>
+        big_zone_id = 120 + 8 + self._zone
+        return encode_operation(b"OPMW%d,0" % big_zone_id)
+
+    def decode(self, response: bytes) -> None:
+        if not response.startswith(OPERATION_OK_STATUS):
+            raise InvalidResponse()
+        return None
+
+
+# >>>>>>> Decoder <<<<<<< #
+
+def _decode_status(data: list[str]) -> dict:
+    return {"serverSyncId": data[0], "idA": data[5], "idB": data[6]}
+
+
+def _decode_zones(data: list[str]) -> list[int]:
+    return [int(value) for value in data]
+
+
+def _decode_temperature_offset(payload: bytes) -> float:
+    return calculate_temperature_offset_from_int(int(payload.split(b",")[0]))
+
+
+# 255 = never set
+def _decode_boost(payload: bytes) -> int:
+    data = int(payload)
+    if data == 255:
+        data = 0
+
+    # Multiply by 5 as each step is 5 minutes
+    return data * 5
+
+
+def _decode_flag(payload: bytes) -> bool:
+    return bool(int(payload))
+
+
+# >>>>>>> Gateway <<<<<<< #
+
+def ping() -> Ping:
+    return Ping()
+
+
+# Command: OPH/
+def get_date_time() -> GatewayQuery:
+    return GatewayQuery(b"OPH", False, GatewayDateTime)
+
+
+# Command: OPF<hour><minute><second><day_of_week>/<day>,<month>,<year>/
+def set_date_time(target_datetime: datetime) -> GatewayCommand:
+    day_of_week = target_datetime.weekday()  # Sunday = 6 - Monday = 0
+    return GatewayCommand(encode_operation(target_datetime.strftime(f"OPF%H%M%S{day_of_week}/%d,%m,%y").encode()))
+
+
+# Command: OPF/
+def get_gateway_data() -> GatewayQuery:
+    return GatewayQuery(b"OPF", False, GatewayData)
+
+
+# Command: OPS1/
+# GatewayResponse: OPOK,OPS1,<server_sync_id>,x,x,x,x,<id_a>,<id_b>,x,x,x
+def get_status() -> GatewayQuery:
+    return GatewayQuery(b"OPS1", True, _decode_status)
+
+
+# Command: OPS2/
+def get_zones() -> GatewayQuery:
+    return GatewayQuery(b"OPS2", True, _decode_zones)
+
+
+# Command: OPS3/
+# GatewayResponse: OPOK,OPS3,<module_count>,<...>
+def get_zones_with_module_count() -> GatewayQuery:
+    return GatewayQuery(b"OPS3", True, _decode_zones)
+
+
+# Command: OPS38/
+def get_network_configuration() -> GatewayQuery:
+    return GatewayQuery(b"OPS38", True, GatewayNetworkConfiguration)
+
+
+# >>>>>>> Zones <<<<<<< #
+
+def register_module(zone: int, timeout: int, module: int = -1) -> RegisterModule:
+    return RegisterModule(zone, module, timeout=timeout)
+
+
+# Command: OPMW<zone_position>,<zone_id>/
+def create_zone(zones: list[int]) -> GatewayCommand:
+    total_zones = len(zones)
+
+    zone_position = total_zones + 9
+    new_zone_id = total_zones + 1
+
+    return GatewayCommand(encode_operation(b"OPMW%d,%d" % (zone_position, new_zone_id)))
+
+
+def delete_zone(zone: int) -> DeleteZone:
+    return DeleteZone(zone)
+
+
+# >>>>>>> Modules <<<<<<< #
+
+# Command: R#<zone_id>#<module>#0#0*?F/ (the module is not checked against the module count of the zone)
+def get_module_data(zone: int, module: int) -> ZoneQuery:
+    return ZoneQuery(zone, module, GET_MODULE_DATA, MODULE_DATA_MEMO.decode, validate_module=False)
+
+
+# GatewayResponse: OK,<current_temperature>,<current_temperature>,<target_temperature>
+def get_temperature(zone: int, module: int = -1) -> ZoneQuery:
+    return ZoneQuery(zone, module, GET_TEMPERATURE, decode_temperature)
+
+
+def set_temperature(temperature: float, zone: int, module: int = -1) -> ZoneCommand:
+    target_temperature = calculate_int_from_temperature(temperature)
+    return ZoneCommand(zone, module, SET_TEMPERATURE % target_temperature, KIND_TEMPERATURE,
+                       calculate_temperature_from_int(target_temperature))
+
+
+# GatewayResponse: OK,<offset_temperature>
+def get_temperature_offset(zone: int, module: int = -1) -> ZoneQuery:
+    return ZoneQuery(zone, module, b"?E#0#9", _decode_temperature_offset)
+
+
+def set_temperature_offset(temperature: float, zone: int, module: int = -1) -> ZoneCommand:
+    target_offset = calculate_int_from_temperature_offset(temperature)
+    return ZoneCommand(zone, module, b"SEP#0#9#%d" % target_offset, KIND_TEMPERATURE_OFFSET,
+                       calculate_temperature_offset_from_int(target_offset))
+
+
+# GatewayResponse: OK,<anti_freeze_temperature>
+def get_anti_freeze_temperature(zone: int, module: int = -1) -> ZoneQuery:
+    return ZoneQuery(zone, module, GET_ANTI_FREEZE_TEMPERATURE, decode_anti_freeze_temperature)
+
+
+# 255 resets the value, the heater uses 5°C then. The gateway decides about other values outside of a byte, so what a
+# read returns afterwards is unknown
+def set_anti_freeze_temperature(temperature: float, zone: int, module: int = -1) -> ZoneCommand:
+    target_temperature = int(temperature)
+    value = None
+    if target_temperature == 255:
+        value = 5.0
+    elif 0 <= target_temperature < 255:
+        value = float(target_temperature)
+
+    return ZoneCommand(zone, module, b"SEP#1#20#%d" % target_temperature, KIND_ANTI_FREEZE_TEMPERATURE, value)
+
+
+# GatewayResponse: OK,<boost_time>
+def get_boost(zone: int, module: int = -1) -> ZoneQuery:
+    return ZoneQuery(zone, module, b"?E#1#22", _decode_boost)
+
+
+def set_boost(time: int, zone: int, module: int = -1) -> ZoneCommand:
+    if time > 95:
+        raise InvalidRequest("Boost time can not exceed 95 Minutes")
+
+    target_time = 0
+    if time >= 5:
+        target_time = int(time / 5)
+
+    return ZoneCommand(zone, module, b"SEP#1#22#%d" % target_time, KIND_BOOST, target_time * 5)
+
+
+# GatewayResponse: OK,<0|1>
+def is_window_open_detection_enabled(zone: int, module: int = -1) -> ZoneQuery:
+    return ZoneQuery(zone, module, b"?E#0#6", _decode_flag)
+
+
+def set_window_open_detection(value: bool, zone: int, module: int = -1) -> ZoneCommand:
+    return ZoneCommand(zone, module, b"SEP#0#6#%d" % value, KIND_WINDOW_OPEN_DETECTION, bool(value))
+
+
+# GatewayResponse: OK,<0|1>
+def is_smart_start_enabled(zone: int, module: int = -1) -> ZoneQuery:
+    return ZoneQuery(zone, module, b"?E#0#7", _decode_flag)
+
+
+def set_smart_start(value: bool, zone: int, module: int = -1) -> ZoneCommand:
+    return ZoneCommand(zone, module, b"SEP#0#7#%d" % value, KIND_SMART_START, bool(value))
+
+
+def get_holiday_mode(zone: int, module: int = -1) -> ZoneQuery:
+    return ZoneQuery(zone, module, GET_HOLIDAY_DATA, decode_holiday_data)
+
+
+# Command: ...*RH#<days>#<final_hour>#<final_minute>#<target_temperature_afterwards>/
+def set_holiday_mode(target_datetime: datetime, temperature: float, zone: int, module: int = -1,
+                     today: datetime | None = None) -> ZoneCommand:
+    if today is None:
+        today = datetime.now()
+
+    days_to_target = (
+            (target_datetime.replace(hour=0, minute=0, second=0, microsecond=0)) -
+            (today.replace(hour=0, minute=0, second=0, microsecond=0))
+    ).days
+
+    if days_to_target > 240:
+        raise InvalidRequest("Holiday Target Date can not exceed 240 Days")
+
+    if days_to_target <= 0:
+        raise InvalidRequest("Holiday Target Date needs to be at least one day in the future")
+
+    target_temperature = calculate_int_from_temperature(temperature)
+
+    sub_command = b"RH#%d#%d#%d#%d" % (days_to_target, target_datetime.hour, target_datetime.minute, target_temperature)
+    return ZoneCommand(zone, module, sub_command, KIND_HOLIDAY_DATA)
+
+
+def disable_holiday_mode(zone: int, module: int = -1) -> ZoneCommand:
+    return ZoneCommand(zone, module, b"RH#0#0#0#251", KIND_HOLIDAY_DATA)
+
+
+# GatewayResponse: OK,<module-data>
+def restart_module(zone: int, module: int = -1) -> ZoneQuery:
+    # if we remove one 0 after TU, we reset the module (by accident?)
+    return ZoneQuery(zone, module, b"-TU#0#0#0#0#2", MODULE_DATA_MEMO.decode)
+
+
+# Reads back the setting a ZoneCommand changed
+def read_setting(setting: str, zone: int, module: int = -1) -> ZoneQuery:
+    return {
+        KIND_TEMPERATURE: get_temperature,
+        KIND_TEMPERATURE_OFFSET: get_temperature_offset,
+        KIND_ANTI_FREEZE_TEMPERATURE: get_anti_freeze_temperature,
+        KIND_BOOST: get_boost,
+        KIND_WINDOW_OPEN_DETECTION: is_window_open_detection_enabled,
+        KIND_SMART_START: is_smart_start_enabled,
+        KIND_HOLIDAY_DATA: get_holiday_mode,
+    }[setting](zone, module)
@@ -0,0 +1,75 @@
+"""Module quarantine for the Python Thermotec AeroFlow® Library"""
+from time import monotonic
+
+REASON_TIMEOUT = "timeout"
+REASON_INVALID_DEVICE_IDENTIFIER = "invalid_device_identifier"
+
+
+class QuarantineEntry:
+    def __init__(self, zone: int, module: int):
+        self._zone = zone
+        self._module = module
+        self._failures = 0
+        self._reason = ""
+        self._retry_at = 0.0
+
+    def get_zone(self) -> int:
+        return self._zone
+
+    def get_module(self) -> int:
+        return self._module
+
+    # Failed polls in a row
+    def get_failures(self) -> int:
+        return self._failures
+
+    def get_reason(self) -> str:
+        return self._reason
+
+    # Seconds until the module is probed again. 0 if the next poll probes it
+    def get_retry_in(self) -> float:
+        return max(0.0, self._retry_at - monotonic())
+
+
+class ModuleQuarantine:
+    """Keeps modules which fail poll after poll out of the poll cycle
+
+    A module is quarantined after `threshold` failed polls in a row (timeout or invalid device identifier). It is
+    skipped until its backoff expired and then probed with a single request. Every failed probe doubles the backoff
+    up to max_backoff, a successful read releases the module.
+    """
+
+    def __init__(self, threshold: int = 2, base_backoff: float = 60.0, max_backoff: float = 3600.0):
+        self._threshold = threshold
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._entries: dict[tuple[int, int], QuarantineEntry] = {}
+
+    def is_quarantined(self, zone: int, module: int) -> bool:
+        entry = self._entries.get((zone, module))
+        return entry is not None and entry.get_failures() >= self._threshold
+
+    # Quarantined and the backoff is not over yet
+    def should_skip(self, zone: int, module: int) -> bool:
+        return self.is_quarantined(zone, module) and self._entries[(zone, module)].get_retry_in() > 0
+
+    def record_failure(self, zone: int, module: int, reason: str) -> None:
+        entry = self._entries.get((zone, module))
+        if entry is None:
+            entry = QuarantineEntry(zone, module)
+            self._entries[(zone, module)] = entry
+
+        entry._failures += 1
+        entry._reason = reason
+        if entry._failures >= self._threshold:
+            backoff = self._base_backoff * (2 ** min(entry._failures - self._threshold, 32))
+            entry._retry_at = monotonic() + min(self._max_backoff, backoff)
+
+    def record_success(self, zone: int, module: int) -> None:
+        self._entries.pop((zone, module), None)
+
+    def get_entries(self) -> list[QuarantineEntry]:
+        return [entry for entry in self._entries.values() if entry.get_failures() >= self._threshold]
+
+    def clear(self) -> None:
+        self._entries.clear()
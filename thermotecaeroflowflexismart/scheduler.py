@@ -0,0 +1,147 @@
+"""Request scheduler for the Python Thermotec AeroFlow® Library"""
+from asyncio import Future, get_running_loop
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from time import monotonic
+
+
+class Priority(IntEnum):
+    """Lanes of the request queue, a lower value is served first"""
+    INTERACTIVE_WRITE = 0
+    INTERACTIVE_READ = 1
+    BACKGROUND = 2
+
+
+_REQUEST_PRIORITY: ContextVar[Priority | None] = ContextVar("request_priority", default=None)
+
+
+# Requests sent inside the block are queued in the given lane, e.g. the requests of a poll in BACKGROUND
+@contextmanager
+def request_priority(priority: Priority):
+    token = _REQUEST_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _REQUEST_PRIORITY.reset(token)
+
+
+# None if the caller did not choose a lane
+def get_request_priority() -> Priority | None:
+    return _REQUEST_PRIORITY.get()
+
+
+class SchedulerStatistics:
+    _requests: int = 0
+    _queue_depth: int = 0
+    _max_queue_depth: int = 0
+    _total_wait_time: float = 0.0
+    _max_wait_time: float = 0.0
+
+    def _record_queue_depth(self, queue_depth: int) -> None:
+        self._queue_depth = queue_depth
+        self._max_queue_depth = max(self._max_queue_depth, queue_depth)
+
+    def _record_dispatch(self, queue_depth: int, wait_time: float) -> None:
+        self._requests += 1
+        self._queue_depth = queue_depth
+        self._total_wait_time += wait_time
+        self._max_wait_time = max(self._max_wait_time, wait_time)
+
+    def get_requests(self) -> int:
+        return self._requests
+
+    def get_queue_depth(self) -> int:
+        return self._queue_depth
+
+    def get_max_queue_depth(self) -> int:
+        return self._max_queue_depth
+
+    def get_total_wait_time(self) -> float:
+        return self._total_wait_time
+
+    def get_max_wait_time(self) -> float:
+        return self._max_wait_time
+
+    def get_average_wait_time(self) -> float:
+        if self._requests == 0:
+            return 0.0
+        return self._total_wait_time / self._requests
+
+
+class RequestScheduler:
+    """Serializes requests to one gateway, by priority and in FIFO order within a lane
+
+    The gateway can only handle one request at a time. Waiting requests are queued in the lane of their priority
+    and the next one is woken up as soon as the previous one releases its slot, so a queued background poll yields
+    to interactive requests between two round trips.
+    """
+
+    def __init__(self):
+        self._busy = False
+        self._waiters: dict[Priority, deque[Future]] = {priority: deque() for priority in Priority}
+        self._statistics = SchedulerStatistics()
+        self._lane_statistics = {priority: SchedulerStatistics() for priority in Priority}
+
+    def get_statistics(self) -> SchedulerStatistics:
+        return self._statistics
+
+    # Queue depth and wait time of one lane
+    def get_lane_statistics(self, priority: Priority) -> SchedulerStatistics:
+        return self._lane_statistics[priority]
+
+    def get_queue_depth(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def is_busy(self) -> bool:
+        return self._busy
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE_READ):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE_READ) -> None:
+        enqueued_at = monotonic()
+        waiters = self._waiters[priority]
+        lane_statistics = self._lane_statistics[priority]
+        if not self._busy and self.get_queue_depth() == 0:
+            self._busy = True
+            self._statistics._record_dispatch(0, 0.0)
+            lane_statistics._record_dispatch(0, 0.0)
+            return
+
+        waiter = get_running_loop().create_future()
+        waiters.append(waiter)
+        self._statistics._record_queue_depth(self.get_queue_depth())
+        lane_statistics._record_queue_depth(len(waiters))
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was already handed over to us, pass it on to the next waiter
+                self.release()
+            elif waiter in waiters:
+                waiters.remove(waiter)
+                self._statistics._record_queue_depth(self.get_queue_depth())
+                lane_statistics._record_queue_depth(len(waiters))
+            raise
+
+        wait_time = monotonic() - enqueued_at
+        self._statistics._record_dispatch(self.get_queue_depth(), wait_time)
+        lane_statistics._record_dispatch(len(waiters), wait_time)
+
+    def release(self) -> None:
+        # Hand the slot over directly, so no newly arriving request can overtake a queued one of the same lane
+        for waiters in self._waiters.values():
+            while waiters:
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+
+        self._busy = False
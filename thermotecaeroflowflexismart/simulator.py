@@ -0,0 +1,428 @@
+"""Gateway simulator for the Python Thermotec AeroFlow® Library
+
+A local stand-in for the FlexiSmart Gateway which speaks the UDP protocol used by the client. It is meant for tests
+and benchmarks, the behaviour is modeled after the responses of a real gateway and is not complete.
+"""
+from asyncio import DatagramProtocol, DatagramTransport, Task, create_task, get_running_loop, sleep
+from datetime import datetime, timedelta
+from random import Random
+
+from .utils import calculate_int_from_temperature, calculate_temperature_from_int
+
+
+class SimulatedModule:
+    """One heater. Values are kept the way the gateway transmits them"""
+
+    def __init__(
+            self,
+            device_identifier: str = "1.1.1.1",
+            current_temperature: float = 20.5,
+            target_temperature: float = 21.0,
+            firmware_version: str = "v201106",
+            latency: float = 0.0,
+            packet_loss: float = 0.0,
+            error_rate: float = 0.0
+    ):
+        self._device_identifier = device_identifier
+        self._current_temperature = current_temperature
+        self._target_temperature = calculate_int_from_temperature(target_temperature)
+        self._firmware_version = firmware_version
+        self._boost_steps = 0  # 5 minute steps
+        self._temperature_offset = 0
+        self._smart_start = 0
+        self._window_open_detection = 1
+        self._language = 129
+        self._anti_freeze_temperature = 255  # never set
+        self._holiday_days = 251  # > 240 = inactive
+        self._holiday_end_hour = 0
+        self._holiday_end_minute = 0
+        self._after_holiday_temperature = 251
+        # RF link simulation
+        self._latency = latency
+        self._packet_loss = packet_loss
+        self._error_rate = error_rate
+
+    def get_latency(self) -> float:
+        return self._latency
+
+    def set_latency(self, latency: float) -> None:
+        self._latency = latency
+
+    def get_packet_loss(self) -> float:
+        return self._packet_loss
+
+    def set_packet_loss(self, packet_loss: float) -> None:
+        self._packet_loss = packet_loss
+
+    def get_error_rate(self) -> float:
+        return self._error_rate
+
+    def set_error_rate(self, error_rate: float) -> None:
+        self._error_rate = error_rate
+
+    def get_device_identifier(self) -> str:
+        return self._device_identifier
+
+    def get_current_temperature(self) -> float:
+        return self._current_temperature
+
+    def set_current_temperature(self, temperature: float) -> None:
+        self._current_temperature = temperature
+
+    def get_target_temperature(self) -> float:
+        return calculate_temperature_from_int(self._target_temperature)
+
+    def get_anti_freeze_temperature(self) -> int:
+        return self._anti_freeze_temperature
+
+    def get_boost_time(self) -> int:
+        return self._boost_steps * 5
+
+    def is_window_open_detection_enabled(self) -> bool:
+        return self._window_open_detection == 1
+
+    def is_smart_start_enabled(self) -> bool:
+        return self._smart_start == 1
+
+    def get_holiday_days(self) -> int:
+        return self._holiday_days
+
+    def _current_temperature_fields(self) -> str:
+        main_value, _, second_value = f"{self._current_temperature:.1f}".partition(".")
+        return f"{main_value},{second_value}"
+
+    def _module_data_fields(self, now: datetime) -> str:
+        return ",".join(map(str, [
+            self._current_temperature_fields(),
+            self._target_temperature,
+            now.hour, now.minute, now.second, now.weekday(),
+            253, 0,  # programming
+            self._boost_steps * 8,
+            self._temperature_offset,
+            self._smart_start,
+            self._window_open_detection,
+            self._language,
+            0,
+            self._device_identifier.replace(".", ","),
+            self._firmware_version,
+        ]))
+
+    def _holiday_fields(self, now: datetime) -> str:
+        return ",".join(map(str, [
+            "RH",
+            self._current_temperature_fields(),
+            self._target_temperature,
+            now.hour, now.minute, now.second,
+            0, 0,
+            self._holiday_days,
+            self._holiday_end_hour,
+            self._holiday_end_minute,
+            self._after_holiday_temperature,
+        ]))
+
+    # Returns the response payload (without "OK,") for reads, None for writes and "" for unknown commands
+    def _execute(self, sub_command: str, now: datetime) -> str | None:
+        if sub_command == "?F" or sub_command.startswith("-TU"):
+            return self._module_data_fields(now)
+        if sub_command == "?T":
+            return f"{self._current_temperature_fields()},{self._target_temperature}"
+        if sub_command == "?RH":
+            return self._holiday_fields(now)
+        if sub_command.startswith("?E#"):
+            return str(self._get_parameter(sub_command[3:]))
+        if sub_command.startswith("T"):
+            self._target_temperature = int(sub_command[1:])
+            return None
+        if sub_command.startswith("SEP#"):
+            parameter, _, value = sub_command[4:].rpartition("#")
+            self._set_parameter(parameter, int(value))
+            return None
+        if sub_command.startswith("RH#"):
+            days, hour, minute, temperature = sub_command[3:].split("#")
+            self._holiday_days = int(days) if int(days) > 0 else 251
+            self._holiday_end_hour = int(hour)
+            self._holiday_end_minute = int(minute)
+            self._after_holiday_temperature = int(temperature)
+            return None
+
+        return ""
+
+    def _get_parameter(self, parameter: str) -> int:
+        match parameter:
+            case "0#9":
+                return self._temperature_offset
+            case "1#20":
+                return self._anti_freeze_temperature
+            case "1#22":
+                return self._boost_steps
+            case "0#6":
+                return self._window_open_detection
+            case "0#7":
+                return self._smart_start
+        return 0
+
+    def _set_parameter(self, parameter: str, value: int) -> None:
+        match parameter:
+            case "0#9":
+                self._temperature_offset = value
+            case "1#20":
+                self._anti_freeze_temperature = value
+            case "1#22":
+                self._boost_steps = value
+            case "0#6":
+                self._window_open_detection = value
+            case "0#7":
+                self._smart_start = value
+
+
+class GatewaySimulator:
+    """Answers the commands of the client like a FlexiSmart Gateway
+
+    zones: the modules per zone, e.g. [[SimulatedModule("1.1.1.1")], []] for one zone with one heater and an
+    empty second zone.
+    latency, packet_loss and error_rate apply to every request, the values of the modules additionally to the
+    requests which reach them. error_rate is the probability of an ER,<module> response for write commands.
+    """
+
+    def __init__(
+            self,
+            zones: list[list[SimulatedModule]] | None = None,
+            latency: float = 0.0,
+            packet_loss: float = 0.0,
+            error_rate: float = 0.0,
+            seed: int | None = None
+    ):
+        self._zones = zones if zones is not None else [[SimulatedModule()]]
+        self._latency = latency
+        self._packet_loss = packet_loss
+        self._error_rate = error_rate
+        self._random = Random(seed)
+        self._sync_id = 100
+        self._time_offset = timedelta()
+        self._request_count = 0
+        self._transport: DatagramTransport | None = None
+
+    @classmethod
+    def create(cls, modules_per_zone: list[int], **kwargs) -> "GatewaySimulator":
+        zones = []
+        for zone, module_count in enumerate(modules_per_zone, start=1):
+            zones.append([SimulatedModule(f"10.{zone}.{module}.1") for module in range(1, module_count + 1)])
+        return cls(zones, **kwargs)
+
+    def get_zones(self) -> list[list[SimulatedModule]]:
+        return self._zones
+
+    def get_module(self, zone: int, module: int) -> SimulatedModule:
+        return self._zones[zone - 1][module - 1]
+
+    def get_sync_id(self) -> int:
+        return self._sync_id
+
+    def get_request_count(self) -> int:
+        return self._request_count
+
+    def set_latency(self, latency: float) -> None:
+        self._latency = latency
+
+    def set_packet_loss(self, packet_loss: float) -> None:
+        self._packet_loss = packet_loss
+
+    def set_error_rate(self, error_rate: float) -> None:
+        self._error_rate = error_rate
+
+    # >>>>>>> UDP server <<<<<<< #
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> tuple[str, int]:
+        transport, _ = await get_running_loop().create_datagram_endpoint(
+            lambda: _GatewaySimulatorProtocol(self), local_addr=(host, port)
+        )
+        self._transport = transport
+        return transport.get_extra_info("sockname")[:2]
+
+    def stop(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    async def __aenter__(self) -> "GatewaySimulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def get_address(self) -> tuple[str, int]:
+        return self._transport.get_extra_info("sockname")[:2]
+
+    # >>>>>>> Protocol <<<<<<< #
+    # Returns the response datagram or None if the request (or its response) got lost
+    async def handle(self, message: bytes) -> bytes | None:
+        self._request_count += 1
+        command = message.rstrip(b"\x00").decode()
+
+        modules = self._get_addressed_modules(command)
+        latency = self._latency + max((module.get_latency() for module in modules), default=0.0)
+        packet_loss = max([self._packet_loss] + [module.get_packet_loss() for module in modules])
+
+        if latency > 0:
+            await sleep(latency)
+
+        if packet_loss > 0 and self._random.random() < packet_loss:
+            return None
+
+        response = self.handle_command(command)
+        if response is None:
+            return None
+
+        return response.encode() + b"\x00"
+
+    # Returns the response for one command, None if the gateway would not answer
+    def handle_command(self, command: str) -> str | None:
+        now = datetime.now() + self._time_offset
+
+        if command == "PING":
+            return "OP"
+        if command.startswith("D#") or command.startswith("R#"):
+            return self._handle_zone_command(command, now)
+        if command.startswith("OPS"):
+            return self._handle_status_command(command.rstrip("/"))
+        if command == "OPH/":
+            return f"OPOK,{now.hour},{now.minute},{now.second},{now.weekday()},{now.day},{now.month}," \
+                   f"{now.strftime('%y')},1,192.168.1.10,SIM00001"
+        if command == "OPF/":
+            return "OPOK,SIM1.0,SIM00001,1"
+        if command.startswith("OPF"):
+            return self._handle_set_date_time(command, now)
+        if command.startswith("OPMW"):
+            return self._handle_zone_configuration(command)
+        if command.startswith("OPZI199,"):
+            return self._handle_register_module(command)
+
+        return "OPER"
+
+    def _get_addressed_modules(self, command: str) -> list[SimulatedModule]:
+        target = self._parse_target(command)
+        if target is None:
+            return []
+
+        operation, zone, module = target
+        if zone < 1 or zone > len(self._zones):
+            return []
+        if operation == "D":
+            return self._zones[zone - 1]
+        if module < 1 or module > len(self._zones[zone - 1]):
+            return []
+        return [self._zones[zone - 1][module - 1]]
+
+    @staticmethod
+    def _parse_target(command: str) -> tuple[str, int, int] | None:
+        if not (command.startswith("D#") or command.startswith("R#")):
+            return None
+        fields = command.split("*", 1)[0].split("#")
+        return fields[0], int(fields[1]), int(fields[2])
+
+    def _handle_zone_command(self, command: str, now: datetime) -> str | None:
+        operation, zone, module = self._parse_target(command)
+        sub_command = command.split("*", 1)[1].rstrip("/")
+
+        modules = self._get_addressed_modules(command)
+        if not modules:
+            # Modules which do not exist (anymore) do not answer
+            return None
+
+        if operation == "D":
+            positions = range(1, len(modules) + 1)
+        else:
+            positions = [module]
+
+        failed = []
+        response = None
+        for position, simulated_module in zip(positions, modules):
+            is_write = not sub_command.startswith("?")
+            error_rate = max(self._error_rate, simulated_module.get_error_rate())
+            if is_write and error_rate > 0 and self._random.random() < error_rate:
+                failed.append(str(position))
+                continue
+
+            result = simulated_module._execute(sub_command, now)
+            if response is None:
+                response = result
+
+        if failed:
+            return "ER," + ",".join(failed)
+        if response == "":
+            return "ER"
+        if response is None:
+            return "OK"
+        return f"OK,{response}"
+
+    def _handle_status_command(self, operation: str) -> str:
+        match operation:
+            case "OPS1":
+                return f"OPOK,OPS1,{self._sync_id},122,0,0,0,16,197,215,34,0"
+            case "OPS2":
+                return "OPOK,OPS2," + ",".join(str(zone) for zone in range(1, len(self._zones) + 1))
+            case "OPS3":
+                return "OPOK,OPS3," + ",".join(str(len(modules)) for modules in self._zones)
+            case "OPS38":
+                return "OPOK,OPS38,192,168,1,10,192,168,1,1,255,255,255,0,0,0,0,0,0,0,0,0,0,0,0,0,66,53,0,0," \
+                       "10,0,0,1,66,54"
+        return f"OPOK,{operation}"
+
+    def _handle_set_date_time(self, command: str, now: datetime) -> str:
+        # OPF<hour><minute><second><day_of_week>/<day>,<month>,<year>/
+        time_part, date_part = command[3:].rstrip("/").split("/")
+        day, month, year = date_part.split(",")
+        target = datetime(2000 + int(year), int(month), int(day),
+                          int(time_part[0:2]), int(time_part[2:4]), int(time_part[4:6]))
+        self._time_offset = target - (now - self._time_offset)
+        return "OPOK"
+
+    def _handle_zone_configuration(self, command: str) -> str:
+        # OPMW<zone_position>,<zone_id>/ creates, OPMW<128 + zone>,0/ deletes a zone
+        position, zone_id = map(int, command[4:].rstrip("/").split(","))
+        if zone_id == 0:
+            zone = position - 128
+            if zone < 1 or zone > len(self._zones):
+                return "OPER"
+            del self._zones[zone - 1]
+        else:
+            self._zones.append([])
+
+        self._sync_id += 1
+        return "OPOK"
+
+    def _handle_register_module(self, command: str) -> str:
+        _, zone, module = command.rstrip("/").split(",")
+        zone = int(zone)
+        if zone < 1 or zone > len(self._zones):
+            return "OPER"
+
+        modules = self._zones[zone - 1]
+        modules.append(SimulatedModule(f"10.{zone}.{len(modules) + 1}.1"))
+        self._sync_id += 1
+        return "OPOK"
+
+
+class _GatewaySimulatorProtocol(DatagramProtocol):
+    def __init__(self, simulator: GatewaySimulator):
+        self._simulator = simulator
+        self._transport: DatagramTransport | None = None
+        self._responses: set[Task] = set()
+
+    def connection_made(self, transport: DatagramTransport) -> None:
+        self._transport = transport
+
+    # The simulator was stopped, responses which are still delayed by the latency are dropped
+    def connection_lost(self, exc: Exception | None) -> None:
+        for task in list(self._responses):
+            task.cancel()
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        task = create_task(self._respond(data, addr))
+        self._responses.add(task)
+        task.add_done_callback(self._responses.discard)
+
+    async def _respond(self, data: bytes, addr) -> None:
+        response = await self._simulator.handle(data)
+        if response is not None and not self._transport.is_closing():
+            self._transport.sendto(response, addr)
@@ -0,0 +1,59 @@
+"""Single flight for the Python Thermotec AeroFlow® Library"""
+from asyncio import Task, ensure_future, shield
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class SingleFlightStatistics:
+    _calls: int = 0
+    _flights: int = 0
+
+    def _record_call(self, joined: bool) -> None:
+        self._calls += 1
+        if not joined:
+            self._flights += 1
+
+    def get_calls(self) -> int:
+        return self._calls
+
+    # Calls which were actually sent
+    def get_flights(self) -> int:
+        return self._flights
+
+    # Calls which joined a flight in progress, i.e. round trips saved
+    def get_coalesced(self) -> int:
+        return self._calls - self._flights
+
+
+class SingleFlight:
+    """Runs concurrent calls with the same key only once and shares the result (or exception) with every caller
+
+    The flight runs as its own task, so a caller which gets cancelled does not cancel the request for the others.
+    Once the flight has landed, the next call with the key starts a new one.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, Task] = {}
+        self._statistics = SingleFlightStatistics()
+
+    def get_statistics(self) -> SingleFlightStatistics:
+        return self._statistics
+
+    def get_in_flight(self) -> int:
+        return len(self._flights)
+
+    async def run(self, key: Hashable, function: Callable[[], Awaitable]):
+        flight = self._flights.get(key)
+        self._statistics._record_call(flight is not None)
+        if flight is None:
+            flight = ensure_future(function())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda task: self._land(key, task))
+
+        return await shield(flight)
+
+    def _land(self, key: Hashable, flight: Task) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the exception as retrieved, in case every caller was cancelled
+        if not flight.cancelled():
+            flight.exception()
@@ -0,0 +1,150 @@
+"""Fleet snapshots for the Python Thermotec AeroFlow® Library"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping
+from types import MappingProxyType
+
+from .data_object import HomeAssistantModuleData
+
+
+def _holiday_value(getter: Callable) -> Callable[[HomeAssistantModuleData], object]:
+    def get(module: HomeAssistantModuleData) -> object:
+        holiday_data = module.get_holiday_data()
+        return getter(holiday_data) if holiday_data is not None else None
+
+    return get
+
+
+# The fields which are compared between two snapshots. The clocks of the modules and of the gateway tick with every
+# poll and are left out on purpose, otherwise every module would change in every poll
+MODULE_FIELDS: dict[str, Callable[[HomeAssistantModuleData], object]] = {
+    "zone_id": lambda module: module.get_zone_id(),
+    "module_id": lambda module: module.get_module_id(),
+    "current_temperature": lambda module: module.get_module_data().get_current_temperature(),
+    "target_temperature": lambda module: module.get_module_data().get_target_temperature(),
+    "temperature_offset": lambda module: module.get_module_data().get_temperature_offset(),
+    "boost_active": lambda module: module.get_module_data().is_boost_active(),
+    "boost_time_left": lambda module: module.get_module_data().get_boost_time_left(),
+    "window_open_detection": lambda module: module.get_module_data().is_window_open_detection_enabled(),
+    "smart_start": lambda module: module.get_module_data().is_smart_start_enabled(),
+    "programming": lambda module: module.get_module_data().get_programming_string(),
+    "language": lambda module: module.get_module_data().get_language(),
+    "firmware_version": lambda module: module.get_module_data().get_firmware_version(),
+    "anti_freeze_temperature": lambda module: module.get_anti_freeze_temperature(),
+    "holiday_mode_active": _holiday_value(lambda holiday_data: holiday_data.is_holiday_mode_active()),
+    "holiday_target_temperature": _holiday_value(lambda holiday_data: holiday_data.get_target_temperature()),
+    "holiday_days_left": _holiday_value(lambda holiday_data: holiday_data.get_days_left()),
+    "holiday_end_time": _holiday_value(lambda holiday_data: holiday_data.get_end_time()),
+    "after_holiday_temperature": _holiday_value(lambda holiday_data: holiday_data.get_after_holiday_temperature()),
+    "stale": lambda module: module.is_stale(),
+}
+_FIELD_NAMES = tuple(MODULE_FIELDS)
+_FIELD_GETTERS = tuple(MODULE_FIELDS.values())
+
+
+def _get_values(module: HomeAssistantModuleData) -> tuple:
+    return tuple(getter(module) for getter in _FIELD_GETTERS)
+
+
+class SnapshotDiff:
+    def __init__(self, added: tuple[str, ...], removed: tuple[str, ...], changed: dict[str, tuple[str, ...]]):
+        self._added = added
+        self._removed = removed
+        self._changed = changed
+
+    # Device identifiers of the modules which are new in the newer snapshot
+    def get_added(self) -> tuple[str, ...]:
+        return self._added
+
+    # Device identifiers of the modules which are gone in the newer snapshot
+    def get_removed(self) -> tuple[str, ...]:
+        return self._removed
+
+    # Changed fields (see MODULE_FIELDS) by device identifier of the modules which are in both snapshots
+    def get_changed(self) -> Mapping[str, tuple[str, ...]]:
+        return MappingProxyType(self._changed)
+
+    def get_changed_fields(self, device_identifier: str) -> tuple[str, ...]:
+        return self._changed.get(device_identifier, ())
+
+    def is_empty(self) -> bool:
+        return not (self._added or self._removed or self._changed)
+
+
+class FleetSnapshot:
+    """Immutable data of all modules by device identifier
+
+    A newer snapshot is built with with_modules. Modules whose fields did not change keep the entry of the older
+    snapshot, so unchanged modules are the same objects in both snapshots. This keeps the memory flat from poll to
+    poll and lets diff skip them with an identity check.
+    """
+
+    def __init__(self, modules: Mapping[str, HomeAssistantModuleData] | None = None):
+        modules = modules if modules is not None else {}
+        self._modules = MappingProxyType(dict(modules))
+        self._values = {device_identifier: _get_values(module) for device_identifier, module in modules.items()}
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def __contains__(self, device_identifier: object) -> bool:
+        return device_identifier in self._modules
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._modules)
+
+    def get_modules(self) -> Mapping[str, HomeAssistantModuleData]:
+        return self._modules
+
+    def get_module(self, device_identifier: str) -> HomeAssistantModuleData | None:
+        return self._modules.get(device_identifier)
+
+    # Snapshot with the given modules (all of them, missing modules are removed). Returns this snapshot if nothing
+    # changed
+    def with_modules(self, modules: Mapping[str, HomeAssistantModuleData]) -> FleetSnapshot:
+        entries = {}
+        values = {}
+        unchanged = len(modules) == len(self._modules)
+        for device_identifier, module in modules.items():
+            module_values = _get_values(module)
+            if self._values.get(device_identifier) == module_values:
+                module = self._modules[device_identifier]
+                module_values = self._values[device_identifier]
+            else:
+                unchanged = False
+            entries[device_identifier] = module
+            values[device_identifier] = module_values
+
+        if unchanged:
+            return self
+
+        snapshot = FleetSnapshot.__new__(FleetSnapshot)
+        snapshot._modules = MappingProxyType(entries)
+        snapshot._values = values
+        return snapshot
+
+    # Changes from this (older) snapshot to the given newer one
+    def diff(self, newer: FleetSnapshot) -> SnapshotDiff:
+        return diff(self, newer)
+
+
+def diff(old: FleetSnapshot, new: FleetSnapshot) -> SnapshotDiff:
+    if old is new:
+        return SnapshotDiff((), (), {})
+
+    added = tuple(device_identifier for device_identifier in new._modules if device_identifier not in old._modules)
+    removed = tuple(device_identifier for device_identifier in old._modules if device_identifier not in new._modules)
+    changed = {}
+    for device_identifier, module in new._modules.items():
+        old_module = old._modules.get(device_identifier)
+        if old_module is None or old_module is module:
+            continue
+
+        old_values = old._values[device_identifier]
+        new_values = new._values[device_identifier]
+        fields = tuple(name for name, old_value, new_value in zip(_FIELD_NAMES, old_values, new_values)
+                       if old_value != new_value)
+        if fields:
+            changed[device_identifier] = fields
+
+    return SnapshotDiff(added, removed, changed)
@@ -0,0 +1,186 @@
+"""Transports for the Python Thermotec AeroFlow® Library
+
+A transport carries the request datagrams to a gateway and the response datagrams back. FlexiSmartGateway (and so
+the Client) uses UdpTransport by default; LoopbackTransport talks to a GatewaySimulator without a socket and
+RecordingTransport / ReplayTransport capture and play back the datagrams of a real session, e.g. for tests or
+CPU benchmarks of the command and parsing paths with deterministic timing.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from asyncio import get_running_loop
+from collections import deque
+from typing import TYPE_CHECKING
+from asyncio_dgram import connect
+from asyncio_dgram.aio import DatagramClient
+from .exception import InvalidRequest
+
+if TYPE_CHECKING:
+    from .simulator import GatewaySimulator
+
+
+class Transport(ABC):
+    """Datagram connection to one gateway
+
+    close() has to drop everything which is still in flight, so a late response of a previous request can not be
+    mistaken for the response of the next one. The next send() reopens the transport transparently.
+    """
+
+    @abstractmethod
+    def is_open(self) -> bool:
+        pass
+
+    @abstractmethod
+    async def open(self) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def send(self, datagram: bytes) -> None:
+        pass
+
+    # Waits for the next datagram. A lost datagram never returns, the gateway applies the timeout
+    @abstractmethod
+    async def recv(self) -> bytes:
+        pass
+
+
+class UdpTransport(Transport):
+    """One long-lived UDP endpoint (asyncio_dgram) per gateway"""
+
+    def __init__(self, host: str, port: int):
+        self._host = host
+        self._port = port
+        self._stream: DatagramClient | None = None
+
+    def is_open(self) -> bool:
+        return self._stream is not None
+
+    async def open(self) -> None:
+        if self._stream is None:
+            self._stream = await connect((self._host, self._port))
+
+    def close(self) -> None:
+        stream = self._stream
+        self._stream = None
+        if stream is not None:
+            stream.close()
+
+    async def send(self, datagram: bytes) -> None:
+        await self.open()
+        await self._stream.send(datagram)
+
+    async def recv(self) -> bytes:
+        data, remote_addr = await self._stream.recv()
+        return data
+
+
+class LoopbackTransport(Transport):
+    """Hands the requests straight to a GatewaySimulator, without sockets
+
+    Latency, packet loss and errors of the simulator still apply, so with latency=0 and a seed the responses are
+    fully deterministic.
+    """
+
+    def __init__(self, simulator: GatewaySimulator):
+        self._simulator = simulator
+        self._open = False
+        self._pending: bytes | None = None
+
+    def is_open(self) -> bool:
+        return self._open
+
+    async def open(self) -> None:
+        self._open = True
+
+    def close(self) -> None:
+        self._open = False
+        self._pending = None
+
+    async def send(self, datagram: bytes) -> None:
+        await self.open()
+        self._pending = datagram
+
+    async def recv(self) -> bytes:
+        request = self._pending
+        self._pending = None
+        response = await self._simulator.handle(request) if request is not None else None
+        if response is None:
+            await get_running_loop().create_future()
+        return response
+
+
+class RecordingTransport(Transport):
+    """Wraps another transport and records every request with its response (None if it was lost)"""
+
+    def __init__(self, transport: Transport):
+        self._transport = transport
+        self._records: list[tuple[bytes, bytes | None]] = []
+
+    def get_records(self) -> list[tuple[bytes, bytes | None]]:
+        return list(self._records)
+
+    def is_open(self) -> bool:
+        return self._transport.is_open()
+
+    async def open(self) -> None:
+        await self._transport.open()
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def send(self, datagram: bytes) -> None:
+        await self._transport.send(datagram)
+        self._records.append((datagram, None))
+
+    async def recv(self) -> bytes:
+        data = await self._transport.recv()
+        request, _ = self._records[-1]
+        self._records[-1] = (request, data)
+        return data
+
+
+class ReplayTransport(Transport):
+    """Answers with the responses of a RecordingTransport
+
+    Every request gets the next recorded response of the same request, so independent requests may be replayed in
+    a different order. A recorded lost response is lost again, an unknown request raises InvalidRequest.
+    """
+
+    def __init__(self, records: list[tuple[bytes, bytes | None]]):
+        self._responses: dict[bytes, deque[bytes | None]] = {}
+        for request, response in records:
+            self._responses.setdefault(request, deque()).append(response)
+        self._open = False
+        self._pending: bytes | None = None
+
+    # Requests which were recorded, but not replayed yet
+    def get_remaining(self) -> int:
+        return sum(len(responses) for responses in self._responses.values())
+
+    def is_open(self) -> bool:
+        return self._open
+
+    async def open(self) -> None:
+        self._open = True
+
+    def close(self) -> None:
+        self._open = False
+        self._pending = None
+
+    async def send(self, datagram: bytes) -> None:
+        await self.open()
+        responses = self._responses.get(datagram)
+        if not responses:
+            raise InvalidRequest(f"No recorded response for {datagram!r}")
+        self._pending = responses.popleft()
+
+    async def recv(self) -> bytes:
+        response = self._pending
+        self._pending = None
+        if response is None:
+            await get_running_loop().create_future()
+        return response
@@ -39,6 +39,16 @@ def create_current_temperature(main_value: int, second_value: int) -> float:
     return float(f"{main_value}.{second_value}")
 
 
+# Lookup tables for the raw byte values of the gateway, indexed by the raw value
+TEMPERATURE_FROM_INT = tuple(calculate_temperature_from_int(value) for value in range(256))
+TEMPERATURE_OFFSET_FROM_INT = tuple(calculate_temperature_offset_from_int(value) for value in range(256))
+# CURRENT_TEMPERATURE[main_value][second_value], second_value is the decimal digit
+CURRENT_TEMPERATURE = tuple(tuple(create_current_temperature(main, second) for second in range(10)) for main in range(256))
+TWO_DIGITS = tuple(str(value).zfill(2) for value in range(256))
+# Raw fields of a response (bytes or str) -> int, for all byte values. A dict lookup is much cheaper than int()
+FIELD_VALUES = {**{str(value): value for value in range(256)}, **{str(value).encode(): value for value in range(256)}}
+
+
 def check_if_zone_exists(zones: list[int] | None, zone: int) -> None:
     if zones is None or len(zones) == 0:
         raise Exception("Zone out of range. No existing zones")